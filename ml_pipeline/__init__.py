@@ -4,9 +4,29 @@ This module contains machine learning pipeline components including
 the ensemble predictor system.
 """
 
-from .ensemble_predictor import EnsemblePredictor, create_ensemble_predictor
+import importlib
 
-__all__ = ["EnsemblePredictor", "create_ensemble_predictor"]
+__all__ = [
+    "EnsemblePredictor",
+    "StackingModel",
+    "WeightRefresher",
+    "create_ensemble_predictor",
+    "load_stacking_model",
+    "load_weights_file",
+]
+
+
+def __getattr__(name):
+    """Import the ensemble exports on first use.
+
+    Importing a submodule (e.g. ``ml_pipeline.compiled_scorer`` for serving)
+    then does not pay for ensemble_predictor and pyarrow.
+    """
+    if name in __all__:
+        value = getattr(importlib.import_module(".ensemble_predictor", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 """
 ML Pipeline: Auto Reinforcement Loop for Model Fine-tuning
 """
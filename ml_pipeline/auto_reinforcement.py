@@ -3,10 +3,8 @@
 Auto Reinforcement Loop - Automatic model fine-tuning based on prediction errors
 """
 
-import json
 import logging
 import os
-import subprocess
 import sys
 import traceback
 import uuid
@@ -21,8 +19,10 @@ from .config import (
     MIN_ERROR_SAMPLES_FOR_RETRAINING,
     RETRAINED_MODELS_DIR,
     TEMP_DIR,
+    TRAINING_TIMEOUT_SECONDS,
 )
-from .data_loader import prepare_retraining_data
+from .data_loader import stream_retraining_data
+from .model_evaluation import CHAMPION_STATUS, REGISTRY_PATH, load_registry, model_file
 from .supabase_client import (
     get_pending_retraining_requests,
     get_supabase_client,
@@ -32,6 +32,7 @@ from .supabase_client import (
     update_retraining_run,
     upload_file_to_storage,
 )
+from .train_model import TrainingError, TrainingTimeoutError, TrainingWorker
 
 # Configure logging
 logging.basicConfig(
@@ -46,94 +47,109 @@ class RetrainingError(Exception):
     pass
 
 
-def parse_training_output(output: str) -> Dict:
-    """
-    Parse training output to extract metrics
-    
-    Args:
-        output: Training script output
-        
-    Returns:
-        Dictionary with metrics
-    """
-    try:
-        # Try to parse JSON output from the training script
-        lines = output.strip().split("\n")
-        for line in lines:
-            if line.strip().startswith("{"):
-                try:
-                    data = json.loads(line)
-                    if "metrics" in data:
-                        return data
-                except json.JSONDecodeError:
-                    pass
-        
-        # If no JSON found, return empty metrics
-        return {"metrics": {}}
-    except Exception as e:
-        logger.warning(f"Failed to parse training output: {e}")
-        return {"metrics": {}}
+# Shared warm worker, so repeated retrains skip re-importing the ML stack
+_training_worker: Optional[TrainingWorker] = None
 
 
-def run_training(dataset_path: str, output_dir: str, fine_tune: bool = True, epochs: int = 5) -> Optional[Dict]:
+def get_training_worker() -> TrainingWorker:
+    """Return the shared warm training worker, creating it on first use."""
+    global _training_worker
+    if _training_worker is None:
+        _training_worker = TrainingWorker()
+    return _training_worker
+
+
+def run_training(
+    dataset_path: str,
+    output_dir: str,
+    fine_tune: bool = True,
+    epochs: int = 5,
+    timeout: float = TRAINING_TIMEOUT_SECONDS,
+    worker: Optional[TrainingWorker] = None,
+    config: str = "model_config.yaml",
+    model_path: Optional[str] = None,
+) -> Optional[Dict]:
     """
-    Run the training script
+    Run model training in a warm, isolated worker process
     
     Args:
         dataset_path: Path to the fine-tuning dataset
         output_dir: Directory to save the trained model
         fine_tune: Whether to fine-tune or train from scratch
         epochs: Number of training epochs
+        timeout: Seconds before the worker is killed
+        worker: Worker to run in (default: shared worker from get_training_worker)
+        config: Path to the model configuration YAML
+        model_path: Existing model to update incrementally when fine-tuning
         
     Returns:
-        Training output parsed as dictionary or None if failed
+        TrainingResult as a dictionary (metrics, model_path, timings, ...) or None if failed
     """
+    worker = worker or get_training_worker()
+    
     try:
-        # Determine the script path
-        script_path = Path(__file__).parent / "train_model.py"
-        
-        # Build command
-        cmd = [
-            sys.executable,
-            str(script_path),
-            "--dataset", dataset_path,
-            "--output_dir", output_dir,
-            "--fine_tune", str(fine_tune),
-            "--epochs", str(epochs),
-            "--learning_rate", str(DEFAULT_LEARNING_RATE),
-        ]
-        
-        logger.info(f"Running training: {' '.join(cmd)}")
-        
-        # Run training
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=300,  # 5 minutes timeout
+        logger.info(f"Running training on {dataset_path} (fine_tune={fine_tune}, epochs={epochs})")
+        
+        result = worker.run(
+            timeout=timeout,
+            dataset=dataset_path,
+            config=config,
+            output_dir=output_dir,
+            fine_tune=fine_tune,
+            model_path=model_path,
+            epochs=epochs,
+            learning_rate=DEFAULT_LEARNING_RATE,
         )
         
-        if result.returncode != 0:
-            logger.error(f"Training failed with return code {result.returncode}")
-            logger.error(f"STDOUT: {result.stdout}")
-            logger.error(f"STDERR: {result.stderr}")
-            return None
-        
-        logger.info("Training completed successfully")
-        logger.info(f"STDOUT: {result.stdout}")
-        
-        # Parse output
-        output = parse_training_output(result.stdout)
-        return output
+        logger.info(f"Training completed successfully in {result.timings.get('total', 0):.2f}s")
+        return result.to_dict()
         
-    except subprocess.TimeoutExpired:
-        logger.error("Training script timed out")
+    except TrainingTimeoutError:
+        logger.error("Training timed out")
         return None
     except Exception as e:
         logger.error(f"Failed to run training: {e}")
         return None
 
 
+def find_base_model(
+    retrained_dir: Path = RETRAINED_MODELS_DIR,
+    registry_path: Path = REGISTRY_PATH,
+) -> Optional[str]:
+    """
+    Find the model a fine-tuning run continues from
+    
+    Each nightly run updates the output of the previous one, so the newest
+    model under ``retrained_dir`` wins; before the first retraining run the
+    active model in the registry is used.
+    
+    Args:
+        retrained_dir: Directory holding one subdirectory per retraining run
+        registry_path: Model registry JSON
+        
+    Returns:
+        Path to the model file, or None if no model exists on disk
+    """
+    retrained = max(retrained_dir.glob("*/*.pkl"), key=lambda path: path.stat().st_mtime, default=None)
+    if retrained is not None:
+        return str(retrained)
+    
+    try:
+        registry = load_registry(str(registry_path))
+    except TrainingError as e:
+        logger.warning(f"No model registry to fine-tune from: {e}")
+        return None
+    
+    root = Path(registry_path).resolve().parent.parent
+    for entry in registry["models"]:
+        if entry.get("status") == CHAMPION_STATUS:
+            path = model_file(entry, root)
+            if path.exists():
+                return str(path)
+            logger.warning(f"Active model file not found: {path}")
+    return None
+
+
 def upload_logs_to_storage(logs_content: str, run_id: str) -> str:
     """
     Upload training logs to Supabase Storage
@@ -252,7 +268,9 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
         
         # Prepare retraining data
         logger.info("Preparing retraining data...")
-        dataset_path, error_count = prepare_retraining_data(lookback_days)
+        dataset_path, error_count = stream_retraining_data(
+            lookback_days, min_errors=MIN_ERROR_SAMPLES_FOR_RETRAINING
+        )
         
         if dataset_path is None or error_count < MIN_ERROR_SAMPLES_FOR_RETRAINING:
             logger.warning(f"Insufficient errors for retraining: {error_count} samples (min: {MIN_ERROR_SAMPLES_FOR_RETRAINING})")
@@ -306,23 +324,30 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
         output_dir = str(RETRAINED_MODELS_DIR / run_id)
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         
+        # Continue from the latest model; a model trained only on the errors must not replace it
+        base_model = find_base_model()
+        if base_model is None:
+            raise RetrainingError("No existing model to fine-tune; train and register one first")
+        
         # Run training
-        logger.info("Running model fine-tuning...")
+        logger.info(f"Running model fine-tuning from {base_model}...")
         training_output = run_training(
             dataset_path,
             output_dir,
             fine_tune=True,
             epochs=DEFAULT_FINE_TUNE_EPOCHS,
+            model_path=base_model,
         )
         
         if training_output is None:
-            raise RetrainingError("Training script failed")
+            raise RetrainingError("Training failed")
         
         logger.info(f"Training output: {training_output}")
         
         # Extract metrics
         metrics = training_output.get("metrics", {})
         model_path = training_output.get("model_path", "")
+        fine_tune_mode = training_output.get("fine_tune_mode")
         
         logger.info(f"Training metrics: {metrics}")
         logger.info(f"Model saved to: {model_path}")
@@ -336,6 +361,8 @@ def run_auto_reinforcement(lookback_days: int = DEFAULT_LOOKBACK_DAYS, source: s
                 "run_id": run_id,
                 "metrics": metrics,
                 "model_path": model_path,
+                "base_model": base_model,
+                "fine_tune_mode": fine_tune_mode,
                 "dataset_size": error_count,
             }
         )
@@ -425,6 +452,9 @@ def main():
     except Exception as e:
         logger.error(f"Unexpected error in auto reinforcement: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if _training_worker is not None:
+            _training_worker.close()
 
 
 if __name__ == "__main__":
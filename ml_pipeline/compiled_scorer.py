@@ -0,0 +1,245 @@
+"""
+Compiled Scorer - NumPy-only inference for exported linear and tree models.
+
+``CompiledScorer`` evaluates a ``.artifact`` (see model_artifact.py) without
+scikit-learn: linear models are a matrix product plus the estimator's link
+(softmax, one-vs-rest logistic or modified Huber), trees are walked for all
+rows at once over the flattened node arrays. Scaler steps are applied
+first. Predictions match the original estimator's ``predict`` and
+``predict_proba``.
+
+Usage:
+    scorer = load_scorer("models/LogisticRegression_20250101_000000.artifact")
+    scorer.predict_proba(rows)   # DataFrame, dict or (n, features) array
+"""
+
+import logging
+from typing import Any, Mapping, Optional
+
+import numpy as np
+
+from .model_artifact import ModelArtifact, load_artifact
+
+logger = logging.getLogger(__name__)
+
+# Rows of the training data compared against the estimator at export time
+SCORER_CHECK_ROWS = 1000
+
+
+class ScorerError(Exception):
+    """Raised when a model cannot be scored, or its scorer disagrees with it."""
+    pass
+
+
+def _expit(values: np.ndarray) -> np.ndarray:
+    """Numerically stable logistic sigmoid."""
+    out = np.empty_like(values)
+    positive = values >= 0
+    out[positive] = 1.0 / (1.0 + np.exp(-values[positive]))
+    exp = np.exp(values[~positive])
+    out[~positive] = exp / (1.0 + exp)
+    return out
+
+
+def _linear_link(metadata: Mapping[str, Any]) -> Optional[str]:
+    """How the estimator turns decision values into probabilities."""
+    params = metadata.get("params", {})
+    if metadata["estimator"] == "LogisticRegression":
+        if len(metadata["classes"]) <= 2:
+            return "logistic"
+        # Older scikit-learn: explicit or liblinear-implied one-vs-rest
+        multi_class = params.get("multi_class")
+        if multi_class == "ovr" or (multi_class == "auto" and params.get("solver") == "liblinear"):
+            return "ovr"
+        return "softmax"
+
+    loss = params.get("loss")
+    if loss in ("log_loss", "log"):
+        return "ovr"
+    if loss == "modified_huber":
+        return "modified_huber"
+    return None
+
+
+class CompiledScorer:
+    """Dependency-free scorer over a loaded model artifact."""
+
+    def __init__(self, artifact: ModelArtifact):
+        """
+        Prepare a scorer; the artifact's arrays are used in place.
+
+        Args:
+            artifact: Loaded artifact of kind 'linear' or 'tree'
+
+        Raises:
+            ScorerError: If the artifact kind is unknown
+        """
+        if artifact.kind not in ("linear", "tree"):
+            raise ScorerError(f"Unsupported artifact kind: {artifact.kind}")
+
+        self.artifact = artifact
+        self.classes = np.array(artifact.classes)
+        self.feature_order = artifact.feature_order
+        self.link = _linear_link(artifact.metadata) if artifact.kind == "linear" else "tree"
+
+        arrays = artifact.arrays
+        # Linear models fitted on float32 features compute in float32
+        self.dtype = arrays["coef"].dtype if artifact.kind == "linear" else np.dtype(np.float64)
+        self._scalers = []
+        index = 0
+        while f"scaler{index}_mean" in arrays:
+            self._scalers.append((arrays[f"scaler{index}_mean"], arrays[f"scaler{index}_scale"]))
+            index += 1
+
+    def _matrix(self, X: Any) -> np.ndarray:
+        """Turn a DataFrame, a feature dict or an array into a float matrix."""
+        if isinstance(X, Mapping):
+            if not self.feature_order:
+                raise ScorerError("Artifact has no feature order; pass an array")
+            missing = [name for name in self.feature_order if name not in X]
+            if missing:
+                raise ScorerError(f"Missing features: {', '.join(missing)}")
+            return np.array([[X[name] for name in self.feature_order]], dtype=np.float64)
+
+        if hasattr(X, "columns") and self.feature_order:
+            X = X[self.feature_order]
+        matrix = np.asarray(X, dtype=np.float64)
+        return matrix.reshape(1, -1) if matrix.ndim == 1 else matrix
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        """Apply the pipeline's StandardScaler steps, rounding as the scaler does."""
+        X = X.astype(self.dtype, copy=False)
+        for mean, scale in self._scalers:
+            X = (X - mean).astype(self.dtype, copy=False)
+            X = (X / scale).astype(self.dtype, copy=False)
+        return X
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        """
+        Linear decision values, as ``decision_function`` of the estimator.
+
+        Args:
+            X: Rows to score
+
+        Returns:
+            (n,) for binary models, else (n, classes)
+        """
+        if self.artifact.kind != "linear":
+            raise ScorerError("decision_function is only defined for linear models")
+        scores = self._scale(self._matrix(X)) @ self.artifact.arrays["coef"].T + self.artifact.arrays["intercept"]
+        return scores.ravel() if scores.shape[1] == 1 else scores
+
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        """Leaf node index of every row, walking all rows level by level."""
+        arrays = self.artifact.arrays
+        left, right = arrays["children_left"], arrays["children_right"]
+        feature, threshold = arrays["feature"], arrays["threshold"]
+        missing_left = arrays.get("missing_go_to_left")
+
+        # Trees split on float32 inputs
+        X = X.astype(np.float32).astype(np.float64)
+        nodes = np.zeros(len(X), dtype=np.int64)
+        rows = np.arange(len(X))
+        active = left[nodes] != -1
+        while active.any():
+            at, node = rows[active], nodes[active]
+            values = X[at, feature[node]]
+            go_left = values <= threshold[node]
+            if missing_left is not None:
+                go_left |= np.isnan(values) & (missing_left[node] == 1)
+            nodes[at] = np.where(go_left, left[node], right[node])
+            active = left[nodes] != -1
+        return nodes
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Class probabilities, columns in ``classes`` order.
+
+        Args:
+            X: Rows to score
+
+        Returns:
+            (n, classes) probability matrix
+
+        Raises:
+            ScorerError: If the estimator has no probability output (e.g. hinge loss)
+        """
+        if self.artifact.kind == "tree":
+            proba = self.artifact.arrays["value"][self._leaves(self._scale(self._matrix(X)))]
+            normalizer = proba.sum(axis=1, keepdims=True)
+            normalizer[normalizer == 0.0] = 1.0
+            return proba / normalizer
+
+        scores = self.decision_function(X)
+        if self.link == "softmax":
+            exp = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return exp / exp.sum(axis=1, keepdims=True)
+        if self.link in ("logistic", "ovr"):
+            proba = _expit(scores)
+        elif self.link == "modified_huber":
+            proba = (np.clip(scores, -1, 1) + 1) / 2
+        else:
+            raise ScorerError(f"{self.artifact.metadata['estimator']} with this loss has no predict_proba")
+
+        if proba.ndim == 1:
+            return np.column_stack([1 - proba, proba])
+        normalizer = proba.sum(axis=1, keepdims=True)
+        uniform = normalizer[:, 0] == 0
+        normalizer[uniform] = 1.0
+        proba = proba / normalizer
+        proba[uniform] = 1.0 / proba.shape[1]
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predicted class labels, as the estimator's ``predict``.
+
+        Args:
+            X: Rows to score
+
+        Returns:
+            (n,) array of class labels
+        """
+        if self.artifact.kind == "tree":
+            return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            return self.classes[(scores > 0).astype(int)]
+        return self.classes[np.argmax(scores, axis=1)]
+
+    def verify(self, model: Any, X: Any, tolerance: Optional[float] = None) -> None:
+        """
+        Check the scorer reproduces a fitted estimator.
+
+        Args:
+            model: Estimator or Pipeline the artifact was exported from
+            X: Sample rows, as passed to the estimator
+            tolerance: Largest allowed probability difference (default 1e-9,
+                1e-5 for float32 models)
+
+        Raises:
+            ScorerError: If any prediction or probability differs
+        """
+        if not np.array_equal(self.predict(X), np.asarray(model.predict(X))):
+            raise ScorerError("Compiled scorer predictions differ from the estimator")
+        if tolerance is None:
+            tolerance = 1e-5 if self.dtype == np.float32 else 1e-9
+        if hasattr(model, "predict_proba") and self.link is not None:
+            difference = np.abs(self.predict_proba(X) - model.predict_proba(X)).max()
+            if difference > tolerance:
+                raise ScorerError(f"Compiled scorer probabilities differ by {difference:.3g}")
+
+
+def load_scorer(path: str, verify: bool = False) -> CompiledScorer:
+    """
+    Map an artifact file and compile its scorer.
+
+    Args:
+        path: ``.artifact`` file
+        verify: Check the payload SHA-256 while loading
+
+    Returns:
+        CompiledScorer
+    """
+    return CompiledScorer(load_artifact(path, verify=verify))
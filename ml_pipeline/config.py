@@ -20,6 +20,10 @@ MIN_ERROR_SAMPLES_FOR_RETRAINING = 10
 ERROR_CONFIDENCE_THRESHOLD = 0.7
 DEFAULT_FINE_TUNE_EPOCHS = 5
 DEFAULT_LEARNING_RATE = 0.001
+DEFAULT_FINE_TUNE_BATCH_SIZE = 256
+TRAINING_TIMEOUT_SECONDS = 300
+DEFAULT_TRAINING_CHUNK_SIZE = 50_000
+DEFAULT_LOG_CHUNK_SIZE = 50_000
 
 # Paths
 ML_PIPELINE_DIR = Path(__file__).parent
@@ -28,6 +32,17 @@ MODELS_DIR = PROJECT_ROOT / "models"
 RETRAINED_MODELS_DIR = MODELS_DIR / "retrained"
 TEMP_DIR = Path("/tmp")
 
+# Content-addressed cache of parsed training datasets (see dataset_cache.py)
+DATASET_CACHE_DIR = Path(os.getenv("DATASET_CACHE_DIR", str(PROJECT_ROOT / ".cache" / "datasets")))
+DATASET_CACHE_ENABLED = os.getenv("DATASET_CACHE_ENABLED", "true").lower() == "true"
+
+# Last synced copy of the evaluation log (see data_loader.sync_evaluation_log)
+EVALUATION_LOG_CACHE_DIR = Path(
+    os.getenv("EVALUATION_LOG_CACHE_DIR", str(PROJECT_ROOT / ".cache" / "evaluation_log"))
+)
+# Date partitions of the synced log (see data_loader.update_log_partitions)
+EVALUATION_LOG_PARTITIONS_DIR = EVALUATION_LOG_CACHE_DIR / "partitions"
+
 # Create directories if they don't exist
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
 RETRAINED_MODELS_DIR.mkdir(parents=True, exist_ok=True)
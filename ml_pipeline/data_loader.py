@@ -2,28 +2,386 @@
 Data loader for ML Pipeline - handles evaluation log retrieval and dataset preparation
 """
 
+import hashlib
+import json
 import logging
+import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
 from .config import (
+    DEFAULT_LOG_CHUNK_SIZE,
     DEFAULT_LOOKBACK_DAYS,
     ERROR_CONFIDENCE_THRESHOLD,
+    EVALUATION_LOG_CACHE_DIR,
+    EVALUATION_LOG_PARTITIONS_DIR,
     EVALUATION_LOG_PATH,
     STORAGE_BUCKET,
     TEMP_DIR,
 )
-from .supabase_client import download_file_from_storage
+from .supabase_client import download_file_from_storage, download_file_range, get_file_info
 
 logger = logging.getLogger(__name__)
 
+# Bytes before the old end of the log that must match for an append-only sync
+SYNC_OVERLAP_BYTES = 4096
+SYNC_STATE_FILE = "sync.json"
+
+# Date-partitioned Parquet layout: <root>/match_date=YYYY-MM-DD/part-00000.parquet
+PARTITION_COLUMN = "match_date"
+UNDATED_PARTITION = "unknown"
+PARTITION_STATE_FILE = "_partitions.json"
+PARTITION_COMPRESSION = "zstd"
+
+REQUIRED_LOG_COLUMNS = ("predicted_outcome", "actual_outcome", "confidence")
+# Log dates are ISO 8601 (dates or timestamps); an explicit format avoids
+# pandas' per-element dateutil fallback on large logs
+MATCH_DATE_FORMAT = "ISO8601"
+
+
+def _file_sha256(path: Path) -> str:
+    """SHA-256 of a local file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_state(path: Path) -> Dict[str, Any]:
+    """JSON state file, or {} if missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_state(path: Path, state: Dict[str, Any]) -> None:
+    """Replace a JSON state file atomically."""
+    fd, staging = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(staging, path)
+
+
+def sync_evaluation_log(cache_dir: Path = EVALUATION_LOG_CACHE_DIR) -> Tuple[Path, Dict[str, Any]]:
+    """
+    Bring the local copy of the evaluation log up to date with Storage
+    
+    The cached copy is kept with the remote ETag and size it was synced at.
+    An unchanged ETag skips the download. A log that only grew is treated as
+    appended to: the bytes from just before the old end are fetched and, if
+    the overlap matches the local copy, only the new tail is appended. Any
+    other change (or a copy left behind by an interrupted sync) falls back
+    to a full download.
+    
+    Args:
+        cache_dir: Directory for the cached log and its sync state
+        
+    Returns:
+        Tuple of (local log path, sync state with the mode and bytes transferred)
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    local_path = cache_dir / Path(EVALUATION_LOG_PATH).name
+    state = _read_state(cache_dir / SYNC_STATE_FILE)
+    remote = get_file_info(STORAGE_BUCKET, EVALUATION_LOG_PATH)
+    
+    local_size = local_path.stat().st_size if local_path.exists() else None
+    cached = local_size is not None and local_size == state.get("size")
+    remote_size = remote.get("size")
+    
+    mode = "full"
+    transferred = 0
+    same_etag = remote.get("etag") is not None and remote["etag"] == state.get("etag")
+    if cached and same_etag and remote_size in (None, local_size):
+        mode = "unchanged"
+    elif cached and remote_size is not None and remote_size > local_size:
+        overlap = min(SYNC_OVERLAP_BYTES, local_size)
+        content, partial = download_file_range(STORAGE_BUCKET, EVALUATION_LOG_PATH, local_size - overlap)
+        transferred = len(content)
+        with open(local_path, "rb") as f:
+            f.seek(local_size - overlap)
+            tail = f.read(overlap)
+        if partial and content[:overlap] == tail and local_size - overlap + len(content) == remote_size:
+            with open(local_path, "ab") as f:
+                f.write(content[overlap:])
+            mode = "append"
+    
+    if mode == "full":
+        fd, staging = tempfile.mkstemp(prefix=f".{local_path.name}.", dir=cache_dir)
+        os.close(fd)
+        download_file_from_storage(STORAGE_BUCKET, EVALUATION_LOG_PATH, staging)
+        os.replace(staging, local_path)
+        transferred += local_path.stat().st_size
+    
+    if mode != "unchanged":
+        state = {
+            "etag": remote.get("etag"),
+            "size": local_path.stat().st_size,
+            "sha256": _file_sha256(local_path),
+            "last_modified": remote.get("last_modified"),
+            "synced_at": datetime.now().isoformat(),
+        }
+        _write_state(cache_dir / SYNC_STATE_FILE, state)
+    
+    state = {**state, "mode": mode, "bytes_transferred": transferred}
+    logger.info(f"Evaluation log sync: {mode}, {transferred} bytes transferred, {state['size']} bytes cached")
+    return local_path, state
+
+
+def _require_pyarrow() -> None:
+    """Raise a helpful error when Parquet partitions are used without pyarrow."""
+    if pq is None:
+        raise ImportError("pyarrow required for partitioned logs. Install: pip install pyarrow")
+
+
+def _tail_sha256(path: Path, end: int) -> str:
+    """SHA-256 of the SYNC_OVERLAP_BYTES bytes before ``end``."""
+    with open(path, "rb") as f:
+        f.seek(max(0, end - SYNC_OVERLAP_BYTES))
+        return hashlib.sha256(f.read(end - max(0, end - SYNC_OVERLAP_BYTES))).hexdigest()
+
+
+def write_log_partitions(df: pd.DataFrame, root: Path) -> Dict[str, int]:
+    """
+    Append evaluation log rows to their date partitions
+    
+    ``match_date`` is parsed once here and stored as a timestamp; rows without
+    a parseable date go to the ``match_date=unknown`` partition. Each call
+    adds one new part file per touched partition and never rewrites old ones.
+    
+    Args:
+        df: Evaluation log rows
+        root: Partitioned log directory
+        
+    Returns:
+        Rows written per partition
+    """
+    _require_pyarrow()
+    root = Path(root)
+    if PARTITION_COLUMN in df.columns:
+        df = df.assign(**{PARTITION_COLUMN: pd.to_datetime(df[PARTITION_COLUMN], format=MATCH_DATE_FORMAT, errors="coerce")})
+        keys = df[PARTITION_COLUMN].dt.strftime("%Y-%m-%d").fillna(UNDATED_PARTITION)
+    else:
+        keys = pd.Series(UNDATED_PARTITION, index=df.index)
+    
+    written = {}
+    for key, rows in df.groupby(keys, sort=True):
+        directory = root / f"{PARTITION_COLUMN}={key}"
+        directory.mkdir(parents=True, exist_ok=True)
+        part = directory / f"part-{len(list(directory.glob('part-*.parquet'))):05d}.parquet"
+        table = pa.Table.from_pandas(rows, preserve_index=False)
+        pq.write_table(table, part, compression=PARTITION_COMPRESSION)
+        written[key] = len(rows)
+    return written
+
+
+def import_csv_log(
+    csv_path: Path,
+    root: Path,
+    start: int = 0,
+    chunk_size: int = DEFAULT_LOG_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """
+    Partition a CSV evaluation log, chunk by chunk
+    
+    Args:
+        csv_path: Evaluation log CSV
+        root: Partitioned log directory
+        start: Byte offset of the first row to import (0 for the whole file);
+            must be at a line start after the header
+        chunk_size: Rows per chunk
+        
+    Returns:
+        Rows written per partition
+    """
+    with open(csv_path, "rb") as f:
+        columns = pd.read_csv(f, nrows=0).columns.tolist()
+        if start:
+            f.seek(start)
+            reader = pd.read_csv(f, header=None, names=columns, chunksize=chunk_size)
+        else:
+            f.seek(0)
+            reader = pd.read_csv(f, chunksize=chunk_size)
+        
+        written: Dict[str, int] = {}
+        for chunk in reader:
+            for key, rows in write_log_partitions(chunk, root).items():
+                written[key] = written.get(key, 0) + rows
+    return written
+
+
+def update_log_partitions(
+    csv_path: Path,
+    root: Path = EVALUATION_LOG_PARTITIONS_DIR,
+    chunk_size: int = DEFAULT_LOG_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Bring the date partitions up to date with a CSV evaluation log
+    
+    The partitions remember how many bytes of the CSV they hold and a hash of
+    the bytes just before that point. If those bytes are unchanged and the
+    CSV only grew (the append-only case of ``sync_evaluation_log``), just the
+    new rows are partitioned. Otherwise the partitions are rebuilt in a
+    staging directory and swapped in.
+    
+    Args:
+        csv_path: Evaluation log CSV
+        root: Partitioned log directory
+        chunk_size: Rows per chunk while importing
+        
+    Returns:
+        Partition state with the update mode and rows per partition
+    """
+    _require_pyarrow()
+    csv_path, root = Path(csv_path), Path(root)
+    state = _read_state(root / PARTITION_STATE_FILE)
+    size = csv_path.stat().st_size
+    known = state.get("source_bytes", 0)
+    
+    intact = (
+        0 < known <= size
+        and state.get("source_tail_sha256") == _tail_sha256(csv_path, known)
+    )
+    if intact and known < size:
+        with open(csv_path, "rb") as f:
+            f.seek(known - 1)
+            intact = f.read(1) == b"\n"
+    
+    if intact and known == size:
+        mode = "unchanged"
+    elif intact:
+        mode = "append"
+        for key, rows in import_csv_log(csv_path, root, start=known, chunk_size=chunk_size).items():
+            state["partitions"][key] = state["partitions"].get(key, 0) + rows
+    else:
+        mode = "rebuild"
+        staging = root.parent / f".{root.name}.staging"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        partitions = import_csv_log(csv_path, staging, chunk_size=chunk_size)
+        if root.exists():
+            retired = root.parent / f".{root.name}.old"
+            shutil.rmtree(retired, ignore_errors=True)
+            os.replace(root, retired)
+            os.replace(staging, root)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, root)
+        with open(csv_path, "rb") as f:
+            dated = PARTITION_COLUMN in pd.read_csv(f, nrows=0).columns
+        state = {"partitions": partitions, "dated": dated}
+    
+    if mode != "unchanged":
+        state.update({
+            "source": str(csv_path),
+            "source_bytes": size,
+            "source_tail_sha256": _tail_sha256(csv_path, size),
+            "rows": sum(state["partitions"].values()),
+            "updated_at": datetime.now().isoformat(),
+        })
+        _write_state(root / PARTITION_STATE_FILE, state)
+    
+    logger.info(f"Evaluation log partitions: {mode}, {state['rows']} rows in {len(state['partitions'])} partitions")
+    return {**state, "mode": mode}
+
+
+def _partition_dirs(root: Path, lookback_days: Optional[int]) -> List[Path]:
+    """Partition directories inside the lookback window (all when None)."""
+    directories = sorted(Path(root).glob(f"{PARTITION_COLUMN}=*"))
+    dated = _read_state(Path(root) / PARTITION_STATE_FILE).get("dated", True)
+    if lookback_days is None or not dated:
+        return directories
+    
+    first_day = (datetime.now() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    return [
+        directory for directory in directories
+        if directory.name.split("=", 1)[1] != UNDATED_PARTITION
+        and directory.name.split("=", 1)[1] >= first_day
+    ]
+
+
+def read_log_partitions(
+    root: Path = EVALUATION_LOG_PARTITIONS_DIR,
+    lookback_days: Optional[int] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read the evaluation log from its date partitions
+    
+    Only partitions on or after the first day of the lookback window are
+    opened, so the cost grows with the window rather than the history.
+    Rows are still filtered exactly by ``filter_errors_for_retraining``.
+    
+    Args:
+        root: Partitioned log directory
+        lookback_days: Days to read (None reads every partition, including
+            rows without a date)
+        columns: Columns to read (default: all)
+        
+    Returns:
+        Evaluation log rows of the selected partitions
+    """
+    _require_pyarrow()
+    frames = [
+        pq.read_table(part, columns=list(columns) if columns else None).to_pandas()
+        for directory in _partition_dirs(root, lookback_days)
+        for part in sorted(directory.glob("part-*.parquet"))
+    ]
+    if not frames:
+        return pd.DataFrame(columns=list(columns) if columns else None)
+    return pd.concat(frames, ignore_index=True)
+
+
+def export_csv_log(
+    root: Path,
+    csv_path: Path,
+    lookback_days: Optional[int] = None,
+) -> int:
+    """
+    Write the partitioned evaluation log back to a single CSV
+    
+    Args:
+        root: Partitioned log directory
+        csv_path: Output CSV
+        lookback_days: Days to export (default: everything)
+        
+    Returns:
+        Number of rows written
+    """
+    _require_pyarrow()
+    rows = 0
+    for directory in _partition_dirs(root, lookback_days):
+        for part in sorted(directory.glob("part-*.parquet")):
+            chunk = pq.read_table(part).to_pandas()
+            chunk.to_csv(csv_path, mode="a" if rows else "w", header=not rows, index=False)
+            rows += len(chunk)
+    if not rows:
+        pd.DataFrame().to_csv(csv_path, index=False)
+    return rows
+
 
 def load_evaluation_log(lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Optional[pd.DataFrame]:
     """
-    Load evaluation log from Supabase Storage
+    Load evaluation log from Supabase Storage, through the local sync cache
+    
+    With pyarrow installed the synced log is kept in date partitions and only
+    the partitions inside the lookback window are read; otherwise the whole
+    CSV is parsed.
     
     Args:
         lookback_days: Number of days to look back in evaluation log
@@ -32,10 +390,14 @@ def load_evaluation_log(lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Optional[
         DataFrame with evaluation log or None if failed
     """
     try:
-        temp_path = TEMP_DIR / f"evaluation_log_{datetime.now().isoformat()}.csv"
-        download_file_from_storage(STORAGE_BUCKET, EVALUATION_LOG_PATH, str(temp_path))
+        log_path, _ = sync_evaluation_log()
         
-        df = pd.read_csv(temp_path)
+        if pq is None:
+            logger.warning("pyarrow not installed; parsing the whole evaluation log instead of its date partitions")
+            df = pd.read_csv(log_path)
+        else:
+            update_log_partitions(log_path, EVALUATION_LOG_PARTITIONS_DIR)
+            df = read_log_partitions(EVALUATION_LOG_PARTITIONS_DIR, lookback_days=lookback_days)
         logger.info(f"Loaded evaluation log with {len(df)} records")
         
         return df
@@ -44,6 +406,49 @@ def load_evaluation_log(lookback_days: int = DEFAULT_LOOKBACK_DAYS) -> Optional[
         return None
 
 
+def iter_evaluation_log(
+    lookback_days: Optional[int] = DEFAULT_LOOKBACK_DAYS,
+    chunk_size: int = DEFAULT_LOG_CHUNK_SIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield the synced evaluation log in chunks of at most ``chunk_size`` rows
+    
+    With pyarrow the chunks are record batches of the date partitions inside
+    the lookback window; otherwise the whole CSV is read in chunks.
+    
+    Args:
+        lookback_days: Days of partitions to read (None for all)
+        chunk_size: Maximum rows per chunk
+        
+    Yields:
+        Evaluation log chunks
+    """
+    log_path, _ = sync_evaluation_log()
+    if pq is None:
+        logger.warning("pyarrow not installed; reading the whole evaluation log instead of its date partitions")
+        yield from pd.read_csv(log_path, chunksize=chunk_size)
+        return
+    
+    update_log_partitions(log_path, EVALUATION_LOG_PARTITIONS_DIR, chunk_size=chunk_size)
+    for directory in _partition_dirs(EVALUATION_LOG_PARTITIONS_DIR, lookback_days):
+        for part in sorted(directory.glob("part-*.parquet")):
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+
+
+def _error_mask(df: pd.DataFrame, cutoff_date: datetime, confidence_threshold: float) -> pd.Series:
+    """
+    Rows that are confident mispredictions on or after the cutoff
+    
+    ``match_date`` must already be parsed; logs without it are not filtered
+    by date.
+    """
+    mask = (df["predicted_outcome"] != df["actual_outcome"]) & (df["confidence"] > confidence_threshold)
+    if "match_date" in df.columns:
+        mask &= df["match_date"] >= cutoff_date
+    return mask
+
+
 def filter_errors_for_retraining(
     df: pd.DataFrame,
     lookback_days: int = DEFAULT_LOOKBACK_DAYS,
@@ -66,27 +471,18 @@ def filter_errors_for_retraining(
     
     try:
         # Ensure we have required columns
-        required_columns = ["predicted_outcome", "actual_outcome", "confidence"]
-        if not all(col in df.columns for col in required_columns):
-            missing = [col for col in required_columns if col not in df.columns]
+        missing = [col for col in REQUIRED_LOG_COLUMNS if col not in df.columns]
+        if missing:
             logger.error(f"Missing required columns: {missing}")
             return pd.DataFrame()
         
         # Convert match_date to datetime if it exists
         if "match_date" in df.columns:
-            df["match_date"] = pd.to_datetime(df["match_date"], errors="coerce")
-            cutoff_date = datetime.now() - timedelta(days=lookback_days)
-            date_filter = df["match_date"] >= cutoff_date
-        else:
-            # If no match_date, include all
-            date_filter = pd.Series([True] * len(df))
+            df["match_date"] = pd.to_datetime(df["match_date"], format=MATCH_DATE_FORMAT, errors="coerce")
         
         # Filter: incorrect predictions with high confidence
-        incorrect = df[
-            (df["predicted_outcome"] != df["actual_outcome"])
-            & (df["confidence"] > confidence_threshold)
-            & date_filter
-        ]
+        cutoff_date = datetime.now() - timedelta(days=lookback_days)
+        incorrect = df[_error_mask(df, cutoff_date, confidence_threshold)]
         
         logger.info(
             f"Filtered {len(incorrect)} errors from {len(df)} records "
@@ -173,3 +569,83 @@ def prepare_retraining_data(
         return None, 0
     
     return result, len(errors)
+
+
+def stream_retraining_data(
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+    confidence_threshold: float = ERROR_CONFIDENCE_THRESHOLD,
+    chunk_size: int = DEFAULT_LOG_CHUNK_SIZE,
+    min_errors: int = 1,
+) -> Tuple[Optional[str], int]:
+    """
+    Streaming variant of ``prepare_retraining_data``
+    
+    The log is filtered one chunk at a time and matching rows are appended
+    to a staging file, so memory stays at one chunk however long the log
+    is. Only running counts are kept. Once the error count is final, the
+    staging file is renamed to the dataset path if it has ``min_errors``
+    rows and removed otherwise. The dataset header is the log's column set,
+    taken from the first chunk; a later chunk with other columns fails the
+    run rather than having them dropped.
+    
+    Args:
+        lookback_days: Number of days to look back
+        confidence_threshold: Minimum confidence for errors
+        chunk_size: Maximum rows per chunk
+        min_errors: Errors needed to keep the dataset
+        
+    Returns:
+        Tuple of (dataset_path, error_count); dataset_path is None if fewer
+        than ``min_errors`` errors were found or the log could not be read
+    """
+    cutoff_date = datetime.now() - timedelta(days=lookback_days)
+    dataset_path = TEMP_DIR / generate_dataset_filename()
+    staging = dataset_path.with_name(f".{dataset_path.name}.partial")
+    rows = chunk_count = error_count = 0
+    columns = None
+    
+    try:
+        for chunk in iter_evaluation_log(lookback_days, chunk_size):
+            if columns is None:
+                columns = list(chunk.columns)
+            elif set(chunk.columns) != set(columns):
+                raise ValueError(
+                    f"Evaluation log columns changed in chunk {chunk_count + 1}: "
+                    f"added {sorted(set(chunk.columns) - set(columns))}, "
+                    f"missing {sorted(set(columns) - set(chunk.columns))}"
+                )
+            
+            missing = [col for col in REQUIRED_LOG_COLUMNS if col not in chunk.columns]
+            if missing:
+                logger.error(f"Missing required columns: {missing}")
+                return None, 0
+            
+            if "match_date" in chunk.columns:
+                chunk["match_date"] = pd.to_datetime(chunk["match_date"], format=MATCH_DATE_FORMAT, errors="coerce")
+            errors = chunk[_error_mask(chunk, cutoff_date, confidence_threshold)]
+            if len(errors):
+                errors[columns].to_csv(
+                    staging, mode="a" if error_count else "w", header=not error_count, index=False
+                )
+            
+            rows += len(chunk)
+            chunk_count += 1
+            error_count += len(errors)
+        
+        logger.info(
+            f"Filtered {error_count} errors from {rows} records in {chunk_count} chunks "
+            f"(confidence > {confidence_threshold}, lookback {lookback_days} days)"
+        )
+        
+        if error_count < max(min_errors, 1):
+            logger.info(f"Not enough errors for retraining: {error_count} (min: {min_errors})")
+            return None, error_count
+        
+        os.replace(staging, dataset_path)
+        logger.info(f"Created fine-tuning dataset with {error_count} samples at {dataset_path}")
+        return str(dataset_path), error_count
+    except Exception as e:
+        logger.error(f"Failed to stream retraining data: {str(e)}")
+        return None, 0
+    finally:
+        staging.unlink(missing_ok=True)
@@ -0,0 +1,299 @@
+"""
+Dataset Cache - Content-addressed binary cache for validated training inputs.
+
+Parsing a CSV on every training run is the slow part of small retrains and
+sweeps. The cache stores the validated feature matrix and labels per
+
+    sha256(file contents) + input_features + target_column
+
+as one ``.npy`` file per column, which ``np.load(mmap_mode="r")`` maps
+without parsing. Numeric columns stay memory-mapped in the loaded frame.
+String columns are stored as int32 category codes (-1 for missing) with the
+categories in ``meta.json`` and are decoded into memory on load.
+
+Cross-validation fold indices are cached the same way, per dataset digest,
+target and split settings, so every config is scored on identical folds.
+
+File digests are memoized by (path, size, mtime), so an unchanged dataset is
+not even re-hashed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; old entries are then never hit
+CACHE_FORMAT_VERSION = 1
+
+DIGEST_INDEX = "digests.json"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class DatasetCache:
+    """Content-addressed store of validated (X, y) training inputs."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries (created on first store)
+        """
+        self.cache_dir = Path(cache_dir)
+
+    def file_digest(self, path: str) -> str:
+        """
+        SHA-256 of a file's contents, memoized by path, size and mtime.
+
+        Args:
+            path: File to hash
+
+        Returns:
+            Hex digest
+        """
+        path = Path(path).resolve()
+        stat = path.stat()
+        index = self._read_json(self.cache_dir / DIGEST_INDEX) or {}
+        entry = index.get(str(path))
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        index[str(path)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+        self._write_json(self.cache_dir / DIGEST_INDEX, index)
+        return sha256
+
+    def key(self, path: str, input_features: Sequence[str], target_column: str) -> str:
+        """
+        Cache key for a dataset file and column selection.
+
+        Args:
+            path: Dataset file
+            input_features: Selected feature columns, in order
+            target_column: Target column
+
+        Returns:
+            Hex key identifying the cache entry
+        """
+        return self._selection_key({
+            "sha256": self.file_digest(path),
+            "input_features": list(input_features),
+            "target_column": target_column,
+        })
+
+    def fold_key(
+        self,
+        path: str,
+        target_column: str,
+        strategy: str,
+        n_splits: int,
+        random_seed: int,
+    ) -> str:
+        """
+        Cache key for the cross-validation folds of a dataset file.
+
+        Features are not part of the key, so configs with different inputs
+        share the folds of the same labeled rows.
+
+        Args:
+            path: Dataset file
+            target_column: Target column the folds are stratified on
+            strategy: Fold strategy name
+            n_splits: Number of folds
+            random_seed: Shuffle seed
+
+        Returns:
+            Hex key identifying the folds
+        """
+        return self._selection_key({
+            "sha256": self.file_digest(path),
+            "target_column": target_column,
+            "strategy": strategy,
+            "n_splits": n_splits,
+            "random_seed": random_seed,
+        })
+
+    def load(self, key: str) -> Optional[Tuple[pd.DataFrame, pd.Series]]:
+        """
+        Load a cached (X, y) pair.
+
+        Numeric columns are wrapped without copying, so they stay read-only
+        memory maps; categorical columns are decoded into object arrays.
+
+        Args:
+            key: Key from ``key``
+
+        Returns:
+            Tuple of (features DataFrame, target Series), or None on a miss
+            or an unreadable entry
+        """
+        entry = self.cache_dir / key
+        meta = self._read_json(entry / "meta.json")
+        if meta is None or meta.get("version") != CACHE_FORMAT_VERSION:
+            return None
+
+        try:
+            X = pd.DataFrame(
+                {column["name"]: self._load_column(entry, column) for column in meta["columns"]},
+                index=pd.RangeIndex(meta["rows"]),
+                copy=False,
+            )
+            y = pd.Series(self._load_column(entry, meta["target"]), name=meta["target"]["name"], copy=False)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable dataset cache entry {key}: {e}")
+            return None
+
+        return X, y
+
+    def store(self, key: str, X: pd.DataFrame, y: pd.Series, source: str) -> Path:
+        """
+        Write a validated (X, y) pair under ``key``.
+
+        The entry is written to a temporary directory and renamed into place,
+        so concurrent readers never see a partial entry.
+
+        Args:
+            key: Key from ``key``
+            X: Validated features
+            y: Validated target
+            source: Original dataset path, recorded for reference
+
+        Returns:
+            Path of the cache entry
+        """
+        entry = self.cache_dir / key
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir))
+
+        try:
+            columns = [
+                self._store_column(staging, f"x{index:04d}", X[name])
+                for index, name in enumerate(X.columns)
+            ]
+            target = self._store_column(staging, "y", y)
+            self._write_json(staging / "meta.json", {
+                "version": CACHE_FORMAT_VERSION,
+                "source": str(source),
+                "rows": len(X),
+                "columns": columns,
+                "target": target,
+                "created_at": datetime.now().isoformat(),
+            })
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                # Another process stored the same entry first
+                shutil.rmtree(staging, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Dataset cached at {entry}")
+        return entry
+
+    def load_folds(self, key: str) -> Optional[List[Tuple[np.ndarray, np.ndarray]]]:
+        """
+        Load cached (train, test) index arrays.
+
+        Args:
+            key: Key from ``fold_key``
+
+        Returns:
+            List of (train indices, test indices), or None on a miss
+        """
+        try:
+            with np.load(self.cache_dir / f"folds-{key}.npz") as archive:
+                n_splits = len(archive.files) // 2
+                return [(archive[f"train{i}"], archive[f"test{i}"]) for i in range(n_splits)]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def store_folds(self, key: str, folds: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Path:
+        """
+        Atomically write (train, test) index arrays under ``key``.
+
+        Args:
+            key: Key from ``fold_key``
+            folds: List of (train indices, test indices)
+
+        Returns:
+            Path of the fold file
+        """
+        path = self.cache_dir / f"folds-{key}.npz"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {}
+        for i, (train_index, test_index) in enumerate(folds):
+            arrays[f"train{i}"] = np.asarray(train_index, dtype=np.int64)
+            arrays[f"test{i}"] = np.asarray(test_index, dtype=np.int64)
+
+        fd, staging = tempfile.mkstemp(prefix=f".{path.name}.", dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(staging, path)
+        return path
+
+    @staticmethod
+    def _selection_key(selection: Dict[str, Any]) -> str:
+        """Hash a JSON-serializable selection into a cache key."""
+        payload = json.dumps({"version": CACHE_FORMAT_VERSION, **selection}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    @staticmethod
+    def _store_column(directory: Path, stem: str, values: pd.Series) -> Dict[str, Any]:
+        """Save one column as .npy; strings become int32 category codes."""
+        filename = f"{stem}.npy"
+        column: Dict[str, Any] = {"name": values.name, "file": filename}
+
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            np.save(directory / filename, values.to_numpy())
+            column["kind"] = "numeric"
+        else:
+            codes, categories = pd.factorize(values, use_na_sentinel=True)
+            np.save(directory / filename, codes.astype(np.int32))
+            column["kind"] = "categorical"
+            column["categories"] = categories.tolist()
+        return column
+
+    @staticmethod
+    def _load_column(directory: Path, column: Dict[str, Any]) -> np.ndarray:
+        """Memory-map one column; categorical codes are decoded to objects."""
+        values = np.load(directory / column["file"], mmap_mode="r")
+        if column["kind"] == "numeric":
+            return values
+
+        categories = np.array(column["categories"] + [np.nan], dtype=object)
+        return categories[values]
+
+    @staticmethod
+    def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+        """Read a JSON file, returning None if it is missing or corrupt."""
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+        """Atomically write a JSON file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(staging, path)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Ensemble Analytics - Conflict-region and calibration statistics for the ensemble.
+
+``conflict_detected`` is a per-call boolean and nothing aggregates it. This
+module re-scores an evaluation log with the ensemble and bins the results to
+show how accuracy depends on the winning margin and on the final confidence.
+
+Key Responsibilities:
+- Stream the log in chunks and score each chunk with ``predict_batch``
+- Histogram ``conflict_margin`` and ``final_confidence`` with per-bin accuracy
+  using vectorized group-bys (``np.bincount``), so memory stays constant
+- Compute the reliability curve and expected calibration error (ECE)
+- Suggest a data-driven ``CONFLICT_THRESHOLD``: the widest low-margin region
+  whose predictions, as a group, are still right less often than a target
+  accuracy
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    print("ERROR: pandas is required. Install via: pip install pandas")
+    sys.exit(1)
+
+from .ensemble_predictor import EnsemblePredictor, invalid_vote_rows, iter_log_chunks
+
+
+def _bin_index(values: np.ndarray, bins: int) -> np.ndarray:
+    """Map values in [0, 1] to equal-width bin indices."""
+    return np.clip((values * bins).astype(np.intp), 0, bins - 1)
+
+
+def _histogram_rows(
+    edges: np.ndarray,
+    counts: np.ndarray,
+    correct: np.ndarray,
+    confidence_sums: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """Format non-empty bins as JSON-friendly rows."""
+    rows = []
+    for index in np.flatnonzero(counts):
+        row = {
+            "bin_start": round(float(edges[index]), 4),
+            "bin_end": round(float(edges[index + 1]), 4),
+            "count": int(counts[index]),
+            "accuracy": round(float(correct[index] / counts[index]), 4),
+        }
+        if confidence_sums is not None:
+            row["mean_confidence"] = round(float(confidence_sums[index] / counts[index]), 4)
+        rows.append(row)
+    return rows
+
+
+def suggest_conflict_threshold(
+    edges: np.ndarray,
+    counts: np.ndarray,
+    correct: np.ndarray,
+    target_accuracy: float = 0.5,
+    min_count: int = 30,
+) -> Optional[float]:
+    """
+    Pick a conflict threshold from a margin histogram.
+
+    Returns the largest bin edge ``t`` such that predictions with margin below
+    ``t`` are, taken together, correct less often than ``target_accuracy``,
+    considering only regions with at least ``min_count`` rows.
+
+    :param edges: Margin bin edges (len(counts) + 1)
+    :param counts: Rows per margin bin
+    :param correct: Correct predictions per margin bin
+    :param target_accuracy: Accuracy below which predictions count as conflicted
+    :param min_count: Minimum number of flagged rows for a usable threshold
+    :return: Suggested threshold, or None if no region qualifies
+    """
+    flagged = np.cumsum(counts)
+    flagged_correct = np.cumsum(correct)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        flagged_accuracy = flagged_correct / flagged
+    eligible = np.flatnonzero((flagged >= min_count) & (flagged_accuracy < target_accuracy))
+    if len(eligible) == 0:
+        return None
+    return round(float(edges[eligible[-1] + 1]), 4)
+
+
+def analyze_conflicts(
+    evaluation_log: Union[str, Path, "pd.DataFrame"],
+    predictor: Optional[EnsemblePredictor] = None,
+    bins: int = 50,
+    chunk_size: int = 200_000,
+    actual_column: str = "actual_result",
+    target_accuracy: float = 0.5,
+    min_count: int = 30,
+) -> Dict[str, Any]:
+    """
+    Build margin/confidence histograms and a calibration report for the ensemble.
+
+    :param evaluation_log: CSV/Parquet log path (streamed) or an in-memory
+                           DataFrame with per-sub-model vote columns
+    :param predictor: Predictor to score with (default: EnsemblePredictor())
+    :param bins: Equal-width bins over [0, 1] for margin and confidence
+    :param chunk_size: Rows per streamed chunk
+    :param actual_column: Column holding the actual outcome
+    :param target_accuracy: Accuracy below which low-margin predictions are
+                            considered conflicted when suggesting a threshold
+    :param min_count: Minimum flagged rows for a suggested threshold
+    :return: Report with rows, invalid_rows, accuracy, ece, margin_histogram,
+             reliability and conflict_threshold sections; rows with an unknown
+             outcome label or a confidence outside [0, 1] are left out and
+             counted in invalid_rows
+    :raises ValueError: If the log has no scorable rows with an actual outcome
+    """
+    predictor = EnsemblePredictor.from_snapshot((predictor or EnsemblePredictor()).snapshot)
+    threshold = predictor.CONFLICT_THRESHOLD
+    edges = np.linspace(0.0, 1.0, bins + 1)
+
+    margin_counts = np.zeros(bins, dtype=np.int64)
+    margin_correct = np.zeros(bins, dtype=np.int64)
+    confidence_counts = np.zeros(bins, dtype=np.int64)
+    confidence_correct = np.zeros(bins, dtype=np.int64)
+    confidence_sums = np.zeros(bins, dtype=np.float64)
+    current_flagged = current_flagged_correct = invalid_rows = 0
+
+    if isinstance(evaluation_log, pd.DataFrame):
+        chunks = [evaluation_log]
+    else:
+        chunks = iter_log_chunks(evaluation_log, chunk_size)
+
+    for chunk in chunks:
+        if actual_column not in chunk.columns:
+            raise ValueError(f"Missing required columns: ['{actual_column}']")
+        chunk = chunk[chunk[actual_column].notna()]
+        invalid = invalid_vote_rows(predictor, chunk, actual_column)
+        if invalid.any():
+            invalid_rows += int(invalid.sum())
+            chunk = chunk[~invalid]
+        outcomes, confidences, mask = predictor.frame_to_votes(chunk)
+        scorable = mask.any(axis=1)
+        if not scorable.any():
+            continue
+
+        batch = predictor.predict_batch(outcomes[scorable], confidences[scorable], mask[scorable])
+        actual = predictor.encode_outcomes(chunk[actual_column].to_numpy()[scorable])
+        correct = (batch["winner"] == actual).astype(np.int64)
+
+        margin_bin = _bin_index(batch["conflict_margin"], bins)
+        margin_counts += np.bincount(margin_bin, minlength=bins)
+        margin_correct += np.bincount(margin_bin, weights=correct, minlength=bins).astype(np.int64)
+
+        confidence_bin = _bin_index(batch["final_confidence"], bins)
+        confidence_counts += np.bincount(confidence_bin, minlength=bins)
+        confidence_correct += np.bincount(confidence_bin, weights=correct, minlength=bins).astype(np.int64)
+        confidence_sums += np.bincount(confidence_bin, weights=batch["final_confidence"], minlength=bins)
+
+        flagged = batch["conflict_detected"]
+        current_flagged += int(flagged.sum())
+        current_flagged_correct += int(correct[flagged].sum())
+
+    total = int(margin_counts.sum())
+    if total == 0:
+        raise ValueError("No evaluable rows in evaluation log")
+
+    # ECE: count-weighted gap between mean confidence and accuracy per bin
+    occupied = confidence_counts > 0
+    gaps = np.abs(
+        confidence_correct[occupied] / confidence_counts[occupied]
+        - confidence_sums[occupied] / confidence_counts[occupied]
+    )
+    ece = float((confidence_counts[occupied] / total * gaps).sum())
+
+    suggested = suggest_conflict_threshold(edges, margin_counts, margin_correct, target_accuracy, min_count)
+    if suggested is not None:
+        below = edges[1:] <= suggested + 1e-12
+        suggested_flagged = int(margin_counts[below].sum())
+        suggested_flagged_correct = int(margin_correct[below].sum())
+    else:
+        suggested_flagged = suggested_flagged_correct = 0
+
+    return {
+        "rows": total,
+        "invalid_rows": invalid_rows,
+        "accuracy": round(float(margin_correct.sum() / total), 4),
+        "ece": round(ece, 4),
+        "bins": bins,
+        "margin_histogram": _histogram_rows(edges, margin_counts, margin_correct),
+        "reliability": _histogram_rows(edges, confidence_counts, confidence_correct, confidence_sums),
+        "conflict_threshold": {
+            "current": threshold,
+            "current_flag_rate": round(current_flagged / total, 4),
+            "current_flagged_accuracy": (
+                round(current_flagged_correct / current_flagged, 4) if current_flagged else None
+            ),
+            "target_accuracy": target_accuracy,
+            "suggested": suggested,
+            "suggested_flag_rate": round(suggested_flagged / total, 4),
+            "suggested_flagged_accuracy": (
+                round(suggested_flagged_correct / suggested_flagged, 4) if suggested_flagged else None
+            ),
+        },
+        "weights": predictor.get_config(),
+    }
+
+
+def main():
+    """CLI entry point for ensemble conflict and calibration analytics."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Histogram ensemble conflict margins and confidence calibration"
+    )
+    parser.add_argument(
+        "log_file",
+        help="Evaluation log (CSV or Parquet) with per-sub-model vote columns",
+    )
+    parser.add_argument(
+        "--bins",
+        type=int,
+        default=50,
+        help="Number of equal-width bins over [0, 1] (default: 50)",
+    )
+    parser.add_argument(
+        "--target-accuracy",
+        type=float,
+        default=0.5,
+        help="Accuracy below which low-margin predictions are conflicts (default: 0.5)",
+    )
+    parser.add_argument(
+        "--min-samples",
+        type=int,
+        default=30,
+        help="Minimum flagged rows for a suggested threshold (default: 30)",
+    )
+    parser.add_argument(
+        "--actual-column",
+        default="actual_result",
+        help="Column holding the actual outcome (default: actual_result)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Output JSON file (default: stdout)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        report = analyze_conflicts(
+            args.log_file,
+            bins=args.bins,
+            actual_column=args.actual_column,
+            target_accuracy=args.target_accuracy,
+            min_count=args.min_samples,
+        )
+
+        output = json.dumps(report, indent=2)
+
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(output)
+            suggestion = report["conflict_threshold"]["suggested"]
+            print(f"✅ ECE {report['ece']:.4f}, suggested CONFLICT_THRESHOLD: {suggestion}. Output: {args.output}")
+        else:
+            print(output)
+
+        return 0
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
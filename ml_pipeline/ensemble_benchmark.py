@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Ensemble Benchmark - Measures EnsemblePredictor throughput.
+
+Two levels of measurement, both driven by seeded synthetic votes so they run
+offline and are reproducible:
+
+- ``run_microbenchmark`` compares the dict-building ``predict`` path against
+  the quiet ``predict_fast`` hot path, fed with labels or integer codes.
+- ``run_suite`` drives the scalar paths, the batch paths and config swaps at
+  several match counts (1, 1k, 100k and 10M by default) and reports
+  throughput, p50/p99 latency and peak traced memory per scenario.
+
+Suite results are plain JSON; ``compare_results`` diffs two result files
+(e.g. from two commits) and flags scenarios whose throughput dropped by more
+than a threshold.
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .ensemble_predictor import OUTPUT_LABELS, EnsemblePredictor
+
+DEFAULT_SIZES = (1, 1_000, 100_000, 10_000_000)
+SCALAR_PATHS = ("predict", "predict_fast", "config_swap")
+BATCH_PATHS = ("predict_batch", "predict_proba_batch")
+DEFAULT_THRESHOLD = 0.10
+
+
+def _calls_per_second(call: Callable[[int], Any], iterations: int) -> float:
+    """Time ``call(i)`` for i in range(iterations) and return calls per second."""
+    start = time.perf_counter()
+    for index in range(iterations):
+        call(index)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed > 0 else float("inf")
+
+
+def run_microbenchmark(iterations: int = 100_000, seed: int = 42) -> Dict[str, Any]:
+    """
+    Compare calls per second of the scalar ensemble paths.
+
+    :param iterations: Number of predictions per path
+    :param seed: Seed for the synthetic votes
+    :return: Dict with calls per second per path and speedups over ``predict``
+    """
+    rng = np.random.default_rng(seed)
+    size = min(iterations, 4096)
+    codes: List[List[int]] = rng.integers(0, 3, size=(size, 3)).tolist()
+    confidences: List[List[float]] = rng.uniform(0.3, 0.95, size=(size, 3)).tolist()
+    labels = [[OUTPUT_LABELS[code] for code in row] for row in codes]
+
+    predictor = EnsemblePredictor()
+
+    def dict_path(index: int) -> Any:
+        row = index % size
+        outcome, confidence = labels[row], confidences[row]
+        return predictor.predict(
+            full_time_prediction=outcome[0],
+            full_time_confidence=confidence[0],
+            half_time_prediction=outcome[1],
+            half_time_confidence=confidence[1],
+            pattern_prediction=outcome[2],
+            pattern_confidence=confidence[2],
+        )
+
+    def fast_labels(index: int) -> Any:
+        row = index % size
+        return predictor.predict_fast(labels[row], confidences[row])
+
+    def fast_codes(index: int) -> Any:
+        row = index % size
+        return predictor.predict_fast(codes[row], confidences[row])
+
+    results = {
+        "predict": _calls_per_second(dict_path, iterations),
+        "predict_fast_labels": _calls_per_second(fast_labels, iterations),
+        "predict_fast_codes": _calls_per_second(fast_codes, iterations),
+    }
+
+    return {
+        "iterations": iterations,
+        "seed": seed,
+        "calls_per_second": {name: round(value, 1) for name, value in results.items()},
+        "speedup_vs_predict": {
+            name: round(value / results["predict"], 2) for name, value in results.items()
+        },
+    }
+
+
+def _synthetic_chunk(seed: int, index: int, rows: int, n_models: int) -> Dict[str, np.ndarray]:
+    """
+    Generate one chunk of synthetic votes.
+
+    Each chunk has its own seed sequence, so a 10M-match run never holds more
+    than one chunk in memory and chunk ``i`` is identical across runs.
+    """
+    rng = np.random.default_rng([seed, index])
+    mask = rng.random((rows, n_models)) < 0.9
+    # Every match needs at least one vote to be scorable
+    mask[:, 0] |= ~mask.any(axis=1)
+    return {
+        "outcomes": rng.integers(0, 3, size=(rows, n_models), dtype=np.int8),
+        "confidences": rng.uniform(0.3, 0.95, size=(rows, n_models)),
+        "mask": mask,
+        "probabilities": rng.dirichlet(np.ones(3), size=(rows, n_models)),
+    }
+
+
+def _summarize(
+    path: str,
+    size: int,
+    calls: int,
+    items: int,
+    elapsed: float,
+    latencies_ns: np.ndarray,
+    peak_bytes: int,
+) -> Dict[str, Any]:
+    """Build one scenario record; latencies are per call (scalar) or per chunk (batch)."""
+    return {
+        "path": path,
+        "size": size,
+        "calls": calls,
+        "sampled": items < size,
+        "items_per_second": round(items / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": round(float(np.percentile(latencies_ns, 50)) / 1e6, 6),
+        "p99_ms": round(float(np.percentile(latencies_ns, 99)) / 1e6, 6),
+        "peak_memory_mb": round(peak_bytes / 2**20, 3),
+    }
+
+
+def _peak_memory(call: Callable[[], Any]) -> int:
+    """Run ``call`` once under tracemalloc and return the peak traced bytes."""
+    tracemalloc.start()
+    try:
+        call()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _bench_scalar(path: str, size: int, seed: int, scalar_limit: int) -> Dict[str, Any]:
+    """Time one scalar path call by call; large sizes are sampled at ``scalar_limit``."""
+    predictor = EnsemblePredictor()
+    calls = min(size, scalar_limit)
+    pool = min(calls, 4096)
+    rng = np.random.default_rng([seed, size])
+    codes = rng.integers(0, 3, size=(pool, 3)).tolist()
+    confidences = rng.uniform(0.3, 0.95, size=(pool, 3)).tolist()
+    labels = [[OUTPUT_LABELS[code] for code in row] for row in codes]
+    swaps = (dict(EnsemblePredictor.DEFAULT_WEIGHTS), {"ft": 0.4, "ht": 0.35, "pt": 0.25})
+
+    if path == "predict":
+        def call(index: int) -> Any:
+            outcome, confidence = labels[index % pool], confidences[index % pool]
+            return predictor.predict(
+                full_time_prediction=outcome[0],
+                full_time_confidence=confidence[0],
+                half_time_prediction=outcome[1],
+                half_time_confidence=confidence[1],
+                pattern_prediction=outcome[2],
+                pattern_confidence=confidence[2],
+            )
+    elif path == "predict_fast":
+        def call(index: int) -> Any:
+            return predictor.predict_fast(codes[index % pool], confidences[index % pool])
+    elif path == "config_swap":
+        def call(index: int) -> Any:
+            predictor.update_config(swaps[index & 1])
+    else:
+        raise ValueError(f"Unknown scalar path: {path}")
+
+    latencies = np.empty(calls, dtype=np.int64)
+    clock = time.perf_counter_ns
+    start = clock()
+    for index in range(calls):
+        began = clock()
+        call(index)
+        latencies[index] = clock() - began
+    elapsed = (clock() - start) / 1e9
+
+    def traced() -> None:
+        for index in range(min(calls, 1000)):
+            call(index)
+
+    return _summarize(path, size, calls, calls, elapsed, latencies, _peak_memory(traced))
+
+
+def _bench_batch(path: str, size: int, seed: int, batch_size: int) -> Dict[str, Any]:
+    """Time one batch path over ``size`` matches streamed in ``batch_size`` chunks."""
+    predictor = EnsemblePredictor()
+    n_models = len(predictor.model_keys)
+    chunks = -(-size // batch_size)
+
+    if path == "predict_batch":
+        def call(chunk: Dict[str, np.ndarray]) -> Any:
+            return predictor.predict_batch(chunk["outcomes"], chunk["confidences"], chunk["mask"])
+    elif path == "predict_proba_batch":
+        def call(chunk: Dict[str, np.ndarray]) -> Any:
+            return predictor.predict_proba_batch(chunk["probabilities"], chunk["mask"])
+    else:
+        raise ValueError(f"Unknown batch path: {path}")
+
+    latencies = np.empty(chunks, dtype=np.int64)
+    elapsed_ns = 0
+    for index in range(chunks):
+        rows = min(batch_size, size - index * batch_size)
+        chunk = _synthetic_chunk(seed, index, rows, n_models)
+        began = time.perf_counter_ns()
+        call(chunk)
+        latencies[index] = time.perf_counter_ns() - began
+        elapsed_ns += latencies[index]
+
+    # Chunks are independent, so the first chunk bounds the streamed peak
+    first = _synthetic_chunk(seed, 0, min(batch_size, size), n_models)
+    peak = _peak_memory(lambda: call(first))
+
+    return _summarize(path, size, chunks, size, elapsed_ns / 1e9, latencies, peak)
+
+
+def _git_commit() -> Optional[str]:
+    """Return the current git commit hash, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    seed: int = 42,
+    paths: Sequence[str] = SCALAR_PATHS + BATCH_PATHS,
+    scalar_limit: int = 100_000,
+    batch_size: int = 100_000,
+) -> Dict[str, Any]:
+    """
+    Benchmark the ensemble paths at several match counts.
+
+    Scalar paths (``predict``, ``predict_fast``, ``config_swap``) are timed per
+    call; above ``scalar_limit`` they are sampled and marked ``sampled``.
+    Batch paths stream the matches in ``batch_size`` chunks, so latency is per
+    chunk and peak memory stays bounded at 10M matches.
+
+    :param sizes: Synthetic match counts
+    :param seed: Seed for the synthetic votes
+    :param paths: Paths to benchmark
+    :param scalar_limit: Maximum timed calls per scalar scenario
+    :param batch_size: Rows per batch call
+    :return: Dict with ``meta`` and ``results`` keyed by ``<path>@<size>``
+    """
+    unknown = set(paths) - set(SCALAR_PATHS + BATCH_PATHS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark paths: {sorted(unknown)}")
+
+    results = {}
+    for size in sizes:
+        for path in paths:
+            if path in SCALAR_PATHS:
+                record = _bench_scalar(path, size, seed, scalar_limit)
+            else:
+                record = _bench_batch(path, size, seed, batch_size)
+            results[f"{path}@{size}"] = record
+
+    return {
+        "meta": {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "seed": seed,
+            "sizes": list(sizes),
+            "scalar_limit": scalar_limit,
+            "batch_size": batch_size,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Dict[str, Any]:
+    """
+    Compare two suite results by throughput.
+
+    :param baseline: Earlier ``run_suite`` output
+    :param current: Newer ``run_suite`` output
+    :param threshold: Relative throughput drop that counts as a regression
+    :return: Dict with per-scenario ratios and the list of regressions
+    """
+    scenarios = {}
+    regressions = []
+    for name, record in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before or not before.get("items_per_second") or not record.get("items_per_second"):
+            continue
+        ratio = record["items_per_second"] / before["items_per_second"]
+        scenarios[name] = round(ratio, 3)
+        if ratio < 1.0 - threshold:
+            regressions.append(name)
+
+    return {
+        "baseline_commit": baseline.get("meta", {}).get("commit"),
+        "current_commit": current.get("meta", {}).get("commit"),
+        "threshold": threshold,
+        "throughput_ratio": scenarios,
+        "regressions": regressions,
+    }
+
+
+def main():
+    """CLI entry point for the ensemble benchmarks."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measure EnsemblePredictor throughput, latency and memory"
+    )
+    parser.add_argument(
+        "--micro",
+        action="store_true",
+        help="Run only the scalar-path microbenchmark",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=100_000,
+        help="Predictions per path for --micro (default: 100000)",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Synthetic match counts (default: 1 1000 100000 10000000)",
+    )
+    parser.add_argument(
+        "--paths",
+        nargs="+",
+        default=list(SCALAR_PATHS + BATCH_PATHS),
+        choices=SCALAR_PATHS + BATCH_PATHS,
+        help="Paths to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--scalar-limit",
+        type=int,
+        default=100_000,
+        help="Maximum timed calls per scalar scenario (default: 100000)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100_000,
+        help="Rows per batch call (default: 100000)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Seed for synthetic votes (default: 42)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Output JSON file (default: stdout)",
+    )
+    parser.add_argument(
+        "--compare",
+        help="Baseline results JSON to compare against",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative throughput drop that fails --compare (default: 0.10)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if args.micro:
+            print(json.dumps(run_microbenchmark(args.iterations, args.seed), indent=2))
+            return 0
+
+        results = run_suite(
+            sizes=args.sizes,
+            seed=args.seed,
+            paths=args.paths,
+            scalar_limit=args.scalar_limit,
+            batch_size=args.batch_size,
+        )
+        output = json.dumps(results, indent=2)
+
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(output)
+            print(f"✅ Benchmarked {len(results['results'])} scenarios. Output: {args.output}")
+        else:
+            print(output)
+
+        if args.compare:
+            with open(args.compare) as f:
+                comparison = compare_results(json.load(f), results, args.threshold)
+            print(json.dumps(comparison, indent=2))
+            if comparison["regressions"]:
+                print(f"❌ Throughput regressions: {', '.join(comparison['regressions'])}", file=sys.stderr)
+                return 1
+
+        return 0
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
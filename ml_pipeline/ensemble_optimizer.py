@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Ensemble Weight Optimizer - Fits EnsemblePredictor weights from the evaluation log.
+
+The default FT/HT/PT weights are hand-picked. This module searches the weight
+simplex for the vector that maximizes accuracy, or minimizes log-loss or Brier
+score, over historically logged sub-model votes.
+
+Key Responsibilities:
+- Convert logged votes (``<name>_prediction`` / ``<name>_confidence`` columns)
+  into dense per-row arrays once
+- Score thousands of candidate weight vectors against all rows in one
+  vectorized pass (a few BLAS matrix products per row chunk)
+- Refine the search with coarse-to-fine simplex grids, optionally fanning
+  candidate blocks out over a process pool
+- Write the winning weights in a form ``EnsemblePredictor(weights=...)``,
+  ``update_config`` and ``load_weights_file`` accept directly
+
+Probabilistic metrics need a distribution per sub-model. A top-1 vote with
+confidence ``c`` is expanded to ``c`` on the predicted outcome and
+``(1 - c) / 2`` on each of the other two; the ensemble distribution is the
+re-weighted mixture of those vectors. Accuracy uses the exact weighted-vote
+winner of ``EnsemblePredictor.predict``.
+"""
+
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    print("ERROR: pandas is required. Install via: pip install pandas")
+    sys.exit(1)
+
+from .ensemble_predictor import EnsemblePredictor, invalid_vote_rows
+
+# Metric name -> optimization direction
+METRICS = {"accuracy": "max", "log_loss": "min", "brier": "min"}
+
+# Upper bound on (rows x candidates) cells materialized per chunk
+MAX_CHUNK_CELLS = 2 ** 22
+
+# Probability floor for log-loss
+LOG_LOSS_EPS = 1e-15
+
+
+def prepare_vote_arrays(
+    frame: pd.DataFrame,
+    predictor: EnsemblePredictor,
+    actual_column: str = "actual_result",
+) -> Dict[str, Any]:
+    """
+    Convert an evaluation log into the dense arrays the optimizer scores.
+
+    Rows without an actual result or without any sub-model vote are dropped,
+    as are rows with an unknown outcome label or a confidence outside [0, 1].
+
+    :param frame: Evaluation log with per-sub-model vote columns
+    :param predictor: Predictor whose sub-model registry defines the columns
+    :param actual_column: Column holding the actual match outcome
+    :return: Dict with ``votes`` (3, N, M) one-hot confidence contributions,
+             ``distributions`` (3, N, M) expanded per-model distributions,
+             ``presence`` (N, M) float mask, ``actual`` (N,) outcome codes
+             and the ``invalid_rows`` count
+    :raises ValueError: If the actual outcome column is missing
+    """
+    if actual_column not in frame.columns:
+        raise ValueError(f"Missing required columns: ['{actual_column}']")
+
+    frame = frame[frame[actual_column].notna()]
+    invalid = invalid_vote_rows(predictor, frame, actual_column)
+    frame = frame[~invalid]
+    outcomes, confidences, mask = predictor.frame_to_votes(frame)
+    keep = mask.any(axis=1)
+    outcomes, confidences, mask = outcomes[keep], confidences[keep], mask[keep]
+    actual = predictor.encode_outcomes(frame[actual_column].to_numpy()[keep]).astype(np.intp)
+
+    n_outcomes = len(predictor.OUTCOMES)
+    confidence = np.where(mask, confidences, 0.0)
+    presence = mask.astype(np.float64)
+    votes = np.empty((n_outcomes,) + outcomes.shape, dtype=np.float64)
+    distributions = np.empty_like(votes)
+    for code in range(n_outcomes):
+        predicted = outcomes == code
+        votes[code] = np.where(predicted, confidence, 0.0)
+        distributions[code] = np.where(predicted, confidence, (1.0 - confidence) / 2.0) * presence
+
+    return {
+        "votes": votes,
+        "distributions": distributions,
+        "presence": presence,
+        "actual": actual,
+        "invalid_rows": int(invalid.sum()),
+    }
+
+
+def evaluate_weights(
+    arrays: Dict[str, np.ndarray],
+    candidates: np.ndarray,
+    metric: str = "accuracy",
+    chunk_size: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Score every candidate weight vector against every logged row.
+
+    Rows are processed in chunks so peak memory is bounded by
+    ``chunk_size x len(candidates)`` cells regardless of log length. Rows
+    where a candidate gives zero weight to every present model count as
+    misses (accuracy) or as a uniform prediction (log-loss, Brier).
+
+    :param arrays: Output of ``prepare_vote_arrays``
+    :param candidates: (K, M) non-negative weight vectors
+    :param metric: One of METRICS
+    :param chunk_size: Rows per chunk (default: derived from MAX_CHUNK_CELLS)
+    :return: (K,) mean metric value per candidate
+    :raises ValueError: If the metric is unknown or there are no rows
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric} (expected one of {sorted(METRICS)})")
+
+    candidates = np.asarray(candidates, dtype=np.float64)
+    weights_t = candidates.T
+    presence = arrays["presence"]
+    actual = arrays["actual"]
+    n_rows = len(actual)
+    if n_rows == 0:
+        raise ValueError("No evaluable rows in evaluation log")
+
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_CELLS // max(1, len(candidates)))
+
+    totals = np.zeros(len(candidates), dtype=np.float64)
+    for start in range(0, n_rows, chunk_size):
+        rows = slice(start, start + chunk_size)
+        y = actual[rows]
+        denominator = presence[rows] @ weights_t
+        valid = denominator > 0
+
+        if metric == "accuracy":
+            # Normalizing by the denominator does not change the argmax
+            votes = arrays["votes"]
+            scores = [votes[code][rows] @ weights_t for code in range(votes.shape[0])]
+            best = scores[0]
+            winner = np.zeros(best.shape, dtype=np.intp)
+            for code in range(1, len(scores)):
+                better = scores[code] > best
+                winner = np.where(better, code, winner)
+                best = np.where(better, scores[code], best)
+            totals += ((winner == y[:, None]) & valid).sum(axis=0)
+            continue
+
+        distributions = arrays["distributions"]
+        n_outcomes = distributions.shape[0]
+        safe_denominator = np.where(valid, denominator, 1.0)
+        uniform = 1.0 / n_outcomes
+
+        if metric == "log_loss":
+            chunk = np.arange(len(y))
+            actual_distribution = distributions[:, rows][y, chunk]
+            probability = np.where(valid, (actual_distribution @ weights_t) / safe_denominator, uniform)
+            totals += -np.log(np.clip(probability, LOG_LOSS_EPS, 1.0)).sum(axis=0)
+        else:
+            squared_error = np.zeros(denominator.shape, dtype=np.float64)
+            for code in range(n_outcomes):
+                probability = np.where(valid, (distributions[code][rows] @ weights_t) / safe_denominator, uniform)
+                target = (y == code).astype(np.float64)[:, None]
+                squared_error += (probability - target) ** 2
+            totals += squared_error.sum(axis=0)
+
+    return totals / n_rows
+
+
+def simplex_grid(n_models: int, step: float) -> np.ndarray:
+    """
+    Enumerate all weight vectors on the simplex with the given resolution.
+
+    :param n_models: Number of sub-models
+    :param step: Grid spacing; 1 / step should be an integer
+    :return: (K, n_models) array of weight vectors summing to 1
+    """
+    units = int(round(1.0 / step))
+    points = []
+    # Stars and bars: choose n_models - 1 bar positions among units + n_models - 1 slots
+    for bars in itertools.combinations(range(units + n_models - 1), n_models - 1):
+        edges = (-1,) + bars + (units + n_models - 1,)
+        points.append([edges[i + 1] - edges[i] - 1 for i in range(n_models)])
+    return np.array(points, dtype=np.float64) / units
+
+
+def refine_grid(centers: np.ndarray, step: float, radius: int) -> np.ndarray:
+    """
+    Build a finer simplex grid in the neighbourhood of the given centers.
+
+    :param centers: (C, M) weight vectors to refine around
+    :param step: Fine grid spacing
+    :param radius: Number of fine steps to explore along each free axis
+    :return: (K, M) unique non-negative weight vectors summing to 1
+    """
+    n_models = centers.shape[1]
+    offsets = np.array(
+        list(itertools.product(range(-radius, radius + 1), repeat=n_models - 1)),
+        dtype=np.float64,
+    ) * step
+    points = []
+    for center in centers:
+        free = center[:-1] + offsets
+        last = 1.0 - free.sum(axis=1, keepdims=True)
+        points.append(np.hstack([free, last]))
+    grid = np.round(np.vstack(points), 10)
+    grid = grid[(grid >= 0).all(axis=1)]
+    return np.unique(grid, axis=0)
+
+
+_WORKER_ARRAYS: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(arrays: Dict[str, np.ndarray]) -> None:
+    """Process-pool initializer: receive the vote arrays once per worker."""
+    global _WORKER_ARRAYS
+    _WORKER_ARRAYS = arrays
+
+
+def _evaluate_block(candidates: np.ndarray, metric: str, chunk_size: Optional[int]) -> np.ndarray:
+    """Process-pool task: score a block of candidates on the worker's arrays."""
+    return evaluate_weights(_WORKER_ARRAYS, candidates, metric, chunk_size)
+
+
+def optimize_weights(
+    evaluation_log: Any,
+    metric: str = "accuracy",
+    predictor: Optional[EnsemblePredictor] = None,
+    step: float = 0.1,
+    levels: int = 3,
+    refine_factor: int = 5,
+    top_k: int = 5,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    actual_column: str = "actual_result",
+) -> Dict[str, Any]:
+    """
+    Search the weight simplex for the best ensemble weights.
+
+    The first level scores a full simplex grid with spacing ``step``; each
+    further level refines around the ``top_k`` best candidates with a grid
+    ``refine_factor`` times finer.
+
+    :param evaluation_log: Path to an evaluation log CSV or a DataFrame
+    :param metric: 'accuracy' (maximized), 'log_loss' or 'brier' (minimized)
+    :param predictor: Predictor supplying the sub-model registry and the
+                      baseline weights (default: EnsemblePredictor())
+    :param step: Grid spacing of the first level
+    :param levels: Number of coarse-to-fine levels
+    :param refine_factor: Spacing divisor between consecutive levels
+    :param top_k: Candidates refined at each level
+    :param workers: Process pool size; None or 1 evaluates in-process
+    :param chunk_size: Rows per evaluation chunk
+    :param actual_column: Column holding the actual match outcome
+    :return: Result dict with ``weights`` plus metric, score, baseline and
+             search statistics
+    :raises ValueError: If the metric is unknown or the log has no usable rows
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric} (expected one of {sorted(METRICS)})")
+
+    predictor = predictor or EnsemblePredictor()
+    snapshot = predictor.snapshot
+    if isinstance(evaluation_log, (str, Path)):
+        evaluation_log = pd.read_csv(evaluation_log)
+    arrays = prepare_vote_arrays(evaluation_log, predictor, actual_column)
+    if len(arrays["actual"]) == 0:
+        raise ValueError("No evaluable rows in evaluation log")
+
+    maximize = METRICS[metric] == "max"
+    executor = None
+    if workers and workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays,))
+
+    def score(candidates: np.ndarray) -> np.ndarray:
+        if executor is None or len(candidates) < 2 * workers:
+            return evaluate_weights(arrays, candidates, metric, chunk_size)
+        blocks = np.array_split(candidates, workers)
+        futures = [executor.submit(_evaluate_block, block, metric, chunk_size) for block in blocks]
+        return np.concatenate([future.result() for future in futures])
+
+    evaluated = 0
+    try:
+        n_models = len(snapshot.models)
+        candidates = simplex_grid(n_models, step)
+        level_step = step
+        for level in range(levels):
+            values = score(candidates)
+            evaluated += len(candidates)
+            order = np.argsort(-values if maximize else values, kind="stable")
+            best_weights = candidates[order[0]]
+            best_value = float(values[order[0]])
+            if level + 1 < levels:
+                level_step = level_step / refine_factor
+                candidates = refine_grid(candidates[order[:top_k]], level_step, refine_factor)
+
+        baseline_value = float(score(snapshot.weights[None, :] / snapshot.weights.sum())[0])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {
+        "weights": {key: round(float(w), 6) for key, w in zip(snapshot.model_keys, best_weights)},
+        "metric": metric,
+        "score": best_value,
+        "baseline_weights": snapshot.as_dict(),
+        "baseline_score": baseline_value,
+        "rows": int(len(arrays["actual"])),
+        "invalid_rows": arrays["invalid_rows"],
+        "candidates_evaluated": int(evaluated),
+        "final_step": level_step,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def write_weights_config(result: Dict[str, Any], output_path: str) -> str:
+    """
+    Write an optimizer result as a weights config file.
+
+    The file keeps the weights under a ``weights`` key next to the search
+    metadata, which ``load_weights_file`` and ``WeightRefresher`` read directly.
+
+    :param result: Output of ``optimize_weights``
+    :param output_path: Destination JSON path
+    :return: The output path
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return str(path)
+
+
+def main():
+    """CLI entry point for ensemble weight optimization."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fit ensemble sub-model weights from an evaluation log"
+    )
+    parser.add_argument(
+        "log_file",
+        help="Path to evaluation log CSV file with per-sub-model vote columns",
+    )
+    parser.add_argument(
+        "--metric",
+        choices=sorted(METRICS),
+        default="accuracy",
+        help="Objective to optimize (default: accuracy)",
+    )
+    parser.add_argument(
+        "--step",
+        type=float,
+        default=0.1,
+        help="Grid spacing of the first search level (default: 0.1)",
+    )
+    parser.add_argument(
+        "--levels",
+        type=int,
+        default=3,
+        help="Number of coarse-to-fine levels (default: 3)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process pool size for candidate evaluation (default: 1)",
+    )
+    parser.add_argument(
+        "--actual-column",
+        default="actual_result",
+        help="Column holding the actual outcome (default: actual_result)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Output weights JSON file (default: stdout)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        result = optimize_weights(
+            args.log_file,
+            metric=args.metric,
+            step=args.step,
+            levels=args.levels,
+            workers=args.workers,
+            actual_column=args.actual_column,
+        )
+
+        if args.output:
+            write_weights_config(result, args.output)
+            print(
+                f"✅ Best {args.metric}: {result['score']:.4f} "
+                f"(baseline {result['baseline_score']:.4f}). Output: {args.output}"
+            )
+        else:
+            print(json.dumps(result, indent=2))
+
+        return 0
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,24 +1,222 @@
 """Ensemble Predictor for combining multiple sub-model predictions.
 
 This module implements a weighted voting system that aggregates predictions
-from three sub-models:
+from a registry of named sub-models. The default registry holds three:
 - Full-time Model (FT): Primary model with highest weight
 - Half-time Model (HT): Intermediate predictions
 - Pattern-based Model (PT): Pattern recognition model
 
+Further models (e.g. an xG or market-odds model) can be added with
+``register_model`` or the ``models`` constructor argument.
+
 Key features:
 - Configurable weights (default: FT=0.5, HT=0.3, PT=0.2)
 - Dynamic re-weighting when sub-models return null
 - Conflict detection when top 2 outcomes have similar scores
 - Deterministic output for reproducibility
+- Vectorized batch scoring over NumPy arrays (``predict_batch``)
+- Probability-distribution voting over (N, models, 3) tensors (``predict_proba_batch``)
+- Immutable weight snapshots swapped atomically, with optional periodic
+  refresh from a file or DB row (``WeightRefresher``)
+- Integer outcome codes with a precomputed spelling lookup, and a quiet
+  ``predict_fast`` hot path returning a compact ``EnsembleResult`` tuple
+- Constant-memory streaming rescoring of CSV/Parquet evaluation logs
+  (``rescore_evaluation_log`` / ``python -m ml_pipeline.ensemble_predictor``)
+- Optional stacking mode: a logistic meta-model over the sub-model votes
+  (``StackingModel`` / ``set_stacker``) replaces weighted voting behind the
+  same ``predict`` / ``predict_batch`` interface
 """
 
-from typing import Dict, Optional, Tuple, List
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple, List, Union
+import json
 import logging
+import sys
+import threading
+
+import numpy as np
+import yaml
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
 
 logger = logging.getLogger(__name__)
 
 
+# Integer outcome codes shared by every fast/batch path
+HOME, DRAW, AWAY = 0, 1, 2
+
+# Every accepted outcome spelling mapped to its code. Exact hits skip the
+# .upper() call; mixed-case spellings fall back to the upper-cased key.
+OUTCOME_LOOKUP: Dict[str, int] = {
+    "HOME": HOME, "HOME_WIN": HOME, "home": HOME, "home_win": HOME,
+    "DRAW": DRAW, "draw": DRAW,
+    "AWAY": AWAY, "AWAY_WIN": AWAY, "away": AWAY, "away_win": AWAY,
+}
+
+# Database-format labels indexed by outcome code
+OUTPUT_LABELS = ("home_win", "draw", "away_win")
+
+
+class EnsembleResult(NamedTuple):
+    """Compact result of ``EnsemblePredictor.predict_fast``."""
+    
+    winner: int
+    final_confidence: float
+    conflict_detected: bool
+    conflict_margin: float
+    
+    @property
+    def winner_label(self) -> str:
+        """Winner in database format (home_win, draw, away_win)."""
+        return OUTPUT_LABELS[self.winner]
+
+
+def stacking_features(outcomes: np.ndarray, confidences: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """Build the stacking meta-model feature matrix from batch votes.
+    
+    Per sub-model: its vote as a confidence-scaled one-hot over OUTCOMES
+    (3 columns) and a presence flag (1 column). Per ordered pair (i, j) of
+    distinct sub-models: model j's scaled vote times ``1 - confidence_i``
+    (3 columns), which lets a linear model learn rules such as "trust HT
+    when FT confidence is low". Missing models contribute zeros.
+    
+    Args:
+        outcomes: (N, M) integer outcome codes
+        confidences: (N, M) confidences; ignored where not present
+        present: (N, M) boolean presence mask
+    
+    Returns:
+        (N, 4M + 3M(M-1)) float feature matrix
+    """
+    present = np.asarray(present, dtype=bool)
+    n_rows, n_models = present.shape
+    values = np.where(present, np.asarray(confidences, dtype=np.float64), 0.0)
+    codes = np.where(present, np.asarray(outcomes), 0).astype(np.intp)
+    
+    votes = np.zeros((n_rows, n_models, len(OUTPUT_LABELS)), dtype=np.float64)
+    np.put_along_axis(votes, codes[:, :, None], values[:, :, None], axis=2)
+    
+    doubt = 1.0 - values
+    pairs = doubt[:, :, None, None] * votes[:, None, :, :]
+    off_diagonal = ~np.eye(n_models, dtype=bool)
+    
+    return np.concatenate(
+        [
+            votes.reshape(n_rows, -1),
+            present.astype(np.float64),
+            pairs[:, off_diagonal].reshape(n_rows, -1),
+        ],
+        axis=1,
+    )
+
+
+class StackingModel(NamedTuple):
+    """Multinomial logistic meta-model over sub-model votes.
+    
+    Inference is a single ``stacking_features(...) @ coef.T + intercept``
+    product followed by a softmax, so a whole batch is scored at once.
+    """
+    
+    models: Tuple[Tuple[str, str], ...]
+    coef: np.ndarray
+    intercept: np.ndarray
+    
+    @classmethod
+    def from_estimator(cls, estimator: Any, models: Sequence[Tuple[str, str]]) -> "StackingModel":
+        """Extract a meta-model from a fitted logistic classifier.
+        
+        Args:
+            estimator: Fitted scikit-learn LogisticRegression, or a Pipeline
+                ending in one, trained on ``stacking_features``
+            models: (key, name) registry the features were built for
+        
+        Returns:
+            StackingModel with rows ordered as OUTCOMES
+        
+        Raises:
+            ValueError: If the classifier was not trained on all three outcomes
+        """
+        if hasattr(estimator, "steps"):
+            estimator = estimator.steps[-1][1]
+        classes = [EnsemblePredictor._outcome_code(str(label)) for label in estimator.classes_]
+        if sorted(classes) != list(range(len(OUTPUT_LABELS))):
+            raise ValueError(f"Stacking model must be trained on all outcomes, got {list(estimator.classes_)}")
+        
+        coef = np.zeros((len(OUTPUT_LABELS), estimator.coef_.shape[1]), dtype=np.float64)
+        intercept = np.zeros(len(OUTPUT_LABELS), dtype=np.float64)
+        coef[classes] = estimator.coef_
+        intercept[classes] = estimator.intercept_
+        return cls.build(models, coef, intercept)
+    
+    @classmethod
+    def build(cls, models: Sequence[Tuple[str, str]], coef, intercept) -> "StackingModel":
+        """Validate shapes and freeze the parameter arrays."""
+        models = EnsemblePredictor._validate_models(models)
+        n_models = len(models)
+        n_features = 4 * n_models + 3 * n_models * (n_models - 1)
+        coef = np.array(coef, dtype=np.float64)
+        intercept = np.array(intercept, dtype=np.float64)
+        if coef.shape != (len(OUTPUT_LABELS), n_features) or intercept.shape != (len(OUTPUT_LABELS),):
+            raise ValueError(
+                f"Stacking parameters must have shapes (3, {n_features}) and (3,), "
+                f"got {coef.shape} and {intercept.shape}"
+            )
+        coef.setflags(write=False)
+        intercept.setflags(write=False)
+        return cls(models=models, coef=coef, intercept=intercept)
+    
+    def predict_proba(self, outcomes: np.ndarray, confidences: np.ndarray, present: np.ndarray) -> np.ndarray:
+        """Outcome probabilities (N, 3) for a batch of votes."""
+        logits = stacking_features(outcomes, confidences, present) @ self.coef.T + self.intercept
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        return probabilities / probabilities.sum(axis=1, keepdims=True)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable parameters."""
+        return {
+            "type": "stacking",
+            "models": [list(model) for model in self.models],
+            "outcomes": list(OUTPUT_LABELS),
+            "coef": self.coef.tolist(),
+            "intercept": self.intercept.tolist(),
+        }
+
+
+class WeightSnapshot(NamedTuple):
+    """Immutable sub-model registry and weights.
+    
+    A predictor holds exactly one snapshot at a time. Updates build a new,
+    fully validated snapshot and replace the reference in a single attribute
+    assignment, so readers never need a lock and never observe a torn or
+    rolled-back configuration.
+    """
+    
+    models: Tuple[Tuple[str, str], ...]
+    weights: np.ndarray
+    version: int
+    stacker: Optional[StackingModel] = None
+    
+    @property
+    def model_keys(self) -> Tuple[str, ...]:
+        """Weight keys in batch column order."""
+        return tuple(key for key, _ in self.models)
+    
+    @property
+    def model_names(self) -> Tuple[str, ...]:
+        """Vote names in batch column order."""
+        return tuple(name for _, name in self.models)
+    
+    def as_dict(self) -> Dict[str, float]:
+        """Weights keyed by model key."""
+        return dict(zip(self.model_keys, self.weights.tolist()))
+
+
 class EnsemblePredictor:
     """Ensemble predictor implementing weighted voting logic."""
     
@@ -35,50 +233,197 @@ class EnsemblePredictor:
     # Valid outcomes
     VALID_OUTCOMES = {"HOME", "DRAW", "AWAY", "home_win", "draw", "away_win"}
     
-    def __init__(self, weights: Optional[Dict[str, float]] = None):
+    # Integer outcome codes used by the batch API (index into OUTCOMES)
+    OUTCOMES = ("HOME", "DRAW", "AWAY")
+    OUTCOME_CODES = {"HOME": 0, "DRAW": 1, "AWAY": 2}
+    
+    # Default sub-model registry as (weight key, vote name) pairs. The order
+    # defines the sub-model axis of batch arrays.
+    DEFAULT_MODELS = (
+        ("ft", "full_time"),
+        ("ht", "half_time"),
+        ("pt", "pattern"),
+    )
+    
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        models: Optional[Sequence[Tuple[str, str]]] = None,
+    ):
         """Initialize ensemble predictor with optional custom weights.
         
         Args:
-            weights: Optional dict with keys 'ft', 'ht', 'pt' for model weights.
+            weights: Optional dict mapping each registered model key to its weight.
                     If not provided, uses DEFAULT_WEIGHTS.
+            models: Optional sequence of (key, name) pairs defining the sub-model
+                    registry. If not provided, uses DEFAULT_MODELS.
+        """
+        registry = self._validate_models(models if models else self.DEFAULT_MODELS)
+        self._snapshot = WeightSnapshot(
+            models=registry,
+            weights=self._validate_weights(
+                weights if weights else self.DEFAULT_WEIGHTS.copy(), registry
+            ),
+            version=0,
+        )
+        # Serializes writers only; readers just dereference self._snapshot
+        self._write_lock = threading.Lock()
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: WeightSnapshot) -> "EnsemblePredictor":
+        """Create a predictor that starts from an existing weight snapshot.
+        
+        Args:
+            snapshot: Snapshot to share (snapshots are immutable)
+        
+        Returns:
+            EnsemblePredictor instance
         """
-        self.weights = weights if weights else self.DEFAULT_WEIGHTS.copy()
-        self._validate_weights()
+        predictor = cls(weights=snapshot.as_dict(), models=snapshot.models)
+        predictor._snapshot = snapshot
+        return predictor
+    
+    @property
+    def snapshot(self) -> WeightSnapshot:
+        """Current immutable registry and weight snapshot."""
+        return self._snapshot
+    
+    @property
+    def model_keys(self) -> Tuple[str, ...]:
+        """Weight keys of the registered sub-models, in batch column order."""
+        return self._snapshot.model_keys
     
-    def _validate_weights(self) -> None:
-        """Validate that weights are positive and sum close to 1.0."""
-        required_keys = {"ft", "ht", "pt"}
-        if not all(key in self.weights for key in required_keys):
-            raise ValueError(f"Weights must contain keys: {required_keys}")
+    @property
+    def model_names(self) -> Tuple[str, ...]:
+        """Vote names of the registered sub-models, in batch column order."""
+        return self._snapshot.model_names
+    
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Configured (un-normalized) weight for each registered sub-model."""
+        return self._snapshot.as_dict()
+    
+    @staticmethod
+    def _validate_models(models: Sequence[Tuple[str, str]]) -> Tuple[Tuple[str, str], ...]:
+        """Validate that model keys and names are unique."""
+        models = tuple((str(key), str(name)) for key, name in models)
+        keys = [key for key, _ in models]
+        names = [name for _, name in models]
+        if len(set(keys)) != len(keys) or len(set(names)) != len(names):
+            raise ValueError("Sub-model keys and names must be unique")
+        return models
+    
+    @staticmethod
+    def _validate_weights(
+        weights: Dict[str, float], models: Tuple[Tuple[str, str], ...]
+    ) -> np.ndarray:
+        """Validate that weights are positive and sum close to 1.0.
+        
+        Args:
+            weights: Weight for each registered model key
+            models: Sub-model registry the weights apply to
         
-        if any(w < 0 for w in self.weights.values()):
+        Returns:
+            Weights as a float array in registry order
+        """
+        required_keys = [key for key, _ in models]
+        if not all(key in weights for key in required_keys):
+            raise ValueError(f"Weights must contain keys: {set(required_keys)}")
+        
+        unknown_keys = set(weights) - set(required_keys)
+        if unknown_keys:
+            raise ValueError(f"Weights contain unregistered sub-models: {unknown_keys}")
+        
+        vector = np.array([weights[key] for key in required_keys], dtype=np.float64)
+        if (vector < 0).any():
             raise ValueError("All weights must be non-negative")
         
-        total = sum(self.weights.values())
+        total = float(vector.sum())
         if not (0.99 <= total <= 1.01):
             logger.warning(f"Weights sum to {total}, not 1.0. Will normalize during prediction.")
+        
+        vector.setflags(write=False)
+        return vector
+    
+    def register_model(self, key: str, name: str, weight: float) -> None:
+        """Add a sub-model to the registry.
+        
+        Existing weights are kept as-is; prediction renormalizes over the
+        models present, so callers typically follow up with ``update_config``
+        to rebalance.
+        
+        Args:
+            key: Weight key (e.g. 'xg')
+            name: Vote name used in outputs and ``<name>_prediction`` kwargs
+            weight: Non-negative weight for the new model
+        
+        Raises:
+            ValueError: If the key or name is already registered, weight is
+                invalid or a stacking model is active
+        """
+        with self._write_lock:
+            current = self._snapshot
+            if current.stacker is not None:
+                raise ValueError("Cannot register sub-models while a stacking model is active")
+            models = self._validate_models(current.models + ((key, name),))
+            weights = current.as_dict()
+            weights[key] = weight
+            self._snapshot = WeightSnapshot(
+                models=models,
+                weights=self._validate_weights(weights, models),
+                version=current.version + 1,
+            )
+        logger.info(f"Registered sub-model {name} ({key}) with weight {weight}")
+    
+    @property
+    def mode(self) -> str:
+        """'stacking' when a meta-model is active, otherwise 'weighted'."""
+        return "weighted" if self._snapshot.stacker is None else "stacking"
+    
+    def set_stacker(self, stacker: Optional[StackingModel]) -> None:
+        """Switch to stacking mode, or back to weighted voting with None.
+        
+        The meta-model is swapped in atomically with the rest of the
+        snapshot, like a weight update.
+        
+        Args:
+            stacker: Meta-model trained for the current registry, or None
+        
+        Raises:
+            ValueError: If the meta-model was trained for a different registry
+        """
+        with self._write_lock:
+            current = self._snapshot
+            if stacker is not None and stacker.models != current.models:
+                raise ValueError(
+                    f"Stacking model registry {stacker.models} does not match {current.models}"
+                )
+            self._snapshot = current._replace(stacker=stacker, version=current.version + 1)
+        logger.info(f"Ensemble mode set to {self.mode}")
+    
+    @staticmethod
+    def _outcome_code(outcome) -> int:
+        """Map an outcome spelling or integer code to its integer code."""
+        code = OUTCOME_LOOKUP.get(outcome) if isinstance(outcome, str) else None
+        if code is not None:
+            return code
+        if isinstance(outcome, str):
+            code = OUTCOME_LOOKUP.get(outcome.upper())
+            if code is not None:
+                return code
+        elif isinstance(outcome, (int, np.integer)) and not isinstance(outcome, bool):
+            if 0 <= outcome < len(OUTPUT_LABELS):
+                return int(outcome)
+        raise ValueError(f"Invalid outcome: {outcome}")
     
     def _normalize_outcome(self, outcome: str) -> str:
         """Normalize outcome to standard format (HOME, DRAW, AWAY)."""
-        outcome_upper = outcome.upper()
-        if outcome_upper in {"HOME", "HOME_WIN"}:
-            return "HOME"
-        elif outcome_upper == "DRAW":
-            return "DRAW"
-        elif outcome_upper in {"AWAY", "AWAY_WIN"}:
-            return "AWAY"
-        else:
-            raise ValueError(f"Invalid outcome: {outcome}")
+        return self.OUTCOMES[self._outcome_code(outcome)]
     
     def _normalize_outcome_for_output(self, outcome: str) -> str:
         """Normalize outcome to database format (home_win, draw, away_win)."""
-        if outcome == "HOME":
-            return "home_win"
-        elif outcome == "DRAW":
-            return "draw"
-        elif outcome == "AWAY":
-            return "away_win"
-        return outcome
+        code = self.OUTCOME_CODES.get(outcome)
+        return OUTPUT_LABELS[code] if code is not None else outcome
     
     def predict(
         self,
@@ -88,6 +433,7 @@ class EnsemblePredictor:
         half_time_confidence: Optional[float] = None,
         pattern_prediction: Optional[str] = None,
         pattern_confidence: Optional[float] = None,
+        **sub_model_votes,
     ) -> Dict:
         """Calculate ensemble prediction from sub-model predictions.
         
@@ -98,10 +444,13 @@ class EnsemblePredictor:
             half_time_confidence: HT model's confidence (0-1 range)
             pattern_prediction: PT model's predicted outcome
             pattern_confidence: PT model's confidence (0-1 range)
+            **sub_model_votes: ``<name>_prediction`` / ``<name>_confidence`` pairs
+                for any additionally registered sub-models
         
         Returns:
             Dict containing:
                 - weights_used: Normalized weights used for each model
+                  (replaced by mode='stacking' when a meta-model is active)
                 - votes: Individual model predictions and confidences
                 - scores: Aggregated scores for each outcome (HOME, DRAW, AWAY)
                 - winner: Winning outcome
@@ -112,52 +461,108 @@ class EnsemblePredictor:
         Raises:
             ValueError: If all models return None or invalid inputs
         """
-        # Collect valid models
-        models = []
-        if full_time_prediction is not None and full_time_confidence is not None:
-            models.append(("full_time", full_time_prediction, full_time_confidence, "ft"))
-        if half_time_prediction is not None and half_time_confidence is not None:
-            models.append(("half_time", half_time_prediction, half_time_confidence, "ht"))
-        if pattern_prediction is not None and pattern_confidence is not None:
-            models.append(("pattern", pattern_prediction, pattern_confidence, "pt"))
+        inputs = {
+            "full_time_prediction": full_time_prediction,
+            "full_time_confidence": full_time_confidence,
+            "half_time_prediction": half_time_prediction,
+            "half_time_confidence": half_time_confidence,
+            "pattern_prediction": pattern_prediction,
+            "pattern_confidence": pattern_confidence,
+            **sub_model_votes,
+        }
+        snapshot = self._snapshot
+        votes = {
+            key: (inputs.pop(f"{name}_prediction", None), inputs.pop(f"{name}_confidence", None))
+            for key, name in snapshot.models
+        }
+        unknown_inputs = sorted(arg for arg, value in inputs.items() if value is not None)
+        if unknown_inputs:
+            raise ValueError(f"Inputs for unregistered sub-models: {unknown_inputs}")
         
-        if not models:
-            raise ValueError("At least one sub-model prediction must be provided")
+        return self._predict_votes(votes, snapshot)
+    
+    def predict_votes(self, votes: Dict[str, Tuple[Optional[str], Optional[float]]]) -> Dict:
+        """Calculate ensemble prediction from votes keyed by sub-model key.
         
-        # Calculate total weight of active models
-        total_weight = sum(self.weights[weight_key] for _, _, _, weight_key in models)
+        Args:
+            votes: Mapping of model key (e.g. 'ft') to a (prediction, confidence)
+                pair. Missing keys and None entries are treated as null models.
         
-        if total_weight == 0:
-            raise ValueError("Total weight of active models is zero")
+        Returns:
+            Dict in the same format as ``predict``
         
-        # Normalize weights for active models only
-        normalized_weights = {}
-        for _, _, _, weight_key in models:
-            normalized_weights[weight_key] = self.weights[weight_key] / total_weight
+        Raises:
+            ValueError: If all models return None, a key is not registered or
+                inputs are invalid
+        """
+        return self._predict_votes(votes, self._snapshot)
+    
+    def _predict_votes(
+        self,
+        votes: Dict[str, Tuple[Optional[str], Optional[float]]],
+        snapshot: WeightSnapshot,
+    ) -> Dict:
+        """Scalar weighted vote against a single, consistent weight snapshot."""
+        unknown_keys = set(votes) - set(snapshot.model_keys)
+        if unknown_keys:
+            raise ValueError(f"Votes for unregistered sub-models: {unknown_keys}")
+        
+        weights = snapshot.weights.tolist()
         
-        # Initialize scores for each outcome
-        scores = {"HOME": 0.0, "DRAW": 0.0, "AWAY": 0.0}
+        # Collect valid models
+        models = []
+        for index, (key, name) in enumerate(snapshot.models):
+            prediction, confidence = votes.get(key, (None, None))
+            if prediction is not None and confidence is not None:
+                models.append((name, prediction, confidence, index))
+        
+        if not models:
+            raise ValueError("At least one sub-model prediction must be provided")
         
-        # Aggregate scores using weighted voting
+        # Validate confidences and record votes
         votes = {}
-        for model_name, prediction, confidence, weight_key in models:
-            # Validate confidence is in range
+        for model_name, prediction, confidence, index in models:
             if not (0.0 <= confidence <= 1.0):
                 raise ValueError(f"{model_name} confidence must be in range [0, 1], got {confidence}")
-            
-            # Normalize outcome
-            normalized_outcome = self._normalize_outcome(prediction)
-            
-            # Add weighted contribution to outcome score
-            weight = normalized_weights[weight_key]
-            scores[normalized_outcome] += confidence * weight
-            
-            # Record vote
             votes[model_name] = {
                 "prediction": prediction,
                 "confidence": confidence
             }
         
+        if snapshot.stacker is not None:
+            # The meta-model ignores the weights, so they are neither checked nor reported
+            outcomes = [None] * len(snapshot.models)
+            confidences = [None] * len(snapshot.models)
+            for _, prediction, confidence, index in models:
+                outcomes[index], confidences[index] = prediction, confidence
+            outcome_scores = self._stacked_scores(
+                outcomes, confidences, [index for _, _, _, index in models], snapshot
+            )
+            weights_used = None
+        else:
+            # Calculate total weight of active models
+            total_weight = sum(weights[index] for _, _, _, index in models)
+            
+            if total_weight == 0:
+                raise ValueError("Total weight of active models is zero")
+            
+            # Normalize weights for active models only
+            normalized_weights = {}
+            for _, _, _, index in models:
+                normalized_weights[index] = weights[index] / total_weight
+            
+            # Aggregate scores using weighted voting
+            outcome_scores = [0.0, 0.0, 0.0]
+            for _, prediction, confidence, index in models:
+                outcome_scores[self._outcome_code(prediction)] += confidence * normalized_weights[index]
+            
+            # Build complete weights_used dict (including zeros for inactive models)
+            weights_used = {
+                key: normalized_weights.get(index, 0.0) for index, key in enumerate(snapshot.model_keys)
+            }
+        
+        scores = dict(zip(self.OUTCOMES, outcome_scores))
+        
         # Determine winner (outcome with highest score)
         winner_outcome = max(scores.items(), key=lambda x: x[1])
         winner = winner_outcome[0]
@@ -168,16 +573,9 @@ class EnsemblePredictor:
         conflict_margin = sorted_scores[0] - sorted_scores[1] if len(sorted_scores) > 1 else sorted_scores[0]
         conflict_detected = conflict_margin < self.CONFLICT_THRESHOLD
         
-        # Build complete weights_used dict (including zeros for inactive models)
-        weights_used = {
-            "ft": normalized_weights.get("ft", 0.0),
-            "ht": normalized_weights.get("ht", 0.0),
-            "pt": normalized_weights.get("pt", 0.0)
-        }
-        
-        # Build result
+        # Build result; in stacking mode the meta-model replaces the weights
         result = {
-            "weights_used": weights_used,
+            **({"mode": "stacking"} if weights_used is None else {"weights_used": weights_used}),
             "votes": votes,
             "scores": scores,
             "winner": self._normalize_outcome_for_output(winner),
@@ -186,48 +584,919 @@ class EnsemblePredictor:
             "conflict_margin": round(conflict_margin, 4)
         }
         
-        logger.info(
-            f"Ensemble prediction: {result['winner']} "
-            f"(confidence: {result['final_confidence']}, "
-            f"conflict: {conflict_detected})"
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Ensemble prediction: {result['winner']} "
+                f"(confidence: {result['final_confidence']}, "
+                f"conflict: {conflict_detected})"
+            )
+        
+        return result
+    
+    def predict_fast(self, outcomes: Sequence, confidences: Sequence[Optional[float]]) -> EnsembleResult:
+        """Quiet single-match hot path.
+        
+        Same arithmetic as ``predict`` (identical winner, rounding and conflict
+        flag) but takes positional per-model inputs, skips logging and the
+        breakdown dicts, and returns a compact ``EnsembleResult`` tuple.
+        
+        Args:
+            outcomes: One outcome per registered sub-model, in ``model_keys``
+                order, as an integer code or any accepted spelling; None if
+                the model has no prediction
+            confidences: Matching confidences (0-1 range) or None
+        
+        Returns:
+            EnsembleResult(winner code, final_confidence, conflict_detected, conflict_margin)
+        
+        Raises:
+            ValueError: If all models return None or invalid inputs
+        """
+        snapshot = self._snapshot
+        weights = snapshot.weights.tolist()
+        if len(outcomes) != len(weights) or len(confidences) != len(weights):
+            raise ValueError(f"Expected {len(weights)} outcomes and confidences")
+        
+        active = [
+            index for index in range(len(weights))
+            if outcomes[index] is not None and confidences[index] is not None
+        ]
+        if not active:
+            raise ValueError("At least one sub-model prediction must be provided")
+        
+        if snapshot.stacker is not None:
+            scores = self._stacked_scores(outcomes, confidences, active, snapshot)
+        else:
+            total_weight = 0
+            for index in active:
+                total_weight += weights[index]
+            if total_weight == 0:
+                raise ValueError("Total weight of active models is zero")
+            
+            scores = [0.0, 0.0, 0.0]
+            for index in active:
+                confidence = confidences[index]
+                if not (0.0 <= confidence <= 1.0):
+                    raise ValueError(
+                        f"{snapshot.models[index][1]} confidence must be in range [0, 1], got {confidence}"
+                    )
+                outcome = outcomes[index]
+                code = outcome if outcome.__class__ is int and 0 <= outcome <= 2 else self._outcome_code(outcome)
+                scores[code] += confidence * (weights[index] / total_weight)
+        
+        home, draw, away = scores
+        if home >= draw and home >= away:
+            winner, top, second = HOME, home, (draw if draw >= away else away)
+        elif draw >= away:
+            winner, top, second = DRAW, draw, (home if home >= away else away)
+        else:
+            winner, top, second = AWAY, away, (home if home >= draw else draw)
+        
+        margin = top - second
+        return EnsembleResult(winner, round(top, 4), margin < self.CONFLICT_THRESHOLD, round(margin, 4))
+    
+    def _stacked_scores(
+        self,
+        outcomes: Sequence,
+        confidences: Sequence[Optional[float]],
+        active: Sequence[int],
+        snapshot: WeightSnapshot,
+    ) -> List[float]:
+        """Meta-model outcome probabilities for a single match."""
+        n_models = len(snapshot.models)
+        codes = np.zeros((1, n_models), dtype=np.int8)
+        values = np.zeros((1, n_models), dtype=np.float64)
+        present = np.zeros((1, n_models), dtype=bool)
+        for index in active:
+            confidence = confidences[index]
+            if not (0.0 <= confidence <= 1.0):
+                raise ValueError(
+                    f"{snapshot.models[index][1]} confidence must be in range [0, 1], got {confidence}"
+                )
+            codes[0, index] = self._outcome_code(outcomes[index])
+            values[0, index] = confidence
+            present[0, index] = True
+        return snapshot.stacker.predict_proba(codes, values, present)[0].tolist()
+    
+    def encode_outcomes(self, outcomes) -> np.ndarray:
+        """Convert outcome labels to integer codes for ``predict_batch``.
+        
+        Args:
+            outcomes: Array-like of outcome labels in any accepted spelling
+        
+        Returns:
+            Integer array of the same shape with codes from OUTCOME_CODES
+        
+        Raises:
+            ValueError: If any label is not a valid outcome
+        """
+        values = np.asarray(outcomes)
+        if values.dtype.kind in "iu":
+            if values.size and (values.min() < 0 or values.max() >= len(OUTPUT_LABELS)):
+                raise ValueError("Invalid outcome code")
+            return values.astype(np.int8)
+        
+        labels = values.astype(object)
+        unique, inverse = np.unique(labels, return_inverse=True)
+        lookup = np.array([self._outcome_code(str(label)) for label in unique], dtype=np.int8)
+        return lookup[inverse].reshape(labels.shape)
+    
+    def decode_outcomes(self, codes) -> np.ndarray:
+        """Convert integer outcome codes to database labels (home_win, draw, away_win).
+        
+        Args:
+            codes: Array-like of integer outcome codes
+        
+        Returns:
+            Object array of database-format outcome labels
+        """
+        return np.array(OUTPUT_LABELS, dtype=object)[np.asarray(codes, dtype=np.intp)]
+    
+    def frame_to_votes(self, frame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Extract batch vote arrays from a logged-votes DataFrame.
+        
+        Each registered sub-model is read from ``<name>_prediction`` and
+        ``<name>_confidence`` columns (e.g. ``full_time_prediction``), matching
+        the ``predict`` keyword names. Absent columns or null cells mark the
+        model as missing for that row.
+        
+        Args:
+            frame: pandas DataFrame of logged sub-model votes
+        
+        Returns:
+            Tuple of (outcomes, confidences, mask) ready for ``predict_batch``;
+            confidences are NaN where the model is missing
+        """
+        snapshot = self._snapshot
+        shape = (len(frame), len(snapshot.models))
+        outcomes = np.zeros(shape, dtype=np.int8)
+        confidences = np.full(shape, np.nan, dtype=np.float64)
+        
+        for column, name in enumerate(snapshot.model_names):
+            prediction_column = f"{name}_prediction"
+            confidence_column = f"{name}_confidence"
+            if prediction_column not in frame.columns or confidence_column not in frame.columns:
+                continue
+            predictions = frame[prediction_column]
+            column_confidences = frame[confidence_column]
+            present = (predictions.notna() & column_confidences.notna()).to_numpy()
+            outcomes[present, column] = self.encode_outcomes(predictions[present].to_numpy())
+            confidences[present, column] = column_confidences[present].to_numpy(dtype=np.float64)
+        
+        return outcomes, confidences, ~np.isnan(confidences)
+    
+    def _batch_presence(self, shape: Tuple[int, ...], mask, values: np.ndarray) -> np.ndarray:
+        """Build the (N, models) presence mask for a batch call.
+        
+        Args:
+            shape: Expected (N, models) shape of the mask
+            mask: Optional user-supplied boolean mask
+            values: Per-model values whose NaNs mark missing models
+        
+        Returns:
+            Boolean presence mask
+        
+        Raises:
+            ValueError: If the mask shape is wrong or a row has no active model
+        """
+        if mask is None:
+            present = np.ones(shape, dtype=bool)
+        else:
+            present = np.asarray(mask, dtype=bool)
+            if present.shape != shape:
+                raise ValueError(f"mask shape {present.shape} does not match expected shape {shape}")
+        present = present & ~np.isnan(values)
+        
+        row_active = present.any(axis=1)
+        if not row_active.all():
+            missing_row = int(np.flatnonzero(~row_active)[0])
+            raise ValueError(f"At least one sub-model prediction must be provided (row {missing_row})")
+        return present
+    
+    def _batch_weights(self, present: np.ndarray, snapshot: WeightSnapshot) -> np.ndarray:
+        """Renormalize configured weights over the models present in each row.
+        
+        Totals are summed column by column to reproduce the scalar path's
+        float order.
+        
+        Args:
+            present: (N, models) boolean presence mask
+            snapshot: Weight snapshot the whole batch is scored against
+        
+        Returns:
+            (N, models) normalized weights, zero for missing models
+        
+        Raises:
+            ValueError: If the active models of a row have zero total weight
+        """
+        active_weights = np.where(present, snapshot.weights, 0.0)
+        total_weight = np.zeros(present.shape[0], dtype=np.float64)
+        for column in range(present.shape[1]):
+            total_weight += active_weights[:, column]
+        if (total_weight == 0).any():
+            raise ValueError("Total weight of active models is zero")
+        return active_weights / total_weight[:, None]
+    
+    def _batch_result(self, scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """Pick winners and detect conflicts from (N, 3) outcome scores."""
+        rows = np.arange(scores.shape[0])
+        winner = np.argmax(scores, axis=1)
+        final_confidence = scores[rows, winner]
+        sorted_scores = np.sort(scores, axis=1)
+        conflict_margin = sorted_scores[:, -1] - sorted_scores[:, -2]
+        conflict_detected = conflict_margin < self.CONFLICT_THRESHOLD
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Ensemble batch prediction: {scores.shape[0]} matches "
+                f"({int(conflict_detected.sum())} conflicts)"
+            )
+        
+        return {
+            "winner": winner,
+            "final_confidence": np.round(final_confidence, 4),
+            "conflict_detected": conflict_detected,
+            "conflict_margin": np.round(conflict_margin, 4),
+        }
+    
+    def predict_batch(
+        self,
+        outcomes,
+        confidences,
+        mask=None,
+    ) -> Dict[str, np.ndarray]:
+        """Calculate ensemble predictions for many matches at once.
+        
+        Vectorized equivalent of ``predict``: missing sub-models are dropped
+        and the remaining weights renormalized per row, scores are accumulated
+        in the same order as the scalar path, and ties resolve to the first
+        outcome in OUTCOMES, so winners and conflict flags match ``predict``
+        exactly. In stacking mode the scores are the meta-model probabilities
+        for the whole batch.
+        
+        Args:
+            outcomes: (N, M) integer outcome codes, one column per registered
+                sub-model in ``model_keys`` order
+            confidences: (N, M) sub-model confidences (0-1 range)
+            mask: Optional (N, M) boolean presence mask. Defaults to all present;
+                NaN confidences are always treated as missing.
+        
+        Returns:
+            Dict of arrays with length N:
+                - winner: Winning outcome code (index into OUTCOMES)
+                - final_confidence: Score of the winning outcome (rounded to 4 places)
+                - conflict_detected: True if top 2 outcomes are closer than CONFLICT_THRESHOLD
+                - conflict_margin: Difference between top 2 scores (rounded to 4 places)
+        
+        Raises:
+            ValueError: If shapes are inconsistent, a row has no active model,
+                or a present vote has an invalid outcome code or confidence
+        """
+        snapshot = self._snapshot
+        n_models = len(snapshot.models)
+        outcomes = np.asarray(outcomes)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        
+        if outcomes.ndim != 2 or outcomes.shape[1] != n_models:
+            raise ValueError(f"outcomes must have shape (N, {n_models}), got {outcomes.shape}")
+        if confidences.shape != outcomes.shape:
+            raise ValueError(
+                f"confidences shape {confidences.shape} does not match outcomes shape {outcomes.shape}"
+            )
+        
+        present = self._batch_presence(outcomes.shape, mask, confidences)
+        
+        # Validate present votes only; absent slots may hold arbitrary filler
+        for column, model_name in enumerate(snapshot.model_names):
+            column_present = present[:, column]
+            column_confidence = confidences[column_present, column]
+            if ((column_confidence < 0.0) | (column_confidence > 1.0)).any():
+                raise ValueError(f"{model_name} confidence must be in range [0, 1]")
+            column_outcomes = outcomes[column_present, column]
+            if ((column_outcomes < 0) | (column_outcomes >= len(self.OUTCOMES))).any():
+                raise ValueError(f"Invalid outcome code for {model_name}")
+        
+        if snapshot.stacker is not None:
+            return self._batch_result(snapshot.stacker.predict_proba(outcomes, confidences, present))
+        
+        normalized_weights = self._batch_weights(present, snapshot)
+        
+        # Weighted voting: each present model adds confidence * weight to its outcome
+        rows = np.arange(outcomes.shape[0])
+        scores = np.zeros((outcomes.shape[0], len(self.OUTCOMES)), dtype=np.float64)
+        for column in range(n_models):
+            column_present = present[:, column]
+            codes = np.where(column_present, outcomes[:, column], 0).astype(np.intp)
+            contribution = np.where(
+                column_present, confidences[:, column] * normalized_weights[:, column], 0.0
+            )
+            scores[rows, codes] += contribution
+        
+        return self._batch_result(scores)
+    
+    def predict_proba_batch(self, probabilities, mask=None) -> Dict[str, np.ndarray]:
+        """Calculate ensemble predictions from full sub-model probability vectors.
+        
+        Instead of a top-1 vote, every sub-model contributes its whole
+        HOME/DRAW/AWAY distribution. Scores are the weighted mixture
+        ``weights[n] @ probabilities[n]`` computed for all rows in one batched
+        matrix product, so they remain a probability distribution. Missing
+        models are re-weighted exactly like ``predict_batch``.
+        
+        Args:
+            probabilities: (N, M, 3) array; axis 1 follows ``model_keys`` and
+                axis 2 follows OUTCOMES. Each present vector must sum to 1.
+            mask: Optional (N, M) boolean presence mask. Defaults to all present;
+                models whose vector contains NaN are treated as missing.
+        
+        Returns:
+            Dict of arrays with length N, as ``predict_batch`` plus:
+                - scores: (N, 3) blended outcome probabilities
+        
+        Raises:
+            ValueError: If shapes are inconsistent, a row has no active model,
+                or a present vector is not a valid probability distribution
+        """
+        return self._predict_proba_batch(probabilities, mask, self._snapshot)
+    
+    def _predict_proba_batch(
+        self, probabilities, mask, snapshot: WeightSnapshot
+    ) -> Dict[str, np.ndarray]:
+        """Probability-distribution voting against a single weight snapshot."""
+        n_models = len(snapshot.models)
+        n_outcomes = len(self.OUTCOMES)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        
+        if probabilities.ndim != 3 or probabilities.shape[1:] != (n_models, n_outcomes):
+            raise ValueError(
+                f"probabilities must have shape (N, {n_models}, {n_outcomes}), got {probabilities.shape}"
+            )
+        
+        present = self._batch_presence(
+            probabilities.shape[:2], mask, probabilities.sum(axis=2)
         )
         
+        for column, model_name in enumerate(snapshot.model_names):
+            vectors = probabilities[present[:, column], column]
+            if ((vectors < 0.0) | (vectors > 1.0)).any():
+                raise ValueError(f"{model_name} probabilities must be in range [0, 1]")
+            if (np.abs(vectors.sum(axis=1) - 1.0) > 0.01).any():
+                raise ValueError(f"{model_name} probabilities must sum to 1")
+        
+        normalized_weights = self._batch_weights(present, snapshot)
+        blended = np.where(present[:, :, None], probabilities, 0.0)
+        scores = np.matmul(normalized_weights[:, None, :], blended)[:, 0, :]
+        
+        result = self._batch_result(scores)
+        result["scores"] = scores
         return result
     
+    def predict_proba(
+        self,
+        full_time_probabilities: Optional[List[float]] = None,
+        half_time_probabilities: Optional[List[float]] = None,
+        pattern_probabilities: Optional[List[float]] = None,
+        **sub_model_probabilities,
+    ) -> Dict:
+        """Calculate an ensemble prediction from sub-model probability vectors.
+        
+        Single-match wrapper around ``predict_proba_batch`` returning the same
+        breakdown shape as ``predict``.
+        
+        Args:
+            full_time_probabilities: FT model's [HOME, DRAW, AWAY] probabilities
+            half_time_probabilities: HT model's [HOME, DRAW, AWAY] probabilities
+            pattern_probabilities: PT model's [HOME, DRAW, AWAY] probabilities
+            **sub_model_probabilities: ``<name>_probabilities`` vectors for any
+                additionally registered sub-models
+        
+        Returns:
+            Dict with weights_used, votes, scores, winner, final_confidence,
+            conflict_detected and conflict_margin (see ``predict``)
+        
+        Raises:
+            ValueError: If all models return None or invalid inputs
+        """
+        inputs = {
+            "full_time_probabilities": full_time_probabilities,
+            "half_time_probabilities": half_time_probabilities,
+            "pattern_probabilities": pattern_probabilities,
+            **sub_model_probabilities,
+        }
+        snapshot = self._snapshot
+        vectors = [inputs.pop(f"{name}_probabilities", None) for name in snapshot.model_names]
+        unknown_inputs = sorted(arg for arg, value in inputs.items() if value is not None)
+        if unknown_inputs:
+            raise ValueError(f"Inputs for unregistered sub-models: {unknown_inputs}")
+        
+        probabilities = np.full((1, len(snapshot.models), len(self.OUTCOMES)), np.nan)
+        for column, vector in enumerate(vectors):
+            if vector is not None:
+                probabilities[0, column] = vector
+        
+        batch = self._predict_proba_batch(probabilities, None, snapshot)
+        present = ~np.isnan(probabilities[0]).any(axis=1)
+        normalized_weights = self._batch_weights(present[None, :], snapshot)[0]
+        
+        return {
+            "weights_used": {
+                key: float(normalized_weights[column]) for column, key in enumerate(snapshot.model_keys)
+            },
+            "votes": {
+                name: {"probabilities": [float(p) for p in vectors[column]]}
+                for column, name in enumerate(snapshot.model_names)
+                if present[column]
+            },
+            "scores": {
+                outcome: float(batch["scores"][0, code]) for code, outcome in enumerate(self.OUTCOMES)
+            },
+            "winner": self._normalize_outcome_for_output(self.OUTCOMES[int(batch["winner"][0])]),
+            "final_confidence": float(batch["final_confidence"][0]),
+            "conflict_detected": bool(batch["conflict_detected"][0]),
+            "conflict_margin": float(batch["conflict_margin"][0]),
+        }
+    
     def get_config(self) -> Dict[str, float]:
         """Get current weight configuration.
         
         Returns:
             Dict with model weights
         """
-        return self.weights.copy()
+        return self.weights
     
     def update_config(self, new_weights: Dict[str, float]) -> None:
         """Update weight configuration.
         
+        A new snapshot is validated in full and then swapped in atomically,
+        so concurrent predictions see either the old or the new weights and
+        an invalid update leaves the configuration unchanged.
+        
         Args:
-            new_weights: New weights dict with keys 'ft', 'ht', 'pt'
+            new_weights: New weights dict with one key per registered sub-model
         
         Raises:
             ValueError: If weights are invalid
         """
-        old_weights = self.weights.copy()
-        self.weights = new_weights.copy()
-        try:
-            self._validate_weights()
-            logger.info(f"Updated weights from {old_weights} to {new_weights}")
-        except ValueError as e:
-            self.weights = old_weights
-            raise ValueError(f"Invalid weights: {e}")
+        with self._write_lock:
+            current = self._snapshot
+            try:
+                weights = self._validate_weights(dict(new_weights), current.models)
+            except ValueError as e:
+                raise ValueError(f"Invalid weights: {e}")
+            self._snapshot = current._replace(weights=weights, version=current.version + 1)
+        logger.info(f"Updated weights from {current.as_dict()} to {new_weights}")
 
 
-def create_ensemble_predictor(weights: Optional[Dict[str, float]] = None) -> EnsemblePredictor:
+def create_ensemble_predictor(
+    weights: Optional[Dict[str, float]] = None,
+    models: Optional[Sequence[Tuple[str, str]]] = None,
+) -> EnsemblePredictor:
     """Factory function to create an EnsemblePredictor instance.
     
     Args:
         weights: Optional custom weights dict
+        models: Optional (key, name) sub-model registry
     
     Returns:
         EnsemblePredictor instance
     """
-    return EnsemblePredictor(weights=weights)
+    return EnsemblePredictor(weights=weights, models=models)
+
+
+# Columns appended by rescore_evaluation_log
+RESCORE_COLUMNS = ("ensemble_winner", "ensemble_confidence", "ensemble_conflict", "ensemble_margin")
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+
+
+def _require_pyarrow() -> None:
+    """Raise a helpful error when Parquet support is requested without pyarrow."""
+    if pq is None:
+        raise ImportError("pyarrow required for Parquet logs. Install: pip install pyarrow")
+
+
+def iter_log_chunks(path: Union[str, Path], chunk_size: int) -> Iterator[Any]:
+    """Yield DataFrame chunks of a CSV or Parquet evaluation log."""
+    import pandas as pd
+    
+    path = Path(path)
+    if path.suffix in PARQUET_SUFFIXES:
+        _require_pyarrow()
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def _unknown_outcomes(predictor: EnsemblePredictor, values) -> np.ndarray:
+    """Mask of set values that are not an accepted outcome spelling or code."""
+    unknown = []
+    for value in values.dropna().unique():
+        try:
+            predictor.encode_outcomes(np.array([value]))
+        except ValueError:
+            unknown.append(value)
+    return values.isin(unknown).to_numpy()
+
+
+def invalid_vote_rows(predictor: EnsemblePredictor, frame, actual_column: Optional[str] = None) -> np.ndarray:
+    """Find logged rows that ``frame_to_votes`` / ``predict_batch`` would reject.
+    
+    Only votes with both columns set are checked, as in ``frame_to_votes``.
+    A set but unknown actual outcome also invalidates its row.
+    
+    Args:
+        predictor: Predictor whose registry names the vote columns
+        frame: pandas DataFrame of logged sub-model votes
+        actual_column: Optional column holding the actual outcome
+    
+    Returns:
+        Boolean array, True for rows with an unknown outcome label or a
+        confidence outside [0, 1]
+    """
+    import pandas as pd
+    
+    invalid = np.zeros(len(frame), dtype=bool)
+    for name in predictor.snapshot.model_names:
+        prediction_column = f"{name}_prediction"
+        confidence_column = f"{name}_confidence"
+        if prediction_column not in frame.columns or confidence_column not in frame.columns:
+            continue
+        predictions = frame[prediction_column]
+        present = (predictions.notna() & frame[confidence_column].notna()).to_numpy()
+        confidences = pd.to_numeric(frame[confidence_column], errors="coerce")
+        invalid |= present & ~confidences.between(0.0, 1.0).to_numpy()
+        invalid |= present & _unknown_outcomes(predictor, predictions)
+    
+    if actual_column is not None and actual_column in frame.columns:
+        invalid |= _unknown_outcomes(predictor, frame[actual_column])
+    return invalid
+
+
+def _rescore_schema(predictor: EnsemblePredictor, frame, actual_column: str) -> Any:
+    """Parquet schema for the rescored log.
+    
+    Vote, actual and RESCORE_COLUMNS types come from the registry, so a
+    column that happens to be all null in the first chunk cannot pin a type
+    that later chunks fail to cast to. Other columns keep the types inferred
+    from the first chunk.
+    """
+    declared = dict(zip(RESCORE_COLUMNS, (pa.string(), pa.float64(), pa.bool_(), pa.float64())))
+    declared[actual_column] = pa.string()
+    for name in predictor.snapshot.model_names:
+        declared[f"{name}_prediction"] = pa.string()
+        declared[f"{name}_confidence"] = pa.float64()
+    
+    inferred = pa.Schema.from_pandas(frame, preserve_index=False)
+    return pa.schema([
+        pa.field(field.name, declared.get(field.name, field.type)) for field in inferred
+    ])
+
+
+def _conform_to_schema(frame, schema: Any):
+    """Coerce string and float64 schema columns so any chunk converts cleanly."""
+    import pandas as pd
+    
+    columns = {}
+    for field in schema:
+        if field.type == pa.string():
+            columns[field.name] = frame[field.name].astype("string")
+        elif field.type == pa.float64():
+            columns[field.name] = pd.to_numeric(frame[field.name], errors="coerce").astype(np.float64)
+    return frame.assign(**columns)
+
+
+def rescore_evaluation_log(
+    input_path: Union[str, Path],
+    output_path: Optional[Union[str, Path]] = None,
+    predictor: Optional[EnsemblePredictor] = None,
+    chunk_size: int = 50_000,
+    actual_column: str = "actual_result",
+) -> Dict[str, Any]:
+    """Re-run the ensemble over an evaluation log in constant memory.
+    
+    The log (CSV, or Parquet when pyarrow is installed) is read in chunks
+    of ``chunk_size`` rows. Each chunk's ``<name>_prediction`` /
+    ``<name>_confidence`` columns are scored with ``predict_batch`` against
+    one weight snapshot, the chunk is written out with the RESCORE_COLUMNS
+    appended, and only running counters are kept between chunks. Rows
+    without any sub-model vote are passed through with empty ensemble
+    columns, as are rows with an unknown outcome label or a confidence
+    outside [0, 1], which are counted as ``invalid_rows``. Parquet output
+    types the vote and ensemble columns from the registry up front, so
+    every chunk is written with the same schema.
+    
+    Args:
+        input_path: Evaluation log to rescore
+        output_path: Optional CSV/Parquet destination for the rescored rows
+        predictor: Predictor to score with (default: EnsemblePredictor())
+        chunk_size: Rows per chunk
+        actual_column: Column holding the actual outcome, used for accuracy
+    
+    Returns:
+        Aggregates: rows, scored_rows, skipped_rows, invalid_rows,
+        evaluated_rows, accuracy, conflict_rate, mean_confidence and
+        per-outcome winner_distribution
+    """
+    import pandas as pd
+    
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    
+    predictor = predictor or EnsemblePredictor()
+    # Pin one snapshot so a concurrent weight refresh cannot split the run
+    pinned = EnsemblePredictor.from_snapshot(predictor.snapshot)
+    
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path is not None else None
+    
+    rows = scored_rows = invalid_rows = evaluated_rows = correct = conflicts = 0
+    confidence_sum = 0.0
+    winner_counts = np.zeros(len(OUTPUT_LABELS), dtype=np.int64)
+    parquet_writer = None
+    wrote_header = False
+    
+    try:
+        for chunk in iter_log_chunks(input_path, chunk_size):
+            chunk = chunk.reset_index(drop=True)
+            invalid = invalid_vote_rows(pinned, chunk, actual_column)
+            if invalid.any():
+                invalid_rows += int(invalid.sum())
+                logger.warning(f"Skipping {int(invalid.sum())} rows with invalid votes or outcomes")
+            
+            valid_index = np.flatnonzero(~invalid)
+            outcomes, confidences, mask = pinned.frame_to_votes(chunk.iloc[valid_index])
+            voted = mask.any(axis=1)
+            outcomes, confidences, mask = outcomes[voted], confidences[voted], mask[voted]
+            scorable = np.zeros(len(chunk), dtype=bool)
+            scorable[valid_index[voted]] = True
+            
+            winner = np.full(len(chunk), None, dtype=object)
+            final_confidence = np.full(len(chunk), np.nan)
+            conflict = np.full(len(chunk), None, dtype=object)
+            margin = np.full(len(chunk), np.nan)
+            
+            if scorable.any():
+                batch = pinned.predict_batch(outcomes, confidences, mask)
+                winner[scorable] = pinned.decode_outcomes(batch["winner"])
+                final_confidence[scorable] = batch["final_confidence"]
+                conflict[scorable] = batch["conflict_detected"]
+                margin[scorable] = batch["conflict_margin"]
+                
+                scored_rows += int(scorable.sum())
+                conflicts += int(batch["conflict_detected"].sum())
+                confidence_sum += float(batch["final_confidence"].sum())
+                winner_counts += np.bincount(batch["winner"], minlength=len(OUTPUT_LABELS))
+                
+                if actual_column in chunk.columns:
+                    actual_values = chunk[actual_column].to_numpy()[scorable]
+                    known = pd.notna(actual_values)
+                    if known.any():
+                        actual = pinned.encode_outcomes(actual_values[known])
+                        evaluated_rows += int(known.sum())
+                        correct += int((batch["winner"][known] == actual).sum())
+            
+            rows += len(chunk)
+            
+            if output_path is not None:
+                chunk = chunk.assign(**dict(zip(RESCORE_COLUMNS, (
+                    pd.array(winner, dtype="string"),
+                    final_confidence,
+                    pd.array(conflict, dtype="boolean"),
+                    margin,
+                ))))
+                if output_path.suffix in PARQUET_SUFFIXES:
+                    _require_pyarrow()
+                    if parquet_writer is None:
+                        schema = _rescore_schema(pinned, chunk, actual_column)
+                        parquet_writer = pq.ParquetWriter(output_path, schema)
+                    chunk = _conform_to_schema(chunk, parquet_writer.schema)
+                    parquet_writer.write_table(
+                        pa.Table.from_pandas(chunk, schema=parquet_writer.schema, preserve_index=False)
+                    )
+                else:
+                    chunk.to_csv(output_path, mode="a" if wrote_header else "w", header=not wrote_header, index=False)
+                    wrote_header = True
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    
+    summary = {
+        "rows": rows,
+        "scored_rows": scored_rows,
+        "skipped_rows": rows - scored_rows - invalid_rows,
+        "invalid_rows": invalid_rows,
+        "evaluated_rows": evaluated_rows,
+        "accuracy": round(correct / evaluated_rows, 4) if evaluated_rows else None,
+        "conflict_rate": round(conflicts / scored_rows, 4) if scored_rows else None,
+        "mean_confidence": round(confidence_sum / scored_rows, 4) if scored_rows else None,
+        "winner_distribution": {
+            label: round(int(count) / scored_rows, 4) if scored_rows else 0.0
+            for label, count in zip(OUTPUT_LABELS, winner_counts)
+        },
+        "weights": pinned.get_config(),
+    }
+    
+    logger.info(
+        f"Rescored {rows} rows from {input_path} "
+        f"(accuracy: {summary['accuracy']}, conflict rate: {summary['conflict_rate']})"
+    )
+    
+    return summary
+
+
+def load_weights_file(path: Union[str, Path]) -> Dict[str, float]:
+    """Load ensemble weights from a JSON or YAML file.
+    
+    The file may hold the weights dict directly or under a ``weights`` key,
+    so configs written by the weight optimizer load unchanged.
+    
+    Args:
+        path: Path to a .json, .yaml or .yml file
+    
+    Returns:
+        Weights dict suitable for ``update_config``
+    
+    Raises:
+        ValueError: If the file does not contain a weights mapping
+    """
+    path = Path(path)
+    with open(path, "r") as f:
+        data = json.load(f) if path.suffix == ".json" else yaml.safe_load(f)
+    
+    weights = data.get("weights", data) if isinstance(data, dict) else None
+    if not isinstance(weights, dict):
+        raise ValueError(f"No weights mapping found in {path}")
+    return {str(key): float(value) for key, value in weights.items()}
+
+
+def load_stacking_model(path: Union[str, Path]) -> StackingModel:
+    """Load a stacking meta-model written by ``ModelTrainer.save_model``.
+    
+    Args:
+        path: JSON file produced from ``StackingModel.to_dict``
+    
+    Returns:
+        StackingModel ready for ``EnsemblePredictor.set_stacker``
+    """
+    with open(path, "r") as f:
+        payload = json.load(f)
+    if payload.get("type") != "stacking":
+        raise ValueError(f"Not a stacking model file: {path}")
+    return StackingModel.build(
+        [tuple(model) for model in payload["models"]], payload["coef"], payload["intercept"]
+    )
+
+
+class WeightRefresher:
+    """Periodically reload ensemble weights and swap them into a predictor.
+    
+    Loading and validation run on a background daemon thread; the swap itself
+    is a single snapshot assignment, so in-flight predictions are never
+    blocked. A failed load or an invalid config is logged and the current
+    snapshot is kept.
+    
+    The source is either a path to a JSON/YAML weights file (re-read only
+    when its mtime changes) or a callable returning a weights dict or DB row,
+    e.g.::
+    
+        def fetch_row():
+            client = get_supabase_client()
+            return client.table("ensemble_weights").select("*").limit(1).execute().data[0]
+        
+        WeightRefresher(predictor, fetch_row, interval=300).start()
+    
+    Rows may carry the weights under a ``weights`` key or as one column per
+    registered model key; other columns (id, timestamps) are ignored.
+    """
+    
+    def __init__(
+        self,
+        predictor: EnsemblePredictor,
+        source: Union[str, Path, Callable[[], Optional[Dict]]],
+        interval: float = 60.0,
+    ):
+        """Initialize the refresher.
+        
+        Args:
+            predictor: Predictor whose weights are kept up to date
+            source: Weights file path, or callable returning a weights dict/row
+            interval: Seconds between refresh attempts
+        """
+        if interval <= 0:
+            raise ValueError("Refresh interval must be positive")
+        
+        self.predictor = predictor
+        self.source = source
+        self.interval = interval
+        self._last_mtime: Optional[float] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def _load(self) -> Optional[Dict[str, float]]:
+        """Fetch weights from the source, or None if nothing changed."""
+        if callable(self.source):
+            row = self.source()
+            if not row:
+                return None
+            weights = row.get("weights", row)
+            keys = self.predictor.model_keys
+            return {key: float(weights[key]) for key in keys if weights.get(key) is not None}
+        
+        mtime = Path(self.source).stat().st_mtime
+        if mtime == self._last_mtime:
+            return None
+        weights = load_weights_file(self.source)
+        self._last_mtime = mtime
+        return weights
+    
+    def refresh(self) -> bool:
+        """Reload weights once and swap them in if they changed.
+        
+        Returns:
+            True if a new snapshot was installed, False otherwise
+        """
+        try:
+            weights = self._load()
+            if weights is None or weights == self.predictor.get_config():
+                return False
+            self.predictor.update_config(weights)
+            return True
+        except Exception as e:
+            logger.warning(f"Ensemble weight refresh failed, keeping current weights: {e}")
+            return False
+    
+    def _run(self) -> None:
+        """Refresh loop executed on the background thread."""
+        while not self._stop_event.is_set():
+            self.refresh()
+            self._stop_event.wait(self.interval)
+    
+    def start(self) -> "WeightRefresher":
+        """Start refreshing on a daemon thread (first refresh is immediate)."""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ensemble-weight-refresher", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def main():
+    """CLI entry point for rescoring an evaluation log with the ensemble."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Re-run the ensemble over an evaluation log in constant memory"
+    )
+    parser.add_argument(
+        "log_file",
+        help="Evaluation log (CSV or Parquet) with per-sub-model vote columns",
+    )
+    parser.add_argument(
+        "--output",
+        help="Destination CSV/Parquet for rescored rows (default: aggregates only)",
+    )
+    parser.add_argument(
+        "--weights",
+        help="Weights JSON/YAML file (default: built-in weights)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50_000,
+        help="Rows per chunk (default: 50000)",
+    )
+    parser.add_argument(
+        "--actual-column",
+        default="actual_result",
+        help="Column holding the actual outcome (default: actual_result)",
+    )
+    
+    args = parser.parse_args()
+    
+    try:
+        weights = load_weights_file(args.weights) if args.weights else None
+        summary = rescore_evaluation_log(
+            args.log_file,
+            output_path=args.output,
+            predictor=create_ensemble_predictor(weights),
+            chunk_size=args.chunk_size,
+            actual_column=args.actual_column,
+        )
+        print(json.dumps(summary, indent=2))
+        return 0
+    except Exception as e:
+        print(f"❌ Error: {str(e)}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
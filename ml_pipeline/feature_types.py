@@ -0,0 +1,176 @@
+"""
+Feature Types - Typed, compact training inputs.
+
+The model config may declare a dtype per input feature and for the target:
+
+    feature_dtypes:
+      home_goals_avg: float32
+      league_id: int16
+    default_feature_dtype: auto     # auto | float32 | float64
+    target_dtype: category          # category | object
+
+``auto`` narrows integer columns to the smallest integer type that holds
+them and casts float columns to float32 when every value is in range and
+its relative rounding error stays within ``float32_tolerance``. A
+categorical target is stored as small integer codes. Every cast is reported
+with its precision loss, and columns that cannot be cast as declared raise
+a FeatureTypeError.
+"""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FEATURE_DTYPES = ("auto", "float32", "float64", "int8", "int16", "int32", "int64", "category")
+TARGET_DTYPES = ("category", "object")
+
+# float32 rounds normal numbers with a relative error below 6e-8; larger
+# errors only come from values near the float32 limits
+FLOAT32_REL_TOLERANCE = 1e-6
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+
+
+class FeatureTypeError(ValueError):
+    """Raised when a column cannot be cast to its declared dtype."""
+    pass
+
+
+def float32_loss(values: np.ndarray) -> Dict[str, float]:
+    """
+    Precision lost by casting values to float32.
+
+    Args:
+        values: Numeric values
+
+    Returns:
+        Dict with max_abs_error, max_rel_error, overflow and lossless
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = values[np.isfinite(values)]
+    overflow = bool((np.abs(finite) > FLOAT32_MAX).any())
+    if overflow or not len(finite):
+        return {"max_abs_error": 0.0, "max_rel_error": 0.0, "overflow": overflow, "lossless": not overflow}
+
+    error = np.abs(finite - finite.astype(np.float32).astype(np.float64))
+    relative = error / np.maximum(np.abs(finite), np.finfo(np.float64).tiny)
+    return {
+        "max_abs_error": float(error.max()),
+        "max_rel_error": float(relative.max()),
+        "overflow": False,
+        "lossless": bool(error.max() == 0.0),
+    }
+
+
+def _cast_column(
+    values: pd.Series,
+    dtype: str,
+    declared: bool,
+    tolerance: float,
+) -> Tuple[pd.Series, Dict[str, Any]]:
+    """Cast one feature column and describe the cast."""
+    entry: Dict[str, Any] = {"from": str(values.dtype), "declared": declared}
+    numeric = pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+    if dtype == "category":
+        values = values.astype("category")
+        entry["to"] = "category"
+        return values, entry
+    if not numeric:
+        if declared:
+            raise FeatureTypeError(f"{values.name}: cannot cast {values.dtype} to {dtype}")
+        # auto leaves non-numeric columns (e.g. logged vote labels) untouched
+        entry["to"] = str(values.dtype)
+        return values, entry
+
+    if dtype == "float64":
+        values = values.astype(np.float64)
+    elif dtype.startswith("int"):
+        info = np.iinfo(dtype)
+        if values.isna().any() or (values % 1 != 0).any():
+            raise FeatureTypeError(f"{values.name}: {dtype} needs whole numbers without missing values")
+        if values.min() < info.min or values.max() > info.max:
+            raise FeatureTypeError(f"{values.name}: values outside the {dtype} range")
+        values = values.astype(dtype)
+    elif dtype == "auto" and pd.api.types.is_integer_dtype(values):
+        values = pd.to_numeric(values, downcast="integer")
+    else:
+        loss = float32_loss(values.to_numpy())
+        entry.update(loss)
+        safe = not loss["overflow"] and loss["max_rel_error"] <= tolerance
+        if dtype == "float32" and loss["overflow"]:
+            raise FeatureTypeError(f"{values.name}: values outside the float32 range")
+        if dtype == "float32" or safe:
+            if not safe:
+                logger.warning(
+                    f"{values.name}: float32 relative error {loss['max_rel_error']:.3g} exceeds {tolerance:g}"
+                )
+            values = values.astype(np.float32)
+
+    entry["to"] = str(values.dtype)
+    return values, entry
+
+
+def cast_features(
+    X: pd.DataFrame,
+    declared: Optional[Dict[str, str]] = None,
+    default: str = "auto",
+    tolerance: float = FLOAT32_REL_TOLERANCE,
+) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Any]]]:
+    """
+    Cast feature columns to their declared (or automatically narrowed) dtypes.
+
+    Args:
+        X: Feature matrix
+        declared: Feature name to dtype, from the config's ``feature_dtypes``
+        default: Dtype for undeclared features: 'auto', 'float32' or 'float64'
+        tolerance: Largest relative error accepted by 'auto' float32 casts
+
+    Returns:
+        Tuple of (typed features, per-feature cast report)
+
+    Raises:
+        FeatureTypeError: If a dtype is unknown or a column cannot be cast
+    """
+    declared = declared or {}
+    requested = {**declared, "<default>": default}
+    unknown = {name: dtype for name, dtype in requested.items() if dtype not in FEATURE_DTYPES}
+    if unknown:
+        raise FeatureTypeError(f"Unknown feature dtypes {unknown}. Use one of {FEATURE_DTYPES}")
+
+    columns = {}
+    report = {}
+    for name in X.columns:
+        columns[name], report[name] = _cast_column(
+            X[name], declared.get(name, default), name in declared, tolerance
+        )
+    return pd.DataFrame(columns, index=X.index), report
+
+
+def encode_target(y: pd.Series, dtype: str = "category") -> pd.Series:
+    """
+    Store the target compactly.
+
+    Args:
+        y: Target vector
+        dtype: 'category' (sorted categories, small integer codes) or 'object'
+
+    Returns:
+        Typed target
+
+    Raises:
+        FeatureTypeError: If the dtype is unknown
+    """
+    if dtype not in TARGET_DTYPES:
+        raise FeatureTypeError(f"Unknown target dtype {dtype!r}. Use one of {TARGET_DTYPES}")
+    if dtype == "object":
+        return y
+    return y.astype(pd.CategoricalDtype(sorted(y.dropna().unique())))
+
+
+def memory_mb(*frames: Any) -> float:
+    """Deep memory usage of DataFrames / Series in MB."""
+    return round(sum(np.sum(frame.memory_usage(deep=True)) for frame in frames) / 1e6, 3)
@@ -0,0 +1,351 @@
+"""
+Hyperparameter Search - Successive halving over a config's search space.
+
+A config's ``search_space`` block maps hyperparameter names to a list of
+choices or a distribution:
+
+    search_space:
+      max_depth: {type: int, low: 2, high: 12}
+      C: {type: loguniform, low: 0.01, high: 100}
+      criterion: [gini, entropy]
+
+Candidates are sampled with ``--random_seed``, trained on a small stratified
+subset of the training rows and scored on a fixed validation split. Each
+rung keeps the best 1/eta of the candidates and gives them eta times more
+rows, until the survivors train on the full training split. Rungs run on a
+process pool; the split is shared with each worker once via the pool
+initializer. The winner's hyperparameters are written to a new config file.
+"""
+
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+from sklearn.model_selection import train_test_split
+
+from .config import DATASET_CACHE_ENABLED
+from .model_leaderboard import RANKING_METRICS
+from .supabase_client import insert_system_log
+from .train_model import ModelTrainer, TrainingError
+
+logger = logging.getLogger(__name__)
+
+DISTRIBUTIONS = ("choice", "int", "uniform", "loguniform")
+
+# Shared train/validation split, set once per worker process by _init_worker
+_SPLIT: Optional[Dict[str, Any]] = None
+
+
+def sample_candidates(
+    search_space: Dict[str, Any],
+    n_candidates: int,
+    random_seed: int = 42,
+) -> List[Dict[str, Any]]:
+    """
+    Draw hyperparameter candidates from a search space.
+
+    Args:
+        search_space: Mapping of name to a list of choices or a
+            ``{type, low, high}`` / ``{type: choice, values}`` distribution
+        n_candidates: Number of candidates to draw
+        random_seed: Seed; the same seed always draws the same candidates
+
+    Returns:
+        List of hyperparameter dicts with plain Python values
+
+    Raises:
+        TrainingError: If a search space entry is malformed
+    """
+    if not search_space:
+        raise TrainingError("Config has no search_space block")
+
+    rng = np.random.default_rng(random_seed)
+    candidates = []
+    for _ in range(n_candidates):
+        params = {}
+        for name in sorted(search_space):
+            spec = search_space[name]
+            if isinstance(spec, list):
+                spec = {"type": "choice", "values": spec}
+            kind = spec.get("type") if isinstance(spec, dict) else None
+
+            if kind == "choice" and spec.get("values"):
+                params[name] = spec["values"][int(rng.integers(len(spec["values"])))]
+            elif kind == "int":
+                params[name] = int(rng.integers(spec["low"], spec["high"], endpoint=True))
+            elif kind == "uniform":
+                params[name] = float(rng.uniform(spec["low"], spec["high"]))
+            elif kind == "loguniform":
+                params[name] = float(np.exp(rng.uniform(np.log(spec["low"]), np.log(spec["high"]))))
+            else:
+                raise TrainingError(
+                    f"Invalid search space for {name}: {spec!r}. Use a list or one of {DISTRIBUTIONS}"
+                )
+        candidates.append(params)
+    return candidates
+
+
+def plan_rungs(n_candidates: int, eta: int = 3, min_fraction: float = 1 / 9) -> List[Tuple[int, float]]:
+    """
+    Successive halving schedule.
+
+    Args:
+        n_candidates: Candidates in the first rung
+        eta: Keep 1/eta of the candidates per rung, give them eta times the rows
+        min_fraction: Fraction of the training rows used by the first rung
+
+    Returns:
+        List of (candidates, training fraction) per rung; the last rung
+        trains on the full training split
+    """
+    rungs = []
+    fraction = min(max(min_fraction, 0.0), 1.0) or 1.0
+    survivors = n_candidates
+    while True:
+        if survivors <= 1:
+            fraction = 1.0
+        rungs.append((survivors, fraction))
+        if fraction >= 1.0:
+            return rungs
+        survivors = max(1, survivors // eta)
+        fraction = min(1.0, fraction * eta)
+
+
+def _init_worker(split: Dict[str, Any]) -> None:
+    """Receive the shared train/validation split once per worker process."""
+    global _SPLIT
+    _SPLIT = split
+
+
+def _evaluate_candidate(
+    config: Dict[str, Any],
+    params: Dict[str, Any],
+    train_index: np.ndarray,
+    metric: str,
+    random_seed: int,
+) -> Optional[float]:
+    """
+    Train one candidate on a subset of the shared split and score it.
+
+    Returns:
+        Validation metric, or None if the candidate cannot be trained
+    """
+    try:
+        trainer = ModelTrainer(random_seed=random_seed, use_cache=False)
+        trainer.config = {**config, "hyperparameters": {**config.get("hyperparameters", {}), **params}}
+        trainer.create_model()
+        metrics = trainer.fit_and_evaluate(
+            _SPLIT["X_train"].iloc[train_index],
+            _SPLIT["X_val"],
+            _SPLIT["y_train"].iloc[train_index],
+            _SPLIT["y_val"],
+        )
+        return metrics[metric]
+    except Exception as e:
+        logger.warning(f"Candidate {params} failed: {e}")
+        return None
+
+
+def _rung_rows(y_train, fraction: float, random_seed: int) -> np.ndarray:
+    """Stratified subset of training row positions for one rung."""
+    if fraction >= 1.0:
+        return np.arange(len(y_train))
+
+    n_classes = y_train.nunique()
+    size = max(int(math.ceil(fraction * len(y_train))), 2 * n_classes)
+    if size >= len(y_train):
+        return np.arange(len(y_train))
+
+    subset, _ = train_test_split(
+        np.arange(len(y_train)), train_size=size, random_state=random_seed, stratify=y_train
+    )
+    return np.sort(subset)
+
+
+def write_tuned_config(config: Dict[str, Any], params: Dict[str, Any], path: str) -> str:
+    """
+    Write a config with the searched hyperparameters filled in.
+
+    Args:
+        config: Original config (its ``search_space`` block is dropped)
+        params: Best hyperparameters
+        path: Output YAML path
+
+    Returns:
+        Path of the written config
+    """
+    tuned = {key: value for key, value in config.items() if key != "search_space"}
+    tuned["hyperparameters"] = {**config.get("hyperparameters", {}), **params}
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        yaml.safe_dump(tuned, f, sort_keys=False)
+    logger.info(f"Tuned config written to {path}")
+    return path
+
+
+def successive_halving(
+    dataset: str,
+    config: str = "model_config.yaml",
+    output_config: Optional[str] = None,
+    n_candidates: int = 27,
+    eta: int = 3,
+    min_fraction: float = 1 / 9,
+    metric: str = "accuracy",
+    max_fits: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+    workers: Optional[int] = None,
+    random_seed: int = 42,
+    use_cache: bool = DATASET_CACHE_ENABLED,
+) -> Dict[str, Any]:
+    """
+    Search a config's hyperparameters with successive halving.
+
+    The candidates, subsets and validation split depend only on
+    ``random_seed``, so the result is deterministic unless ``max_seconds``
+    cuts the search short.
+
+    Args:
+        dataset: Path to the training CSV
+        config: Model config YAML with a ``search_space`` block
+        output_config: Tuned config path (default: ``<config>_tuned.yaml``)
+        n_candidates: Candidates sampled for the first rung
+        eta: Keep 1/eta of the candidates per rung
+        min_fraction: Fraction of the training rows used by the first rung
+        metric: Validation metric to maximize
+        max_fits: Fit budget; the candidate count is reduced until the whole
+            schedule fits in it
+        max_seconds: Wall-time budget; no new rung starts after it expires
+        workers: Worker processes (default: CPU count); 1 runs in-process
+        random_seed: Seed for sampling, subsets and the validation split
+        use_cache: Reuse parsed datasets from the binary dataset cache
+
+    Returns:
+        Search report with the rungs, the best hyperparameters and the
+        tuned config path
+
+    Raises:
+        TrainingError: If the metric, search space, budget or dataset is invalid
+    """
+    if metric not in RANKING_METRICS:
+        raise TrainingError(f"Unknown search metric: {metric}. Use one of {RANKING_METRICS}")
+    if eta < 2:
+        raise TrainingError(f"eta must be at least 2, got {eta}")
+
+    started = time.perf_counter()
+    trainer = ModelTrainer(config_path=config, random_seed=random_seed, use_cache=use_cache)
+    model_config = trainer.load_config()
+
+    rungs = plan_rungs(n_candidates, eta, min_fraction)
+    if max_fits is not None:
+        while n_candidates > 1 and sum(count for count, _ in rungs) > max_fits:
+            n_candidates -= 1
+            rungs = plan_rungs(n_candidates, eta, min_fraction)
+        if sum(count for count, _ in rungs) > max_fits:
+            raise TrainingError(f"max_fits={max_fits} is too small for a single candidate")
+
+    candidates = sample_candidates(model_config.get("search_space"), n_candidates, random_seed)
+    base_config = {key: value for key, value in model_config.items() if key != "search_space"}
+
+    X, y = trainer.load_data(dataset)
+    X_train, X_val, y_train, y_val = trainer.split_data(X, y)
+    split = {"X_train": X_train, "X_val": X_val, "y_train": y_train, "y_val": y_val}
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(
+        f"Successive halving: {n_candidates} candidates, {len(rungs)} rungs, "
+        f"{sum(count for count, _ in rungs)} fits, {workers} workers"
+    )
+
+    pool = None
+    if workers == 1:
+        _init_worker(split)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(split,))
+
+    alive = list(range(n_candidates))
+    history = []
+    scores: Dict[int, Optional[float]] = {}
+    fits = 0
+    stopped_early = False
+    try:
+        for level, (count, fraction) in enumerate(rungs):
+            if max_seconds is not None and history and time.perf_counter() - started > max_seconds:
+                logger.warning(f"Wall-time budget of {max_seconds}s reached after rung {level}")
+                stopped_early = True
+                break
+
+            alive = alive[:count]
+            rows = _rung_rows(y_train, fraction, random_seed + level)
+            jobs = [(base_config, candidates[index], rows, metric, random_seed) for index in alive]
+            if pool is None:
+                results = [_evaluate_candidate(*job) for job in jobs]
+            else:
+                results = list(pool.map(_evaluate_candidate, *zip(*jobs)))
+            fits += len(jobs)
+
+            scores = dict(zip(alive, results))
+            history.append({
+                "rung": level,
+                "train_rows": int(len(rows)),
+                "candidates": [
+                    {"index": index, "params": candidates[index], "score": score}
+                    for index, score in scores.items()
+                ],
+            })
+
+            # Best first; ties and failures are broken by sampling order
+            alive = sorted(
+                (index for index in alive if scores[index] is not None),
+                key=lambda index: (-scores[index], index),
+            )
+            logger.info(
+                f"Rung {level}: {len(jobs)} candidates on {len(rows)} rows, "
+                f"best {metric}={scores[alive[0]]:.4f}" if alive else f"Rung {level}: every candidate failed"
+            )
+            if not alive:
+                raise TrainingError("Every search candidate failed to train")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = alive[0]
+    output_config = output_config or str(Path(config).with_name(f"{Path(config).stem}_tuned.yaml"))
+    write_tuned_config(model_config, candidates[best], output_config)
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "dataset": dataset,
+        "config": config,
+        "tuned_config": output_config,
+        "metric": metric,
+        "random_seed": random_seed,
+        "eta": eta,
+        "workers": workers,
+        "fits": fits,
+        "stopped_early": stopped_early,
+        "total_seconds": round(time.perf_counter() - started, 4),
+        "best": {"params": candidates[best], "score": scores[best], "rung": len(history) - 1},
+        "rungs": history,
+    }
+
+    insert_system_log(
+        component="hyperparameter_search",
+        status="info",
+        message=f"Hyperparameter search finished: {metric}={scores[best]:.4f} after {fits} fits",
+        details={
+            "config": config,
+            "tuned_config": output_config,
+            "best_params": candidates[best],
+            "dataset_size": len(X),
+        }
+    )
+
+    return report
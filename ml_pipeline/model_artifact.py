@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Model Artifact - Compact, memory-mappable format for trained models.
+
+A ``.artifact`` file stores a model's numeric parameters (linear
+coefficients, flattened tree arrays, scaler statistics) as raw arrays next
+to a small JSON header:
+
+    magic (8 bytes) | header length (uint64 LE) | JSON header | arrays
+
+Every array starts on a 64-byte boundary, so ``load_artifact`` maps the file
+once and returns zero-copy read-only views. Loading does not unpickle
+anything or import scikit-learn, and worker processes that map the same
+file share one copy of the parameters through the page cache.
+
+The header records the model config, feature order, metrics and a SHA-256
+of the array payload.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import LOG_LEVEL, MODELS_DIR
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+ARTIFACT_MAGIC = b"WMXART\x00\x01"
+ARTIFACT_SUFFIX = ".artifact"
+ARTIFACT_FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Estimator settings kept in the header so a scorer can reproduce predict_proba
+RECORDED_PARAMS = ("solver", "multi_class", "loss", "fit_intercept", "criterion", "max_depth")
+
+
+class ArtifactError(Exception):
+    """Raised when a model cannot be stored in, or read from, an artifact."""
+    pass
+
+
+class ModelArtifact(NamedTuple):
+    """Loaded artifact: header metadata and read-only (memory-mapped) arrays."""
+
+    metadata: Dict[str, Any]
+    arrays: Dict[str, np.ndarray]
+
+    @property
+    def kind(self) -> str:
+        """Model family: 'linear' or 'tree'."""
+        return self.metadata["kind"]
+
+    @property
+    def classes(self) -> List[Any]:
+        """Class labels in predict_proba column order."""
+        return self.metadata["classes"]
+
+    @property
+    def feature_order(self) -> Optional[List[str]]:
+        """Input feature names in column order, if known."""
+        return self.metadata.get("feature_order")
+
+
+def _json_safe(value: Any) -> Any:
+    """Convert numpy scalars to plain Python values for the header."""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def model_arrays(model: Any) -> Tuple[str, Dict[str, np.ndarray], Dict[str, Any]]:
+    """
+    Extract the numeric parameters of a fitted model.
+
+    Supported: linear classifiers with ``coef_`` (LogisticRegression,
+    SGDClassifier) and DecisionTreeClassifier, optionally behind
+    StandardScaler steps in a Pipeline.
+
+    Args:
+        model: Fitted estimator or Pipeline
+
+    Returns:
+        Tuple of (kind, arrays, estimator metadata)
+
+    Raises:
+        ArtifactError: If the model type is not supported
+    """
+    arrays: Dict[str, np.ndarray] = {}
+    steps = getattr(model, "steps", None)
+    estimator = model
+    if steps is not None:
+        estimator = steps[-1][1]
+        for index, (name, step) in enumerate(steps[:-1]):
+            if not hasattr(step, "mean_") or not hasattr(step, "scale_"):
+                raise ArtifactError(f"Unsupported pipeline step {name!r}: {type(step).__name__}")
+            n_features = step.n_features_in_
+            mean = step.mean_ if step.mean_ is not None else np.zeros(n_features)
+            scale = step.scale_ if step.scale_ is not None else np.ones(n_features)
+            arrays[f"scaler{index}_mean"] = np.asarray(mean, dtype=np.float64)
+            arrays[f"scaler{index}_scale"] = np.asarray(scale, dtype=np.float64)
+
+    if not hasattr(estimator, "classes_"):
+        raise ArtifactError(f"{type(estimator).__name__} is not a fitted classifier")
+
+    if hasattr(estimator, "coef_"):
+        kind = "linear"
+        # Models fitted on float32 inputs keep float32 coefficients
+        dtype = np.float32 if estimator.coef_.dtype == np.float32 else np.float64
+        arrays["coef"] = np.asarray(estimator.coef_, dtype=dtype)
+        arrays["intercept"] = np.atleast_1d(np.asarray(estimator.intercept_, dtype=dtype))
+    elif hasattr(estimator, "tree_"):
+        kind = "tree"
+        tree = estimator.tree_
+        if tree.n_outputs != 1:
+            raise ArtifactError("Multi-output trees are not supported")
+        arrays["children_left"] = tree.children_left.astype(np.int32)
+        arrays["children_right"] = tree.children_right.astype(np.int32)
+        arrays["feature"] = tree.feature.astype(np.int32)
+        arrays["threshold"] = tree.threshold.astype(np.float64)
+        arrays["value"] = tree.value[:, 0, :].astype(np.float64)
+        missing_left = getattr(tree, "missing_go_to_left", None)
+        if missing_left is not None:
+            arrays["missing_go_to_left"] = np.asarray(missing_left, dtype=np.uint8)
+    else:
+        raise ArtifactError(f"Unsupported estimator: {type(estimator).__name__}")
+
+    params = estimator.get_params() if hasattr(estimator, "get_params") else {}
+    estimator_meta = {
+        "estimator": type(estimator).__name__,
+        "params": {key: _json_safe(params[key]) for key in RECORDED_PARAMS if key in params},
+        "classes": [_json_safe(label) for label in estimator.classes_],
+        "n_features": int(getattr(estimator, "n_features_in_", 0)),
+    }
+    feature_names = getattr(model, "feature_names_in_", None)
+    if feature_names is not None:
+        estimator_meta["feature_names"] = [str(name) for name in feature_names]
+    return kind, arrays, estimator_meta
+
+
+def save_artifact(
+    model: Any,
+    path: str,
+    config: Optional[Dict[str, Any]] = None,
+    metrics: Optional[Dict[str, float]] = None,
+    source: Optional[str] = None,
+) -> str:
+    """
+    Write a fitted model as a memory-mappable artifact.
+
+    Args:
+        model: Fitted estimator or Pipeline (see ``model_arrays``)
+        path: Output file
+        config: Model config; its ``input_features`` become the feature order
+        metrics: Evaluation metrics to record
+        source: Original model file, recorded for reference
+
+    Returns:
+        Path of the written artifact
+
+    Raises:
+        ArtifactError: If the model type is not supported
+    """
+    kind, arrays, estimator_meta = model_arrays(model)
+    feature_names = estimator_meta.pop("feature_names", None)
+    feature_order = (config or {}).get("input_features") or feature_names
+
+    layout = {}
+    offset = 0
+    digest = hashlib.sha256()
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        offset = -(-offset // ALIGNMENT) * ALIGNMENT
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        digest.update(array.tobytes())
+        offset += array.nbytes
+
+    header = {
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "kind": kind,
+        **estimator_meta,
+        "model_type": (config or {}).get("model_type"),
+        "config": config,
+        "feature_order": feature_order,
+        "metrics": metrics,
+        "source": source,
+        "created_at": datetime.now().isoformat(),
+        "sha256": digest.hexdigest(),
+        "arrays": layout,
+    }
+    header_bytes = json.dumps(header).encode()
+    prefix = len(ARTIFACT_MAGIC) + 8
+    header_bytes += b" " * (-(prefix + len(header_bytes)) % ALIGNMENT)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    with os.fdopen(fd, "wb") as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(np.uint64(len(header_bytes)).tobytes())
+        f.write(header_bytes)
+        written = 0
+        for name, array in arrays.items():
+            f.write(b"\0" * (layout[name]["offset"] - written))
+            f.write(array.tobytes())
+            written = layout[name]["offset"] + array.nbytes
+    os.replace(staging, path)
+
+    logger.info(f"Model artifact written to {path} ({kind}, {written} bytes of parameters)")
+    return str(path)
+
+
+def load_artifact(path: str, verify: bool = False) -> ModelArtifact:
+    """
+    Map an artifact file.
+
+    Args:
+        path: Artifact file
+        verify: Recompute the payload SHA-256 (reads every page)
+
+    Returns:
+        ModelArtifact with read-only views into the mapped file
+
+    Raises:
+        ArtifactError: If the file is not a valid artifact or fails verification
+    """
+    try:
+        with open(path, "rb") as f:
+            magic = f.read(len(ARTIFACT_MAGIC))
+            if magic != ARTIFACT_MAGIC:
+                raise ArtifactError(f"Not a model artifact: {path}")
+            header_length = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+            metadata = json.loads(f.read(header_length))
+    except (OSError, ValueError, IndexError) as e:
+        raise ArtifactError(f"Cannot read model artifact {path}: {e}") from e
+
+    if metadata.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported artifact version: {metadata.get('format_version')}")
+
+    data_start = len(ARTIFACT_MAGIC) + 8 + header_length
+    arrays = {}
+    if metadata["arrays"]:
+        mapped = np.memmap(path, dtype=np.uint8, mode="r", offset=data_start)
+        for name, spec in metadata["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            count = int(np.prod(spec["shape"], dtype=np.int64))
+            arrays[name] = np.frombuffer(
+                mapped, dtype=dtype, count=count, offset=spec["offset"]
+            ).reshape(spec["shape"])
+
+    if verify:
+        digest = hashlib.sha256()
+        for array in arrays.values():
+            digest.update(array.tobytes())
+        if digest.hexdigest() != metadata["sha256"]:
+            raise ArtifactError(f"Artifact payload hash mismatch: {path}")
+
+    return ModelArtifact(metadata=metadata, arrays=arrays)
+
+
+def convert_pickle(
+    pkl_path: str,
+    output: Optional[str] = None,
+    config: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Convert a joblib ``.pkl`` model to an artifact next to it.
+
+    Args:
+        pkl_path: Existing model pickle
+        output: Artifact path (default: same name with ``.artifact``)
+        config: Model config to record (feature order, model type)
+
+    Returns:
+        Path of the written artifact
+
+    Raises:
+        ArtifactError: If the pickle cannot be loaded or its model is not supported
+    """
+    import joblib
+
+    try:
+        model = joblib.load(pkl_path)
+    except Exception as e:
+        raise ArtifactError(f"Cannot load {pkl_path}: {e}") from e
+
+    output = output or str(Path(pkl_path).with_suffix(ARTIFACT_SUFFIX))
+    return save_artifact(model, output, config=config, source=str(pkl_path))
+
+
+def find_pickles(paths: Sequence[str]) -> List[Path]:
+    """Expand files and directories (searched recursively) into .pkl files."""
+    found = []
+    for path in map(Path, paths):
+        found.extend(sorted(path.rglob("*.pkl")) if path.is_dir() else [path])
+    return found
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Convert .pkl models to memory-mappable .artifact files"
+    )
+
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(MODELS_DIR)],
+        help="Model files or directories to convert (default: models dir)",
+    )
+
+    parser.add_argument(
+        "--config",
+        type=str,
+        default=None,
+        help="Model configuration YAML to record in the artifacts",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_arguments()
+
+    config = None
+    if args.config:
+        import yaml
+
+        with open(args.config, "r") as f:
+            config = yaml.safe_load(f)
+
+    converted, skipped = [], []
+    for pkl_path in find_pickles(args.paths):
+        try:
+            converted.append(convert_pickle(str(pkl_path), config=config))
+        except ArtifactError as e:
+            logger.warning(f"Skipped {pkl_path}: {e}")
+            skipped.append({"path": str(pkl_path), "error": str(e)})
+
+    print(json.dumps({"converted": converted, "skipped": skipped}, indent=2))
+    return 0 if converted or not skipped else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
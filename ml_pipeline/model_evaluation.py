@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Model Evaluation - Champion/challenger scoring of registered models.
+
+Every model in ``models/model_registry.json`` with a selected status (active,
+candidate and shadow by default) is scored against one shared holdout. The
+holdout is read, validated and typed once in the parent process and handed
+to each worker process once, through the pool initializer; each model file is
+loaded once, by the worker that scores it. Models with a ``.artifact`` next
+to their pickle are scored with the compiled scorer instead of unpickling.
+
+The output is the registry itself with fresh holdout ``metrics`` and an
+``evaluation`` block per model (confidence distribution, agreement with every
+other evaluated model, difference to the active model), so it can be written
+back over the registry or diffed against it.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+from .config import LOG_LEVEL, MODELS_DIR, PROJECT_ROOT
+from .model_artifact import ARTIFACT_SUFFIX
+from .supabase_client import insert_system_log
+from .train_model import ModelTrainer, TrainingError
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+REGISTRY_PATH = MODELS_DIR / "model_registry.json"
+EVALUATED_STATUSES = ("active", "candidate", "shadow")
+CHAMPION_STATUS = "active"
+CONFIDENCE_BINS = 10
+CONFIDENCE_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Shared holdout, set once per worker process by _init_worker
+_HOLDOUT: Optional[Dict[str, Any]] = None
+
+
+def load_registry(path: str = str(REGISTRY_PATH)) -> Dict[str, Any]:
+    """
+    Read the model registry.
+
+    Args:
+        path: Registry JSON file
+
+    Returns:
+        Registry dict with a ``models`` list
+
+    Raises:
+        TrainingError: If the file is missing or not a registry
+    """
+    try:
+        with open(path, "r") as f:
+            registry = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TrainingError(f"Cannot read model registry {path}: {e}") from e
+
+    if not isinstance(registry, dict) or not isinstance(registry.get("models"), list):
+        raise TrainingError(f"Model registry {path} has no 'models' list")
+    return registry
+
+
+def model_file(entry: Dict[str, Any], root: Path = PROJECT_ROOT) -> Path:
+    """Model file of a registry entry (``path``, or ``file_path`` in older entries)."""
+    path = Path(entry.get("path") or entry.get("file_path") or "")
+    return path if path.is_absolute() else root / path
+
+
+def _load_model(path: Path) -> Any:
+    """Load a registered model, preferring its memory-mapped artifact."""
+    artifact = path.with_suffix(ARTIFACT_SUFFIX)
+    if artifact.exists():
+        from .compiled_scorer import load_scorer
+
+        return load_scorer(str(artifact))
+
+    import joblib
+
+    return joblib.load(path)
+
+
+def _model_input(model: Any, X: Any) -> Any:
+    """Select and order the holdout columns the model was trained on."""
+    features = getattr(model, "feature_order", None)
+    if features is None:
+        features = getattr(model, "feature_names_in_", None)
+    if features is not None:
+        return X[list(features)]
+    # Models without feature names get a plain matrix in holdout column order
+    return X.to_numpy()
+
+
+def confidence_distribution(proba: np.ndarray, correct: np.ndarray) -> Dict[str, Any]:
+    """
+    Summarize the top-class probability of every holdout row.
+
+    Args:
+        proba: (rows, classes) predicted probabilities
+        correct: (rows,) whether the prediction was right
+
+    Returns:
+        Dict with mean, quantiles, per-bin counts over [0, 1] and the mean
+        confidence of correct and incorrect predictions
+    """
+    confidence = np.asarray(proba, dtype=np.float64).max(axis=1)
+    counts, _ = np.histogram(confidence, bins=CONFIDENCE_BINS, range=(0.0, 1.0))
+
+    def mean(values: np.ndarray) -> Optional[float]:
+        return round(float(values.mean()), 6) if len(values) else None
+
+    return {
+        "mean": mean(confidence),
+        "quantiles": {
+            f"p{int(q * 100)}": round(float(value), 6)
+            for q, value in zip(CONFIDENCE_QUANTILES, np.quantile(confidence, CONFIDENCE_QUANTILES))
+        },
+        "histogram": counts.tolist(),
+        "mean_correct": mean(confidence[correct]),
+        "mean_incorrect": mean(confidence[~correct]),
+    }
+
+
+def _init_worker(holdout: Dict[str, Any]) -> None:
+    """Receive the shared holdout once per worker process."""
+    global _HOLDOUT
+    _HOLDOUT = holdout
+
+
+def _score_model(entry: Dict[str, Any], root: Path) -> Dict[str, Any]:
+    """
+    Load one registered model and score it on the shared holdout.
+
+    Returns:
+        Result with status, metrics, confidence and predictions; failures are
+        reported with status 'failed'
+    """
+    started = time.perf_counter()
+    result = {"id": entry.get("id"), "name": entry.get("name")}
+    try:
+        path = model_file(entry, root)
+        model = _load_model(path)
+        load_seconds = time.perf_counter() - started
+
+        X = _model_input(model, _HOLDOUT["X"])
+        y_true = _HOLDOUT["y"]
+        y_pred = np.asarray(model.predict(X))
+        if len(y_pred) != len(y_true):
+            raise TrainingError(f"Model returned {len(y_pred)} predictions for {len(y_true)} rows")
+
+        result.update({
+            "status": "success",
+            "metrics": {
+                "accuracy": float(accuracy_score(y_true, y_pred)),
+                "precision": float(precision_score(y_true, y_pred, average="weighted", zero_division=0)),
+                "recall": float(recall_score(y_true, y_pred, average="weighted", zero_division=0)),
+                "f1_score": float(f1_score(y_true, y_pred, average="weighted", zero_division=0)),
+            },
+            "confidence": None,
+            "predictions": y_pred,
+            "load_seconds": round(load_seconds, 4),
+        })
+        if hasattr(model, "predict_proba"):
+            try:
+                proba = np.asarray(model.predict_proba(X))
+            except Exception as e:
+                logger.warning(f"{path.name} has no usable predict_proba: {e}")
+            else:
+                result["confidence"] = confidence_distribution(proba, y_pred == y_true)
+    except Exception as e:
+        logger.error(f"Evaluating model {entry.get('name')} failed: {e}")
+        result.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+    result["score_seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def agreement_matrix(predictions: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
+    """
+    Share of holdout rows on which each pair of models predicts the same label.
+
+    Args:
+        predictions: Model id to (rows,) predicted labels
+
+    Returns:
+        Nested dict, symmetric, without the diagonal
+    """
+    agreement = {model_id: {} for model_id in predictions}
+    for first, second in combinations(predictions, 2):
+        rate = round(float(np.mean(predictions[first] == predictions[second])), 6)
+        agreement[first][second] = rate
+        agreement[second][first] = rate
+    return agreement
+
+
+def evaluate_registry(
+    dataset: str,
+    config_path: str = "model_config.yaml",
+    registry_path: str = str(REGISTRY_PATH),
+    statuses: Sequence[str] = EVALUATED_STATUSES,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Score every registered model with a selected status on one holdout.
+
+    Args:
+        dataset: Holdout CSV; every row is scored
+        config_path: Model config whose ``input_features`` and
+            ``target_column`` define the holdout columns
+        registry_path: Model registry JSON; entry paths are relative to the
+            directory above it (the project root for models/model_registry.json)
+        statuses: Registry statuses to evaluate; other entries are passed
+            through unchanged
+        workers: Worker processes (default: one per model, capped at CPU
+            count); 1 scores sequentially in-process
+
+    Returns:
+        Registry dict with updated ``metrics`` and an ``evaluation`` block per
+        evaluated model, plus a top-level ``evaluation`` summary
+
+    Raises:
+        TrainingError: If the registry, config or holdout cannot be loaded, or
+            no registered model has a selected status
+    """
+    started = time.perf_counter()
+    registry = load_registry(registry_path)
+    selected = [entry for entry in registry["models"] if entry.get("status") in statuses]
+    if not selected:
+        raise TrainingError(f"No registered models with status {', '.join(statuses)}")
+
+    loader = ModelTrainer(config_path=config_path)
+    loader.load_config()
+    X, y = loader.load_data(dataset)
+    holdout = {"X": X, "y": np.asarray(y)}
+    load_seconds = time.perf_counter() - started
+
+    root = Path(registry_path).resolve().parent.parent
+    workers = workers or min(len(selected), os.cpu_count() or 1)
+    logger.info(f"Evaluating {len(selected)} registered models on {len(X)} rows with {workers} workers")
+
+    jobs = [(entry, root) for entry in selected]
+    if workers == 1:
+        _init_worker(holdout)
+        results = [_score_model(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(holdout,)
+        ) as pool:
+            results = list(pool.map(_score_model, *zip(*jobs)))
+
+    succeeded = {result["id"]: result for result in results if result["status"] == "success"}
+    agreement = agreement_matrix({model_id: result["predictions"] for model_id, result in succeeded.items()})
+    champion = next(
+        (entry["id"] for entry in selected
+         if entry.get("status") == CHAMPION_STATUS and entry["id"] in succeeded),
+        None,
+    )
+
+    evaluated_at = datetime.now().isoformat()
+    by_id = {result["id"]: result for result in results}
+    models = []
+    for entry in registry["models"]:
+        entry = dict(entry)
+        result = by_id.get(entry.get("id")) if entry.get("status") in statuses else None
+        if result is not None and result["status"] == "success":
+            evaluation = {
+                "status": "success",
+                "evaluated_at": evaluated_at,
+                "dataset": dataset,
+                "rows": len(X),
+                "previous_metrics": entry.get("metrics"),
+                "confidence": result["confidence"],
+                "agreement": agreement[entry["id"]],
+                "load_seconds": result["load_seconds"],
+                "score_seconds": result["score_seconds"],
+            }
+            if champion and entry["id"] != champion:
+                evaluation["vs_champion"] = {
+                    metric: round(value - succeeded[champion]["metrics"][metric], 6)
+                    for metric, value in result["metrics"].items()
+                }
+            entry["metrics"] = result["metrics"]
+            entry["evaluation"] = evaluation
+        elif result is not None:
+            entry["evaluation"] = {"status": "failed", "evaluated_at": evaluated_at, "error": result["error"]}
+        models.append(entry)
+
+    output = {key: value for key, value in registry.items() if key != "models"}
+    output["models"] = models
+    output["evaluation"] = {
+        "generated_at": evaluated_at,
+        "dataset": dataset,
+        "rows": len(X),
+        "statuses": list(statuses),
+        "champion": champion,
+        "evaluated": len(succeeded),
+        "failed": [
+            {"id": result["id"], "name": result["name"], "error": result["error"]}
+            for result in results if result["status"] != "success"
+        ],
+        "workers": workers,
+        "load_seconds": round(load_seconds, 4),
+        "total_seconds": round(time.perf_counter() - started, 4),
+    }
+
+    insert_system_log(
+        component="model_evaluation",
+        status="info" if succeeded else "error",
+        message=f"Registry evaluated: {len(succeeded)}/{len(results)} models scored",
+        details={"champion": champion, "dataset_size": len(X), "failed": len(results) - len(succeeded)},
+    )
+
+    return output
+
+
+def write_registry(registry: Dict[str, Any], path: str) -> None:
+    """Replace a registry file atomically."""
+    path = Path(path)
+    fd, staging = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    with os.fdopen(fd, "w") as f:
+        json.dump(registry, f, indent=2)
+        f.write("\n")
+    os.replace(staging, path)
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Score every registered model on one shared holdout"
+    )
+
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        required=True,
+        help="Path to holdout dataset (CSV file)",
+    )
+
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="model_config.yaml",
+        help="Model config defining the feature and target columns",
+    )
+
+    parser.add_argument(
+        "--registry",
+        type=str,
+        default=str(REGISTRY_PATH),
+        help="Model registry JSON (default: models/model_registry.json)",
+    )
+
+    parser.add_argument(
+        "--statuses",
+        type=str,
+        nargs="+",
+        default=list(EVALUATED_STATUSES),
+        help="Registry statuses to evaluate (default: active candidate shadow)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per model, up to CPU count)",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Evaluated registry JSON file (default: stdout)",
+    )
+
+    parser.add_argument(
+        "--write_registry",
+        action="store_true",
+        help="Write the evaluated registry back over --registry",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_arguments()
+
+    try:
+        registry = evaluate_registry(
+            dataset=args.dataset,
+            config_path=args.config,
+            registry_path=args.registry,
+            statuses=args.statuses,
+            workers=args.workers,
+        )
+    except TrainingError as e:
+        logger.error(f"Registry evaluation failed: {e}")
+        return 1
+
+    if args.write_registry:
+        write_registry(registry, args.registry)
+        logger.info(f"Registry updated: {args.registry}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(registry, f, indent=2)
+        logger.info(f"Evaluated registry written to {args.output}")
+    elif not args.write_registry:
+        print(json.dumps(registry, indent=2))
+
+    return 0 if registry["evaluation"]["evaluated"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
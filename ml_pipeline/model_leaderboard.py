@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Model Leaderboard - Train several model configs in parallel and rank them.
+
+The dataset is read, validated and split once in the parent process. The
+split is handed to each worker process once, through the pool initializer,
+so N configs cost one data load and roughly one wall-clock training on N
+cores. Each worker casts its features with its own config's dtypes, as
+``train`` would. The result is a ranked leaderboard JSON for picking a
+champion.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from .config import LOG_LEVEL, MODELS_DIR
+from .supabase_client import insert_system_log
+from .train_model import ModelTrainer, TrainingError
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, LOG_LEVEL),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+RANKING_METRICS = ("accuracy", "precision", "recall", "f1_score")
+CONFIG_SUFFIXES = ("*.yaml", "*.yml")
+
+# Shared split, set once per worker process by _init_worker
+_SPLIT: Optional[Dict[str, Any]] = None
+
+
+def collect_configs(configs: Sequence[str] = (), config_dir: Optional[str] = None) -> List[str]:
+    """
+    Resolve the list of config files to train.
+
+    Args:
+        configs: Explicit config paths
+        config_dir: Directory whose *.yaml / *.yml files are added
+
+    Returns:
+        De-duplicated config paths, explicit ones first
+
+    Raises:
+        TrainingError: If no configs are given or the directory does not exist
+    """
+    paths = list(configs)
+    if config_dir:
+        directory = Path(config_dir)
+        if not directory.is_dir():
+            raise TrainingError(f"Config directory not found: {config_dir}")
+        for pattern in CONFIG_SUFFIXES:
+            paths.extend(str(path.resolve()) for path in sorted(directory.glob(pattern)))
+
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        raise TrainingError("No model configs given")
+    return paths
+
+
+def _failed_entry(config_path: str, config: Any, error: Exception) -> Dict[str, Any]:
+    """Leaderboard entry for a config that could not be trained."""
+    return {
+        "config": config_path,
+        "model_type": config.get("model_type") if isinstance(config, dict) else None,
+        "status": "failed",
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def _check_config(config: Any, target: str, columns: Sequence[str]) -> None:
+    """
+    Check that a config can be trained on the shared split.
+
+    Raises:
+        TrainingError: If the config is malformed, predicts another target or
+            uses features missing from the dataset
+    """
+    if not isinstance(config, dict) or "target_column" not in config or "input_features" not in config:
+        raise TrainingError("Config needs 'target_column' and 'input_features'")
+    if config["target_column"] != target:
+        raise TrainingError(f"Target column {config['target_column']!r} differs from the shared target {target!r}")
+    missing = [feature for feature in config["input_features"] if feature not in columns]
+    if missing:
+        raise TrainingError(f"Features missing from the dataset: {missing}")
+
+
+def _init_worker(split: Dict[str, Any]) -> None:
+    """Receive the shared train/test split once per worker process."""
+    global _SPLIT
+    _SPLIT = split
+
+
+def _train_config(
+    config_path: str,
+    config: Dict[str, Any],
+    output_dir: Optional[str],
+    random_seed: int,
+) -> Dict[str, Any]:
+    """
+    Train and evaluate one config on the shared split.
+
+    The shared features are uncast; the config's own dtypes are applied
+    here, before the split rows are selected.
+
+    Returns:
+        Leaderboard entry; failures are reported with status 'failed'
+    """
+    started = time.perf_counter()
+    entry = {
+        "config": config_path,
+        "model_type": config.get("model_type"),
+    }
+    try:
+        trainer = ModelTrainer(config_path=config_path, random_seed=random_seed)
+        trainer.config = config
+        features = config["input_features"]
+
+        X, y = trainer.apply_dtypes(_SPLIT["X"][features], _SPLIT["y"])
+        train_index, test_index = _SPLIT["train_index"], _SPLIT["test_index"]
+
+        trainer.create_model()
+        metrics = trainer.fit_and_evaluate(
+            X.loc[train_index],
+            X.loc[test_index],
+            y.loc[train_index],
+            y.loc[test_index],
+        )
+        entry.update({
+            "status": "success",
+            "metrics": metrics,
+            "model_path": trainer.save_model(output_dir, tag=Path(config_path).stem),
+        })
+    except Exception as e:
+        logger.error(f"Training {config_path} failed: {e}")
+        entry.update({"status": "failed", "error": f"{type(e).__name__}: {e}"})
+
+    entry["train_seconds"] = round(time.perf_counter() - started, 4)
+    return entry
+
+
+def build_leaderboard(
+    dataset: str,
+    configs: Sequence[str],
+    output_dir: Optional[str] = None,
+    metric: str = "accuracy",
+    workers: Optional[int] = None,
+    random_seed: int = 42,
+) -> Dict[str, Any]:
+    """
+    Train every config on one shared split and rank them.
+
+    Configs share one split, so they must predict the same target column (the
+    one most configs use). Their input features may differ; the union of
+    features is loaded once. A config that cannot be loaded, predicts another
+    target or uses features missing from the dataset is listed as failed.
+
+    Args:
+        dataset: Path to the training CSV
+        configs: Model config YAML paths
+        output_dir: Directory for the trained models (default: models dir)
+        metric: Test-set metric to rank by (accuracy, precision, recall, f1_score)
+        workers: Worker processes (default: one per config, capped at CPU count);
+            1 trains sequentially in-process
+        random_seed: Seed for the shared split and the models
+
+    Returns:
+        Leaderboard dict with ranked ``entries`` and ``failed`` configs
+
+    Raises:
+        TrainingError: If the metric is unknown, the dataset is invalid or no
+            config is valid
+    """
+    if metric not in RANKING_METRICS:
+        raise TrainingError(f"Unknown ranking metric: {metric}. Use one of {RANKING_METRICS}")
+
+    started = time.perf_counter()
+    try:
+        columns = list(pd.read_csv(dataset, nrows=0).columns)
+    except FileNotFoundError:
+        raise TrainingError(f"Dataset file not found: {dataset}") from None
+    except pd.errors.EmptyDataError:
+        raise TrainingError(f"Dataset file is empty: {dataset}") from None
+
+    loaded = {}
+    rejected = []
+    for config_path in configs:
+        try:
+            loaded[config_path] = ModelTrainer(config_path=config_path).load_config()
+        except TrainingError as e:
+            rejected.append(_failed_entry(config_path, None, e))
+
+    # The shared split predicts the target most configs use; ties go to the first config
+    targets = Counter(
+        config["target_column"] for config in loaded.values()
+        if isinstance(config, dict) and "target_column" in config
+    )
+    target = targets.most_common(1)[0][0] if targets else None
+    for config_path, config in list(loaded.items()):
+        try:
+            _check_config(config, target, columns)
+        except TrainingError as e:
+            rejected.append(_failed_entry(config_path, config, e))
+            del loaded[config_path]
+
+    for entry in rejected:
+        logger.error(f"Skipping {entry['config']}: {entry['error']}")
+    if not loaded:
+        raise TrainingError(f"No valid model configs: {[entry['error'] for entry in rejected]}")
+
+    # Load and split once with the union of every config's features, uncast
+    features = list(dict.fromkeys(
+        feature for config in loaded.values() for feature in config["input_features"]
+    ))
+    loader = ModelTrainer(random_seed=random_seed)
+    loader.config = {"input_features": features, "target_column": target}
+    X, y = loader.load_data(dataset, cast=False)
+    X_train, X_test, _, _ = loader.split_data(X, y)
+    split = {"X": X, "y": y, "train_index": X_train.index, "test_index": X_test.index}
+    load_seconds = time.perf_counter() - started
+
+    output_dir = output_dir or str(MODELS_DIR)
+    workers = workers or min(len(loaded), os.cpu_count() or 1)
+    logger.info(f"Training {len(loaded)} configs on {len(X)} rows with {workers} workers")
+
+    jobs = [(path, config, output_dir, random_seed) for path, config in loaded.items()]
+    if workers == 1:
+        _init_worker(split)
+        entries = [_train_config(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(split,)
+        ) as pool:
+            entries = list(pool.map(_train_config, *zip(*jobs)))
+
+    succeeded = [entry for entry in entries if entry["status"] == "success"]
+    succeeded.sort(key=lambda entry: entry["metrics"][metric], reverse=True)
+    for rank, entry in enumerate(succeeded, start=1):
+        entry["rank"] = rank
+
+    leaderboard = {
+        "generated_at": datetime.now().isoformat(),
+        "dataset": dataset,
+        "metric": metric,
+        "rows": len(X),
+        "train_rows": len(X_train),
+        "test_rows": len(X_test),
+        "random_seed": random_seed,
+        "workers": workers,
+        "load_seconds": round(load_seconds, 4),
+        "total_seconds": round(time.perf_counter() - started, 4),
+        "champion": succeeded[0]["config"] if succeeded else None,
+        "entries": succeeded,
+        "failed": rejected + [entry for entry in entries if entry["status"] != "success"],
+    }
+
+    insert_system_log(
+        component="model_leaderboard",
+        status="info" if succeeded else "error",
+        message=f"Leaderboard built: {len(succeeded)}/{len(entries) + len(rejected)} configs trained",
+        details={
+            "champion": leaderboard["champion"],
+            "metric": metric,
+            "dataset_size": len(X),
+        }
+    )
+
+    return leaderboard
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Train several model configs in parallel and rank them"
+    )
+
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        required=True,
+        help="Path to training dataset (CSV file)",
+    )
+
+    parser.add_argument(
+        "--configs",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Model configuration YAML files",
+    )
+
+    parser.add_argument(
+        "--config_dir",
+        type=str,
+        default=None,
+        help="Directory of model configuration YAML files",
+    )
+
+    parser.add_argument(
+        "--output_dir",
+        type=str,
+        default=None,
+        help="Directory to save trained models",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Leaderboard JSON file (default: stdout)",
+    )
+
+    parser.add_argument(
+        "--metric",
+        type=str,
+        default="accuracy",
+        choices=RANKING_METRICS,
+        help="Test-set metric to rank by (default: accuracy)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: one per config, up to CPU count)",
+    )
+
+    parser.add_argument(
+        "--random_seed",
+        type=int,
+        default=42,
+        help="Random seed for reproducibility (default: 42)",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_arguments()
+
+    try:
+        leaderboard = build_leaderboard(
+            dataset=args.dataset,
+            configs=collect_configs(args.configs, args.config_dir),
+            output_dir=args.output_dir,
+            metric=args.metric,
+            workers=args.workers,
+            random_seed=args.random_seed,
+        )
+    except TrainingError as e:
+        logger.error(f"Leaderboard failed: {e}")
+        return 1
+
+    output = json.dumps(leaderboard, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        logger.info(f"Leaderboard written to {args.output}")
+    else:
+        print(output)
+
+    return 0 if leaderboard["entries"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
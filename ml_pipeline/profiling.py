@@ -0,0 +1,111 @@
+"""
+Profiling - Per-phase wall time, CPU time and peak RSS for training runs.
+
+``PhaseProfiler.phase`` wraps a block and records its cost under a name;
+repeated phases accumulate and phases must not be nested. Peak RSS is per
+phase on Linux, where the kernel's high-water mark is reset through
+/proc/self/clear_refs before each phase; elsewhere it falls back to the
+process-lifetime peak.
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+PROC_STATUS = "/proc/self/status"
+PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter; False if unsupported."""
+    try:
+        with open(PROC_CLEAR_REFS, "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size of this process in MB.
+
+    Returns:
+        VmHWM on Linux (since the last reset), else the lifetime peak from
+        getrusage, or None if neither is available
+    """
+    try:
+        with open(PROC_STATUS, "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class PhaseProfiler:
+    """Accumulates wall time, CPU time and peak RSS per named phase."""
+
+    def __init__(self):
+        """Initialize an empty profile."""
+        self.phases: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measure a block under ``name``.
+
+        Args:
+            name: Phase name, e.g. 'load', 'fit'
+        """
+        _reset_peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak = peak_rss_mb()
+
+            entry = self.phases.setdefault(
+                name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_mb": None, "calls": 0}
+            )
+            entry["wall_seconds"] += wall
+            entry["cpu_seconds"] += cpu
+            entry["calls"] += 1
+            if peak is not None:
+                entry["peak_rss_mb"] = max(entry["peak_rss_mb"] or 0.0, peak)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        JSON-serializable profile.
+
+        Returns:
+            Mapping of phase name to wall_seconds, cpu_seconds, peak_rss_mb
+            and calls, in the order the phases first ran
+        """
+        return {
+            name: {
+                "wall_seconds": round(entry["wall_seconds"], 4),
+                "cpu_seconds": round(entry["cpu_seconds"], 4),
+                "peak_rss_mb": round(entry["peak_rss_mb"], 1) if entry["peak_rss_mb"] is not None else None,
+                "calls": entry["calls"],
+            }
+            for name, entry in self.phases.items()
+        }
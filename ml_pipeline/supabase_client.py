@@ -3,8 +3,9 @@ Supabase client for ML Pipeline
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
+import httpx
 from supabase import create_client
 
 from .config import SUPABASE_SERVICE_KEY, SUPABASE_URL
@@ -62,6 +63,61 @@ def download_file_from_storage(bucket: str, path: str, local_path: str) -> str:
         raise
 
 
+def get_file_info(bucket: str, path: str) -> dict:
+    """
+    Get metadata of a file in Supabase Storage
+    
+    Args:
+        bucket: Storage bucket name
+        path: Path to file in bucket
+        
+    Returns:
+        Dictionary with etag, size and last_modified (None when unknown)
+    """
+    client = get_supabase_client()
+    
+    try:
+        info = client.storage.from_(bucket).info(path)
+    except Exception as e:
+        logger.error(f"Failed to get info for {path} in {bucket}: {str(e)}")
+        raise
+    
+    metadata = info.get("metadata") or {}
+    return {
+        "etag": info.get("etag") or metadata.get("eTag"),
+        "size": info.get("size", metadata.get("size")),
+        "last_modified": info.get("last_modified") or metadata.get("lastModified"),
+    }
+
+
+def download_file_range(bucket: str, path: str, start: int) -> Tuple[bytes, bool]:
+    """
+    Download a file from Supabase Storage starting at a byte offset
+    
+    Args:
+        bucket: Storage bucket name
+        path: Path to file in bucket
+        start: First byte to download
+        
+    Returns:
+        Tuple of (content, partial); partial is False when the server ignored
+        the range and returned the whole file
+    """
+    client = get_supabase_client()
+    
+    try:
+        signed = client.storage.from_(bucket).create_signed_url(path, 60)
+        url = signed.get("signedURL") or signed.get("signedUrl")
+        response = httpx.get(url, headers={"Range": f"bytes={start}-"}, timeout=60)
+        response.raise_for_status()
+        
+        logger.info(f"Downloaded {len(response.content)} bytes of {path} from {bucket} (offset {start})")
+        return response.content, response.status_code == 206
+    except Exception as e:
+        logger.error(f"Failed to download {path} from {bucket} at offset {start}: {str(e)}")
+        raise
+
+
 def upload_file_to_storage(bucket: str, path: str, file_path: str) -> str:
     """
     Upload file to Supabase Storage
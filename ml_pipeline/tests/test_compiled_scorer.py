@@ -0,0 +1,121 @@
+"""Unit tests for compiled_scorer module"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from ml_pipeline.compiled_scorer import ScorerError, load_scorer
+from ml_pipeline.model_artifact import save_artifact
+
+
+class TestCompiledScorer(unittest.TestCase):
+    """Tests for NumPy-only scoring of exported models"""
+
+    def setUp(self):
+        """Build a three-class dataset on very different feature scales"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        rng = np.random.default_rng(6)
+        self.y = rng.choice(["home_win", "draw", "away_win"], 400)
+        shift = pd.Series(self.y).map({"home_win": 1.0, "draw": 0.0, "away_win": -1.0}).to_numpy()
+        self.X = pd.DataFrame({
+            "form": rng.normal(size=400) + shift,
+            "possession": rng.normal(50, 8, size=400) + 5 * shift,
+            "odds": rng.normal(size=400),
+        })
+        self.config = {"input_features": ["form", "possession", "odds"]}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _export(self, model, X, y):
+        model.fit(X, y)
+        return load_scorer(save_artifact(model, str(self.root / "m.artifact"), config=self.config))
+
+    def test_matches_sklearn(self):
+        """Test predictions and probabilities equal the estimators'"""
+        binary = np.where(self.y == "home_win", "home_win", "not_home")
+        cases = [
+            (LogisticRegression(max_iter=500), self.y),
+            (LogisticRegression(max_iter=500), binary),
+            (Pipeline([("scaler", StandardScaler()), ("model", LogisticRegression())]), self.y),
+            (SGDClassifier(loss="log_loss", random_state=0), self.y),
+            (SGDClassifier(loss="modified_huber", random_state=0), binary),
+            (DecisionTreeClassifier(max_depth=6, random_state=0), self.y),
+        ]
+        for model, y in cases:
+            with self.subTest(model=type(model).__name__, classes=len(set(y))):
+                scorer = self._export(model, self.X, y)
+                np.testing.assert_array_equal(scorer.predict(self.X), model.predict(self.X))
+                np.testing.assert_allclose(scorer.predict_proba(self.X), model.predict_proba(self.X), atol=1e-12)
+
+    def test_float32_models(self):
+        """Test models fitted on float32 features are scored in float32"""
+        X = self.X.astype(np.float32)
+        model = Pipeline([("scaler", StandardScaler()), ("model", LogisticRegression())])
+        scorer = self._export(model, X, self.y)
+
+        self.assertEqual(scorer.artifact.arrays["coef"].dtype, np.float32)
+        scorer.verify(model, X)
+
+    def test_tree_routes_missing_values(self):
+        """Test NaN inputs follow the tree's learned missing-value direction"""
+        X = self.X.copy()
+        X.loc[::7, "form"] = np.nan
+        model = DecisionTreeClassifier(max_depth=5, random_state=0)
+        scorer = self._export(model, X, self.y)
+
+        scorer.verify(model, X)
+
+    def test_accepts_feature_dicts(self):
+        """Test a single feature dict is scored in the artifact's feature order"""
+        model = LogisticRegression(max_iter=500)
+        scorer = self._export(model, self.X, self.y)
+        row = self.X.iloc[0].to_dict()
+
+        np.testing.assert_allclose(scorer.predict_proba(row), model.predict_proba(self.X.iloc[:1]))
+        with self.assertRaises(ScorerError):
+            scorer.predict({"form": 1.0})
+
+    def test_hinge_loss_has_no_probabilities(self):
+        """Test models without predict_proba still predict labels"""
+        model = SGDClassifier(random_state=0)
+        scorer = self._export(model, self.X, self.y)
+
+        np.testing.assert_array_equal(scorer.predict(self.X), model.predict(self.X))
+        with self.assertRaises(ScorerError):
+            scorer.predict_proba(self.X)
+
+    def test_verify_rejects_a_different_model(self):
+        """Test verification fails when the scorer does not match the estimator"""
+        scorer = self._export(DecisionTreeClassifier(max_depth=1, random_state=0), self.X, self.y)
+        other = DecisionTreeClassifier(max_depth=6, random_state=0).fit(self.X, self.y)
+
+        with self.assertRaises(ScorerError):
+            scorer.verify(other, self.X)
+
+    def test_import_does_not_load_sklearn(self):
+        """Test the scorer loads without scikit-learn, pyarrow or the ensemble code"""
+        path = save_artifact(
+            LogisticRegression(max_iter=500).fit(self.X, self.y), str(self.root / "m.artifact")
+        )
+        code = (
+            "import sys; from ml_pipeline.compiled_scorer import load_scorer; "
+            f"load_scorer({path!r}).predict_proba([[0.0, 50.0, 0.0]]); "
+            "assert not any(name.startswith(('sklearn', 'pyarrow')) for name in sys.modules); "
+            "assert 'ml_pipeline.ensemble_predictor' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).parents[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 """Unit tests for data_loader module"""
 
+import hashlib
+import tempfile
 import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -7,10 +9,18 @@ from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
+from ml_pipeline import data_loader
 from ml_pipeline.data_loader import (
+    SYNC_OVERLAP_BYTES,
     create_finetuning_dataset,
+    export_csv_log,
     filter_errors_for_retraining,
     generate_dataset_filename,
+    iter_evaluation_log,
+    read_log_partitions,
+    stream_retraining_data,
+    sync_evaluation_log,
+    update_log_partitions,
 )
 
 
@@ -121,5 +131,255 @@ class TestDataLoader(unittest.TestCase):
         self.assertIn("_", filename)  # Should have timestamp separator
 
 
+class TestSyncEvaluationLog(unittest.TestCase):
+    """Tests for the incremental evaluation log sync"""
+
+    def setUp(self):
+        """Fake a remote log and patch the Storage helpers"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.temp_dir.name)
+        self.remote = {"content": b"match_id,confidence\n" + b"".join(b"%d,0.5\n" % i for i in range(2000)), "etag": "v1"}
+        self.downloads = []
+
+        def info(bucket, path):
+            return {"etag": self.remote["etag"], "size": len(self.remote["content"]), "last_modified": None}
+
+        def download(bucket, path, local_path):
+            self.downloads.append(("full", 0))
+            Path(local_path).write_bytes(self.remote["content"])
+            return local_path
+
+        def download_range(bucket, path, start):
+            self.downloads.append(("range", start))
+            return self.remote["content"][start:], True
+
+        patchers = [
+            patch("ml_pipeline.data_loader.get_file_info", side_effect=info),
+            patch("ml_pipeline.data_loader.download_file_from_storage", side_effect=download),
+            patch("ml_pipeline.data_loader.download_file_range", side_effect=download_range),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _sync(self):
+        path, state = sync_evaluation_log(self.cache_dir)
+        self.assertEqual(path.read_bytes(), self.remote["content"])
+        return state
+
+    def test_first_sync_downloads_and_unchanged_skips(self):
+        """Test the log is downloaded once and not again while the ETag matches"""
+        first = self._sync()
+        second = self._sync()
+
+        self.assertEqual(first["mode"], "full")
+        self.assertEqual(first["sha256"], hashlib.sha256(self.remote["content"]).hexdigest())
+        self.assertEqual(second["mode"], "unchanged")
+        self.assertEqual(second["bytes_transferred"], 0)
+        self.assertEqual(self.downloads, [("full", 0)])
+
+    def test_appended_log_fetches_only_the_tail(self):
+        """Test an append-only change transfers the new rows plus the overlap"""
+        self._sync()
+        old_size = len(self.remote["content"])
+        tail = b"2000,0.9\n2001,0.8\n"
+        self.remote.update(content=self.remote["content"] + tail, etag="v2")
+
+        state = self._sync()
+
+        self.assertEqual(state["mode"], "append")
+        self.assertEqual(state["bytes_transferred"], SYNC_OVERLAP_BYTES + len(tail))
+        self.assertEqual(self.downloads[-1], ("range", old_size - SYNC_OVERLAP_BYTES))
+        self.assertEqual(state["sha256"], hashlib.sha256(self.remote["content"]).hexdigest())
+
+    def test_rewritten_log_is_downloaded_again(self):
+        """Test a log whose existing bytes changed falls back to a full download"""
+        self._sync()
+        self.remote.update(content=self.remote["content"].replace(b"1999,0.5", b"1999,0.7") + b"2000,0.9\n", etag="v2")
+
+        state = self._sync()
+
+        self.assertEqual(state["mode"], "full")
+        self.assertEqual([kind for kind, _ in self.downloads], ["full", "range", "full"])
+
+    def test_interrupted_sync_is_repaired(self):
+        """Test a cached copy that does not match its sync state is replaced"""
+        self._sync()
+        with open(self.cache_dir / "evaluation_log.csv", "ab") as f:
+            f.write(b"partial")
+
+        self.assertEqual(self._sync()["mode"], "full")
+
+
+@unittest.skipIf(data_loader.pq is None, "pyarrow not installed")
+class TestLogPartitions(unittest.TestCase):
+    """Tests for the date-partitioned evaluation log"""
+
+    def setUp(self):
+        """Write a 60-day CSV log"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.csv_path = root / "evaluation_log.csv"
+        self.partitions = root / "partitions"
+        today = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+        rows = 240
+        self.log = pd.DataFrame({
+            "match_id": range(rows),
+            "match_date": [(today - timedelta(days=59 - i // 4)).isoformat() for i in range(rows)],
+            "predicted_outcome": ["home_win", "draw"] * (rows // 2),
+            "actual_outcome": ["home_win", "draw", "draw", "away_win"] * (rows // 4),
+            "confidence": [0.65, 0.75, 0.85, 0.95] * (rows // 4),
+        })
+        self.log.loc[0, "match_date"] = "not a date"
+        self.log.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_window_reads_only_recent_partitions(self):
+        """Test a lookback read opens only partitions inside the window"""
+        state = update_log_partitions(self.csv_path, self.partitions)
+        self.assertEqual(state["mode"], "rebuild")
+        self.assertEqual(state["rows"], len(self.log))
+        self.assertEqual(len(state["partitions"]), 61)
+
+        with patch.object(data_loader.pq, "read_table", wraps=data_loader.pq.read_table) as read_table:
+            recent = read_log_partitions(self.partitions, lookback_days=7)
+        self.assertEqual(read_table.call_count, 8)
+        self.assertEqual(len(recent), 32)
+
+        expected = filter_errors_for_retraining(pd.read_csv(self.csv_path), lookback_days=7)
+        actual = filter_errors_for_retraining(recent, lookback_days=7)
+        self.assertEqual(sorted(actual["match_id"]), sorted(expected["match_id"]))
+        self.assertEqual(len(read_log_partitions(self.partitions)), len(self.log))
+
+    def test_appended_rows_are_partitioned_incrementally(self):
+        """Test an append adds part files without rebuilding old partitions"""
+        update_log_partitions(self.csv_path, self.partitions)
+        old_part = next(self.partitions.glob("match_date=*/part-00000.parquet"))
+        modified = old_part.stat().st_mtime_ns
+
+        new_rows = self.log.tail(2).assign(match_id=[1000, 1001])
+        new_rows.to_csv(self.csv_path, mode="a", header=False, index=False)
+        state = update_log_partitions(self.csv_path, self.partitions)
+
+        self.assertEqual(state["mode"], "append")
+        self.assertEqual(state["rows"], len(self.log) + 2)
+        self.assertEqual(old_part.stat().st_mtime_ns, modified)
+        self.assertIn(1001, set(read_log_partitions(self.partitions, lookback_days=1)["match_id"]))
+        self.assertEqual(update_log_partitions(self.csv_path, self.partitions)["mode"], "unchanged")
+
+    def test_rewritten_log_rebuilds(self):
+        """Test changed history rebuilds the partitions"""
+        update_log_partitions(self.csv_path, self.partitions)
+        self.log.iloc[1:].to_csv(self.csv_path, index=False)
+
+        state = update_log_partitions(self.csv_path, self.partitions)
+
+        self.assertEqual(state["mode"], "rebuild")
+        self.assertEqual(len(read_log_partitions(self.partitions)), len(self.log) - 1)
+        self.assertNotIn("unknown", state["partitions"])
+
+    def test_iter_evaluation_log_reads_window_in_chunks(self):
+        """Test the synced log is streamed from the window's partitions"""
+        with patch("ml_pipeline.data_loader.sync_evaluation_log", return_value=(self.csv_path, {})), \
+                patch("ml_pipeline.data_loader.EVALUATION_LOG_PARTITIONS_DIR", self.partitions):
+            chunks = list(iter_evaluation_log(lookback_days=7, chunk_size=3))
+
+        self.assertTrue(all(len(chunk) <= 3 for chunk in chunks))
+        self.assertEqual(sum(len(chunk) for chunk in chunks), 32)
+
+    def test_csv_export_round_trip(self):
+        """Test the partitions export back to an equivalent CSV"""
+        update_log_partitions(self.csv_path, self.partitions)
+        exported = self.csv_path.with_name("exported.csv")
+
+        rows = export_csv_log(self.partitions, exported)
+
+        self.assertEqual(rows, len(self.log))
+        result = pd.read_csv(exported).sort_values("match_id", ignore_index=True)
+        pd.testing.assert_series_equal(result["confidence"], self.log["confidence"])
+        self.assertEqual(
+            list(pd.to_datetime(result["match_date"])[1:]),
+            list(pd.to_datetime(self.log["match_date"][1:])),
+        )
+
+
+class TestStreamRetrainingData(unittest.TestCase):
+    """Tests for the chunked error filter"""
+
+    def setUp(self):
+        """Build a log and serve it in small chunks"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        now = datetime.now()
+        rows = 100
+        self.log = pd.DataFrame({
+            "match_id": range(rows),
+            "match_date": [(now - timedelta(days=i % 14, hours=1)).isoformat() for i in range(rows)],
+            "predicted_outcome": ["home_win", "draw", "away_win", "home_win", "draw"] * (rows // 5),
+            "actual_outcome": ["draw"] * rows,
+            "confidence": [0.6, 0.75, 0.9, 0.95] * (rows // 4),
+        })
+        self.chunk_sizes = []
+
+        def chunks(lookback_days, chunk_size):
+            for start in range(0, len(self.log), chunk_size):
+                chunk = self.log.iloc[start:start + chunk_size].copy()
+                self.chunk_sizes.append(len(chunk))
+                yield chunk
+
+        patchers = [
+            patch("ml_pipeline.data_loader.iter_evaluation_log", side_effect=chunks),
+            patch("ml_pipeline.data_loader.TEMP_DIR", self.root),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_matches_in_memory_filter(self):
+        """Test the streamed dataset holds the same rows as the in-memory filter"""
+        path, count = stream_retraining_data(lookback_days=7, chunk_size=16)
+
+        expected = filter_errors_for_retraining(self.log.copy(), lookback_days=7)
+        self.assertEqual(count, len(expected))
+        streamed = pd.read_csv(path)
+        self.assertEqual(list(streamed["match_id"]), list(expected["match_id"]))
+        self.assertEqual(list(streamed.columns), list(self.log.columns))
+        self.assertLessEqual(max(self.chunk_sizes), 16)
+        self.assertEqual(len(self.chunk_sizes), 7)
+
+    def test_too_few_errors_leave_no_file(self):
+        """Test the count is reported and nothing is kept below the minimum"""
+        path, count = stream_retraining_data(lookback_days=7, chunk_size=16, min_errors=1000)
+
+        self.assertIsNone(path)
+        self.assertGreater(count, 0)
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_changed_columns_fail(self):
+        """Test a chunk with columns the header lacks fails instead of being truncated"""
+        self.log["league"] = None
+        self.log.loc[50:, "league"] = "PL"
+        first, rest = self.log.iloc[:50].drop(columns=["league"]), self.log.iloc[50:]
+
+        with patch("ml_pipeline.data_loader.iter_evaluation_log", return_value=iter([first, rest])):
+            self.assertEqual(stream_retraining_data(chunk_size=50), (None, 0))
+        self.assertEqual(list(self.root.iterdir()), [])
+
+    def test_missing_columns(self):
+        """Test a log without the outcome columns yields no dataset"""
+        self.log = self.log.drop(columns=["actual_outcome"])
+
+        self.assertEqual(stream_retraining_data(chunk_size=16), (None, 0))
+        self.assertEqual(list(self.root.iterdir()), [])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,119 @@
+"""Unit tests for dataset_cache module"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from ml_pipeline.dataset_cache import DatasetCache
+from ml_pipeline.train_model import ModelTrainer
+
+
+class TestDatasetCache(unittest.TestCase):
+    """Tests for DatasetCache"""
+
+    def setUp(self):
+        """Write a small dataset to a temp directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.dataset = str(root / "train.csv")
+        pd.DataFrame({
+            "feature1": [0.1, 0.5, np.nan, 0.9],
+            "league": ["PL", None, "PL", "LaLiga"],
+            "target": ["home_win", "draw", "away_win", "home_win"],
+        }).to_csv(self.dataset, index=False)
+        self.cache = DatasetCache(str(root / "cache"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip_matches_csv(self):
+        """Test cached columns load back equal to the parsed CSV"""
+        df = pd.read_csv(self.dataset)
+        X, y = df[["feature1", "league"]], df["target"]
+        key = self.cache.key(self.dataset, ["feature1", "league"], "target")
+
+        self.assertIsNone(self.cache.load(key))
+        self.cache.store(key, X, y, self.dataset)
+        cached_X, cached_y = self.cache.load(key)
+
+        pd.testing.assert_frame_equal(cached_X, X, check_dtype=False)
+        pd.testing.assert_series_equal(cached_y, y, check_dtype=False)
+        self.assertTrue(pd.isna(cached_X["league"][1]))
+
+    def test_numeric_columns_stay_memory_mapped(self):
+        """Test loading wraps numeric columns without copying them"""
+        df = pd.read_csv(self.dataset)
+        key = self.cache.key(self.dataset, ["feature1", "league"], "target")
+        self.cache.store(key, df[["feature1", "league"]], df["target"], self.dataset)
+
+        cached_X, _ = self.cache.load(key)
+        values = cached_X["feature1"].to_numpy()
+        while values is not None and not isinstance(values, np.memmap):
+            values = values.base
+        self.assertIsInstance(values, np.memmap)
+
+    def test_key_changes_with_contents_and_selection(self):
+        """Test the key depends on file contents and the column selection"""
+        key = self.cache.key(self.dataset, ["feature1"], "target")
+
+        self.assertNotEqual(key, self.cache.key(self.dataset, ["feature1", "league"], "target"))
+
+        with open(self.dataset, "a") as f:
+            f.write("0.3,PL,draw\n")
+        self.assertNotEqual(key, self.cache.key(self.dataset, ["feature1"], "target"))
+
+    def test_digest_is_memoized_by_mtime(self):
+        """Test an unchanged file is not re-hashed"""
+        digest = self.cache.file_digest(self.dataset)
+
+        with patch("ml_pipeline.dataset_cache.hashlib.sha256") as mock_sha:
+            self.assertEqual(self.cache.file_digest(self.dataset), digest)
+            mock_sha.assert_not_called()
+
+        stat = os.stat(self.dataset)
+        os.utime(self.dataset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(self.cache.file_digest(self.dataset), digest)
+
+    def test_load_data_hit_skips_parsing(self):
+        """Test a second load_data call is served from the cache"""
+        trainer = ModelTrainer()
+        trainer.cache = self.cache
+        trainer.config = {"input_features": ["feature1", "league"], "target_column": "target"}
+
+        X, y = trainer.load_data(self.dataset)
+        with patch("ml_pipeline.train_model.pd.read_csv") as mock_read:
+            cached_X, cached_y = trainer.load_data(self.dataset)
+            mock_read.assert_not_called()
+
+        pd.testing.assert_frame_equal(cached_X, X, check_dtype=False)
+        pd.testing.assert_series_equal(cached_y, y, check_dtype=False)
+
+    def test_folds_are_computed_once_per_dataset(self):
+        """Test fold indices are cached and shared across feature selections"""
+        trainer = ModelTrainer()
+        trainer.cache = self.cache
+        trainer.config = {"target_column": "target"}
+        y = pd.Series(["home_win", "draw"] * 6)
+
+        folds = trainer.load_folds(self.dataset, y, 3)
+        with patch.object(ModelTrainer, "make_folds") as mock_make:
+            cached = trainer.load_folds(self.dataset, y, 3)
+            mock_make.assert_not_called()
+
+        self.assertEqual(len(cached), 3)
+        for (train, test), (cached_train, cached_test) in zip(folds, cached):
+            np.testing.assert_array_equal(train, cached_train)
+            np.testing.assert_array_equal(test, cached_test)
+        self.assertNotEqual(
+            self.cache.fold_key(self.dataset, "target", "stratified", 3, 42),
+            self.cache.fold_key(self.dataset, "target", "timeseries", 3, 42),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
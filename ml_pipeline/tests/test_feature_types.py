@@ -0,0 +1,143 @@
+"""Unit tests for feature_types module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ml_pipeline.feature_types import FeatureTypeError, cast_features, encode_target
+from ml_pipeline.train_model import ModelTrainer, TrainingError
+
+
+class TestFeatureTypes(unittest.TestCase):
+    """Tests for declared and automatic feature dtypes"""
+
+    def setUp(self):
+        """Build columns with known float32 behaviour"""
+        self.X = pd.DataFrame({
+            "goals": [0.0, 1.0, 2.0, 3.0],
+            "odds": [1.1, 2.35, 3.8, 12.0],
+            "league_id": [1, 4, 7, 120],
+            "league": ["PL", "PL", "LaLiga", "SerieA"],
+        })
+
+    def test_auto_casts_floats_and_reports_loss(self):
+        """Test float columns become float32 with their rounding error recorded"""
+        X, report = cast_features(self.X)
+
+        self.assertEqual(X["goals"].dtype, np.float32)
+        self.assertEqual(X["odds"].dtype, np.float32)
+        self.assertTrue(report["goals"]["lossless"])
+        self.assertFalse(report["odds"]["lossless"])
+        self.assertGreater(report["odds"]["max_rel_error"], 0.0)
+        self.assertLess(report["odds"]["max_rel_error"], 1e-7)
+        self.assertEqual(report["odds"]["to"], "float32")
+
+    def test_auto_downcasts_integers_and_keeps_labels(self):
+        """Test integer columns shrink and non-numeric columns are untouched"""
+        X, report = cast_features(self.X)
+
+        self.assertEqual(X["league_id"].dtype, np.int8)
+        self.assertEqual(X["league"].dtype, self.X["league"].dtype)
+        self.assertEqual(report["league_id"], {"from": "int64", "declared": False, "to": "int8"})
+
+    def test_declared_dtypes_are_validated(self):
+        """Test declared dtypes are applied and impossible casts raise"""
+        X, _ = cast_features(self.X, {"goals": "int16", "league": "category", "odds": "float64"})
+        self.assertEqual(X["goals"].dtype, np.int16)
+        self.assertIsInstance(X["league"].dtype, pd.CategoricalDtype)
+        self.assertEqual(X["odds"].dtype, np.float64)
+
+        for declared in ({"odds": "int32"}, {"league_id": "int8", "goals": "uint8"}, {"league": "float32"}):
+            with self.subTest(declared=declared), self.assertRaises(FeatureTypeError):
+                cast_features(self.X, declared)
+        with self.assertRaises(FeatureTypeError):
+            cast_features(self.X.assign(league_id=[1, 2, 3, 300]), {"league_id": "int8"})
+
+    def test_float32_overflow(self):
+        """Test out-of-range values stay float64 under auto and raise when declared"""
+        X = pd.DataFrame({"volume": [1.0, 1e39]})
+
+        typed, report = cast_features(X)
+        self.assertEqual(typed["volume"].dtype, np.float64)
+        self.assertTrue(report["volume"]["overflow"])
+
+        with self.assertRaises(FeatureTypeError):
+            cast_features(X, {"volume": "float32"})
+
+    def test_tolerance_keeps_lossy_columns_wide(self):
+        """Test auto keeps float64 when the rounding error exceeds the tolerance"""
+        typed, report = cast_features(self.X, tolerance=0.0)
+
+        self.assertEqual(typed["odds"].dtype, np.float64)
+        self.assertEqual(typed["goals"].dtype, np.float32)
+        self.assertEqual(report["odds"]["to"], "float64")
+
+    def test_encode_target(self):
+        """Test the target is stored as sorted categorical codes"""
+        y = encode_target(pd.Series(["home_win", "draw", "away_win", "draw"]))
+
+        self.assertEqual(list(y.cat.categories), ["away_win", "draw", "home_win"])
+        self.assertEqual(y.cat.codes.dtype, np.int8)
+        self.assertEqual(list(encode_target(y.astype(object), "object")), list(y))
+        with self.assertRaises(FeatureTypeError):
+            encode_target(y, "int8")
+
+
+class TestLoadDataDtypes(unittest.TestCase):
+    """Tests for dtypes applied by ModelTrainer.load_data"""
+
+    def setUp(self):
+        """Write a dataset and a config declaring feature dtypes"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        self.dataset = str(root / "train.csv")
+        rng = np.random.default_rng(3)
+        pd.DataFrame({
+            "form": rng.normal(size=5000).round(2),
+            "league_id": rng.integers(1, 40, 5000),
+            "target": rng.choice(["home_win", "draw", "away_win"], 5000),
+        }).to_csv(self.dataset, index=False)
+        self.config = {
+            "model_type": "LogisticRegression",
+            "input_features": ["form", "league_id"],
+            "target_column": "target",
+            "feature_dtypes": {"league_id": "int16"},
+        }
+        self.config_path = root / "config.yaml"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _trainer(self, **overrides):
+        self.config_path.write_text(yaml.safe_dump({**self.config, **overrides}))
+        trainer = ModelTrainer(str(self.config_path), use_cache=False)
+        trainer.load_config()
+        return trainer
+
+    def test_load_data_applies_dtypes(self):
+        """Test features and target come back typed, with a report"""
+        trainer = self._trainer()
+        X, y = trainer.load_data(self.dataset)
+
+        self.assertEqual(X["form"].dtype, np.float32)
+        self.assertEqual(X["league_id"].dtype, np.int16)
+        self.assertIsInstance(y.dtype, pd.CategoricalDtype)
+        self.assertEqual(trainer.dtype_report["target"], "category")
+        self.assertTrue(trainer.dtype_report["features"]["league_id"]["declared"])
+        memory = trainer.dtype_report["memory_mb"]
+        self.assertLess(memory["after"], memory["before"])
+
+    def test_load_data_rejects_invalid_dtypes(self):
+        """Test a failed cast surfaces as a TrainingError"""
+        trainer = self._trainer(feature_dtypes={"form": "int32"})
+
+        with self.assertRaises(TrainingError):
+            trainer.load_data(self.dataset)
+
+
+if __name__ == "__main__":
+    unittest.main()
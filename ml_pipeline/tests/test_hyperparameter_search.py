@@ -0,0 +1,96 @@
+"""Unit tests for hyperparameter_search module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ml_pipeline.hyperparameter_search import plan_rungs, sample_candidates, successive_halving
+from ml_pipeline.train_model import TrainingError
+
+
+class TestHyperparameterSearch(unittest.TestCase):
+    """Tests for successive halving search"""
+
+    def setUp(self):
+        """Write a dataset and a config with a search space"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        rng = np.random.default_rng(3)
+        signal = rng.random(240)
+        pd.DataFrame({
+            "signal": signal,
+            "noise": rng.random(240),
+            "target": np.where(signal > 0.5, "home_win", "away_win"),
+        }).to_csv(self.root / "train.csv", index=False)
+
+        self.config = str(self.root / "tree.yaml")
+        with open(self.config, "w") as f:
+            yaml.safe_dump({
+                "model_type": "DecisionTree",
+                "target_column": "target",
+                "input_features": ["signal", "noise"],
+                "hyperparameters": {"random_state": 0},
+                "search_space": {
+                    "max_depth": {"type": "int", "low": 1, "high": 8},
+                    "min_samples_split": {"type": "int", "low": 2, "high": 10},
+                    "criterion": ["gini", "entropy"],
+                },
+            }, f)
+
+        self.kwargs = {
+            "dataset": str(self.root / "train.csv"),
+            "config": self.config,
+            "n_candidates": 9,
+            "use_cache": False,
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_sample_candidates_is_deterministic(self):
+        """Test the same seed draws the same candidates within bounds"""
+        space = {"C": {"type": "loguniform", "low": 0.01, "high": 10}, "penalty": ["l2", None]}
+        first = sample_candidates(space, 5, random_seed=1)
+
+        self.assertEqual(first, sample_candidates(space, 5, random_seed=1))
+        self.assertNotEqual(first, sample_candidates(space, 5, random_seed=2))
+        self.assertTrue(all(0.01 <= params["C"] <= 10 for params in first))
+
+        with self.assertRaises(TrainingError):
+            sample_candidates({"C": {"type": "normal"}}, 1)
+
+    def test_plan_rungs_halves_candidates(self):
+        """Test each rung keeps 1/eta of the candidates on eta times the rows"""
+        self.assertEqual(plan_rungs(27, eta=3, min_fraction=1 / 9), [(27, 1 / 9), (9, 1 / 3), (3, 1.0)])
+        self.assertEqual(plan_rungs(1), [(1, 1.0)])
+
+    def test_search_is_deterministic_across_workers(self):
+        """Test parallel and sequential searches pick the same winner"""
+        sequential = successive_halving(workers=1, output_config=str(self.root / "a.yaml"), **self.kwargs)
+        parallel = successive_halving(workers=2, output_config=str(self.root / "b.yaml"), **self.kwargs)
+
+        self.assertEqual(sequential["best"], parallel["best"])
+        self.assertEqual(sequential["fits"], 9 + 3 + 1)
+        self.assertEqual(sequential["rungs"][-1]["train_rows"], 192)
+
+        with open(self.root / "a.yaml") as f:
+            tuned = yaml.safe_load(f)
+        self.assertNotIn("search_space", tuned)
+        self.assertEqual(tuned["hyperparameters"], {"random_state": 0, **sequential["best"]["params"]})
+
+    def test_search_respects_fit_budget(self):
+        """Test the candidate count shrinks to fit max_fits"""
+        report = successive_halving(
+            workers=1, max_fits=8, output_config=str(self.root / "c.yaml"), **self.kwargs
+        )
+
+        self.assertLessEqual(report["fits"], 8)
+        self.assertTrue(Path(report["tuned_config"]).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Unit tests for model_artifact module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from ml_pipeline.model_artifact import (
+    ALIGNMENT,
+    ArtifactError,
+    convert_pickle,
+    load_artifact,
+    save_artifact,
+)
+
+
+class TestModelArtifact(unittest.TestCase):
+    """Tests for the memory-mappable model artifact format"""
+
+    def setUp(self):
+        """Fit small models on synthetic data"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        rng = np.random.default_rng(5)
+        self.X = rng.normal(size=(150, 3))
+        self.y = rng.choice(["home_win", "draw", "away_win"], 150)
+        self.config = {"model_type": "LogisticRegression", "input_features": ["a", "b", "c"]}
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_linear_pipeline_round_trip(self):
+        """Test coefficients and scaler statistics load back as mapped views"""
+        model = Pipeline([
+            ("scaler", StandardScaler()),
+            ("model", LogisticRegression(max_iter=200)),
+        ]).fit(self.X, self.y)
+        path = save_artifact(model, str(self.root / "m.artifact"), config=self.config, metrics={"accuracy": 0.5})
+
+        artifact = load_artifact(path, verify=True)
+
+        self.assertEqual(artifact.kind, "linear")
+        self.assertEqual(artifact.classes, list(model.classes_))
+        self.assertEqual(artifact.feature_order, ["a", "b", "c"])
+        self.assertEqual(artifact.metadata["metrics"], {"accuracy": 0.5})
+        np.testing.assert_array_equal(artifact.arrays["coef"], model[-1].coef_)
+        np.testing.assert_array_equal(artifact.arrays["scaler0_mean"], model[0].mean_)
+        for array in artifact.arrays.values():
+            self.assertFalse(array.flags.writeable)
+            self.assertEqual(array.ctypes.data % ALIGNMENT, 0)
+
+    def test_tree_round_trip(self):
+        """Test flattened tree arrays are stored"""
+        model = DecisionTreeClassifier(max_depth=4, random_state=0).fit(self.X, self.y)
+        artifact = load_artifact(save_artifact(model, str(self.root / "t.artifact")))
+
+        self.assertEqual(artifact.kind, "tree")
+        np.testing.assert_array_equal(artifact.arrays["children_left"], model.tree_.children_left)
+        np.testing.assert_array_equal(artifact.arrays["threshold"], model.tree_.threshold)
+        self.assertEqual(artifact.arrays["value"].shape, (model.tree_.node_count, 3))
+
+    def test_verify_detects_corruption(self):
+        """Test a modified payload fails hash verification"""
+        model = LogisticRegression(max_iter=200).fit(self.X, self.y)
+        path = save_artifact(model, str(self.root / "m.artifact"))
+        with open(path, "r+b") as f:
+            f.seek(-1, 2)
+            last = f.read(1)
+            f.seek(-1, 2)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+        load_artifact(path)
+        with self.assertRaises(ArtifactError):
+            load_artifact(path, verify=True)
+
+    def test_unsupported_models_raise(self):
+        """Test models without a numeric representation are rejected"""
+        model = Pipeline([
+            ("votes", FunctionTransformer()),
+            ("meta", LogisticRegression(max_iter=200)),
+        ]).fit(self.X, self.y)
+
+        with self.assertRaises(ArtifactError):
+            save_artifact(model, str(self.root / "s.artifact"))
+        with self.assertRaises(ArtifactError):
+            load_artifact(__file__)
+
+    def test_convert_pickle(self):
+        """Test an existing .pkl is converted next to itself"""
+        model = DecisionTreeClassifier(max_depth=3, random_state=0).fit(self.X, self.y)
+        pkl_path = self.root / "DecisionTree_20250101_000000.pkl"
+        joblib.dump(model, pkl_path)
+
+        path = convert_pickle(str(pkl_path))
+
+        self.assertEqual(path, str(pkl_path.with_suffix(".artifact")))
+        self.assertEqual(load_artifact(path).metadata["source"], str(pkl_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
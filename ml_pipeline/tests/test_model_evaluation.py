@@ -0,0 +1,158 @@
+"""Unit tests for model_evaluation module"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import joblib
+import numpy as np
+import pandas as pd
+import yaml
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.tree import DecisionTreeClassifier
+
+from ml_pipeline.model_artifact import save_artifact
+from ml_pipeline.model_evaluation import (
+    agreement_matrix,
+    confidence_distribution,
+    evaluate_registry,
+    load_registry,
+    write_registry,
+)
+from ml_pipeline.train_model import TrainingError
+
+
+@patch("ml_pipeline.model_evaluation.insert_system_log")
+class TestModelEvaluation(unittest.TestCase):
+    """Tests for champion/challenger scoring of registered models"""
+
+    def setUp(self):
+        """Fit models, a holdout and a registry in a temp project layout"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        (root / "models").mkdir()
+        rng = np.random.default_rng(8)
+
+        def frame(rows):
+            target = rng.choice(["home_win", "draw", "away_win"], rows)
+            shift = pd.Series(target).map({"home_win": 1.0, "draw": 0.0, "away_win": -1.0})
+            return pd.DataFrame({
+                "form": rng.normal(size=rows) + shift,
+                "odds": rng.normal(size=rows),
+                "target": target,
+            })
+
+        train = frame(300)
+        self.holdout = frame(200)
+        self.dataset = str(root / "holdout.csv")
+        self.holdout.to_csv(self.dataset, index=False)
+        self.config = str(root / "config.yaml")
+        with open(self.config, "w") as f:
+            yaml.safe_dump({"input_features": ["form", "odds"], "target_column": "target"}, f)
+
+        X, y = train[["form", "odds"]], train["target"]
+        self.models = {
+            "champion": LogisticRegression(max_iter=500).fit(X, y),
+            "challenger": DecisionTreeClassifier(max_depth=3, random_state=0).fit(X, y),
+        }
+        joblib.dump(self.models["champion"], root / "models" / "champion.pkl")
+        joblib.dump(self.models["challenger"], root / "models" / "challenger.pkl")
+        save_artifact(self.models["challenger"], str(root / "models" / "challenger.artifact"))
+
+        def entry(model_id, status, path):
+            return {
+                "id": model_id, "name": model_id, "status": status, "path": path,
+                "traffic_allocation": 0, "metrics": {"accuracy": 0.5, "precision": 0.5, "recall": 0.5, "f1_score": 0.5},
+            }
+
+        self.registry = str(root / "models" / "model_registry.json")
+        write_registry({"models": [
+            entry("champion", "active", "models/champion.pkl"),
+            entry("challenger", "candidate", "models/challenger.pkl"),
+            entry("missing", "shadow", "models/missing.pkl"),
+            entry("old", "retired", "models/old.pkl"),
+        ]}, self.registry)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _evaluate(self, workers=1):
+        result = evaluate_registry(self.dataset, self.config, self.registry, workers=workers)
+        return result, {entry["id"]: entry for entry in result["models"]}
+
+    def test_scores_every_selected_model(self, mock_log):
+        """Test metrics are computed on the holdout and written in registry form"""
+        result, models = self._evaluate()
+
+        X, y = self.holdout[["form", "odds"]], self.holdout["target"]
+        for model_id, model in self.models.items():
+            self.assertAlmostEqual(models[model_id]["metrics"]["accuracy"], accuracy_score(y, model.predict(X)))
+            self.assertEqual(models[model_id]["evaluation"]["previous_metrics"]["accuracy"], 0.5)
+            self.assertEqual(sum(models[model_id]["evaluation"]["confidence"]["histogram"]), len(X))
+
+        self.assertEqual(result["evaluation"]["champion"], "champion")
+        self.assertEqual(result["evaluation"]["evaluated"], 2)
+        self.assertEqual([failed["id"] for failed in result["evaluation"]["failed"]], ["missing"])
+        self.assertEqual(models["missing"]["evaluation"]["status"], "failed")
+        self.assertEqual(models["missing"]["metrics"]["accuracy"], 0.5)
+        self.assertNotIn("evaluation", models["old"])
+        mock_log.assert_called_once()
+
+    def test_agreement_and_champion_deltas(self, mock_log):
+        """Test pairwise agreement and challenger deltas against the active model"""
+        _, models = self._evaluate()
+
+        X = self.holdout[["form", "odds"]]
+        expected = np.mean(self.models["champion"].predict(X) == self.models["challenger"].predict(X))
+        self.assertAlmostEqual(models["champion"]["evaluation"]["agreement"]["challenger"], expected, places=6)
+        self.assertEqual(
+            models["champion"]["evaluation"]["agreement"], {"challenger": models["challenger"]["evaluation"]["agreement"]["champion"]}
+        )
+        self.assertNotIn("vs_champion", models["champion"]["evaluation"])
+        delta = models["challenger"]["evaluation"]["vs_champion"]["accuracy"]
+        self.assertAlmostEqual(
+            delta, models["challenger"]["metrics"]["accuracy"] - models["champion"]["metrics"]["accuracy"], places=6
+        )
+
+    def test_parallel_matches_sequential(self, mock_log):
+        """Test scoring in a process pool gives the same registry"""
+        sequential, _ = self._evaluate(workers=1)
+        parallel, _ = self._evaluate(workers=2)
+
+        for first, second in zip(sequential["models"], parallel["models"]):
+            self.assertEqual(first["metrics"], second["metrics"])
+            self.assertEqual(first.get("evaluation", {}).get("agreement"), second.get("evaluation", {}).get("agreement"))
+
+    def test_output_round_trips_as_registry(self, mock_log):
+        """Test the evaluated registry can be written back and reloaded"""
+        result, _ = self._evaluate()
+
+        write_registry(result, self.registry)
+
+        self.assertEqual(load_registry(self.registry), json.loads(json.dumps(result)))
+
+    def test_no_selected_models_raise(self, mock_log):
+        """Test an evaluation without matching statuses is rejected"""
+        with self.assertRaises(TrainingError):
+            evaluate_registry(self.dataset, self.config, self.registry, statuses=("archived",))
+
+    def test_summaries(self, mock_log):
+        """Test the confidence and agreement helpers"""
+        proba = np.array([[0.95, 0.05], [0.35, 0.65], [0.55, 0.45]])
+        confidence = confidence_distribution(proba, np.array([True, False, True]))
+
+        self.assertEqual(confidence["histogram"], [0, 0, 0, 0, 0, 1, 1, 0, 0, 1])
+        self.assertAlmostEqual(confidence["mean_correct"], 0.75)
+        self.assertAlmostEqual(confidence["mean_incorrect"], 0.65)
+
+        agreement = agreement_matrix({"a": np.array([1, 2, 3]), "b": np.array([1, 2, 0]), "c": np.array([0, 0, 0])})
+        self.assertAlmostEqual(agreement["a"]["b"], 2 / 3, places=6)
+        self.assertEqual(agreement["b"]["c"], agreement["c"]["b"])
+        self.assertNotIn("a", agreement["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,160 @@
+"""Unit tests for model_leaderboard module"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from ml_pipeline.model_leaderboard import build_leaderboard, collect_configs
+from ml_pipeline.train_model import ModelTrainer, TrainingError
+
+
+class TestModelLeaderboard(unittest.TestCase):
+    """Tests for parallel multi-config training"""
+
+    def setUp(self):
+        """Write a dataset and three configs to a temp directory"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        rng = np.random.default_rng(2)
+        signal = rng.random(200)
+        pd.DataFrame({
+            "signal": signal,
+            "noise": rng.random(200),
+            "target": np.where(signal > 0.5, "home_win", "away_win"),
+        }).to_csv(self.root / "train.csv", index=False)
+
+        self.config_dir = self.root / "configs"
+        self.config_dir.mkdir()
+        self._write_config("logistic", "LogisticRegression", ["signal", "noise"], {"max_iter": 200})
+        self._write_config("tree", "DecisionTree", ["signal"], {"max_depth": 3, "random_state": 0})
+        self._write_config("noise_only", "DecisionTree", ["noise"], {"max_depth": 1, "random_state": 0})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_config(self, name, model_type, features, hyperparameters):
+        with open(self.config_dir / f"{name}.yaml", "w") as f:
+            yaml.safe_dump({
+                "model_type": model_type,
+                "target_column": "target",
+                "input_features": features,
+                "hyperparameters": hyperparameters,
+            }, f)
+
+    def test_collect_configs_from_directory(self):
+        """Test configs are collected from a directory without duplicates"""
+        explicit = str((self.config_dir / "tree.yaml").resolve())
+        configs = collect_configs([explicit], str(self.config_dir))
+
+        self.assertEqual(len(configs), 3)
+        self.assertEqual(configs[0], explicit)
+
+        with self.assertRaises(TrainingError):
+            collect_configs([], str(self.root / "missing"))
+
+    @patch("ml_pipeline.model_leaderboard.insert_system_log")
+    def test_leaderboard_ranks_configs(self, mock_log):
+        """Test every config is trained on the shared split and ranked"""
+        configs = collect_configs(config_dir=str(self.config_dir))
+        leaderboard = build_leaderboard(
+            str(self.root / "train.csv"), configs, output_dir=str(self.root / "models"), workers=2
+        )
+
+        self.assertEqual([entry["rank"] for entry in leaderboard["entries"]], [1, 2, 3])
+        scores = [entry["metrics"]["accuracy"] for entry in leaderboard["entries"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertFalse(leaderboard["champion"].endswith("noise_only.yaml"))
+        self.assertEqual(leaderboard["rows"], 200)
+        self.assertEqual(leaderboard["test_rows"], 40)
+        for entry in leaderboard["entries"]:
+            self.assertTrue(Path(entry["model_path"]).exists())
+        json.dumps(leaderboard)
+
+    @patch("ml_pipeline.model_leaderboard.insert_system_log")
+    def test_parallel_matches_sequential(self, mock_log):
+        """Test the process pool produces the same metrics as one process"""
+        configs = collect_configs(config_dir=str(self.config_dir))
+        dataset = str(self.root / "train.csv")
+
+        parallel = build_leaderboard(dataset, configs, output_dir=str(self.root / "a"), workers=3)
+        sequential = build_leaderboard(dataset, configs, output_dir=str(self.root / "b"), workers=1)
+
+        self.assertEqual(
+            [(e["config"], e["metrics"]) for e in parallel["entries"]],
+            [(e["config"], e["metrics"]) for e in sequential["entries"]],
+        )
+
+    @patch("ml_pipeline.model_leaderboard.insert_system_log")
+    def test_failed_config_is_reported(self, mock_log):
+        """Test a config that cannot train is listed as failed, not fatal"""
+        self._write_config("broken", "Unsupported", ["signal"], {})
+        configs = collect_configs(config_dir=str(self.config_dir))
+
+        leaderboard = build_leaderboard(
+            str(self.root / "train.csv"), configs, output_dir=str(self.root / "models"), workers=1
+        )
+
+        self.assertEqual(len(leaderboard["entries"]), 3)
+        self.assertEqual(len(leaderboard["failed"]), 1)
+        self.assertIn("Unsupported model type", leaderboard["failed"][0]["error"])
+
+    @patch("ml_pipeline.model_leaderboard.insert_system_log")
+    def test_invalid_configs_fail_individually(self, mock_log):
+        """Test configs with another target or unknown features are failed, not fatal"""
+        with open(self.config_dir / "other.yaml", "w") as f:
+            yaml.safe_dump({"model_type": "DecisionTree", "target_column": "other", "input_features": ["signal"]}, f)
+        self._write_config("unknown_feature", "DecisionTree", ["signal", "xg"], {"max_depth": 2})
+        (self.config_dir / "notes.yaml").write_text("- not a config\n")
+
+        leaderboard = build_leaderboard(
+            str(self.root / "train.csv"),
+            collect_configs(config_dir=str(self.config_dir)),
+            output_dir=str(self.root / "models"),
+            workers=1,
+        )
+
+        self.assertEqual(len(leaderboard["entries"]), 3)
+        errors = {Path(entry["config"]).stem: entry["error"] for entry in leaderboard["failed"]}
+        self.assertEqual(set(errors), {"other", "unknown_feature", "notes"})
+        self.assertIn("'other'", errors["other"])
+        self.assertIn("xg", errors["unknown_feature"])
+
+        with self.assertRaises(TrainingError):
+            build_leaderboard(str(self.root / "train.csv"), [str(self.config_dir / "notes.yaml")])
+
+    @patch("ml_pipeline.model_leaderboard.insert_system_log")
+    def test_configs_keep_their_own_dtypes(self, mock_log):
+        """Test each config is cast with its own dtype settings, as train() would"""
+        self._write_config("wide", "LogisticRegression", ["signal", "noise"], {"max_iter": 200})
+        with open(self.config_dir / "wide.yaml") as f:
+            wide = yaml.safe_load(f)
+        with open(self.config_dir / "wide.yaml", "w") as f:
+            yaml.safe_dump({**wide, "default_feature_dtype": "float64"}, f)
+
+        seen = {}
+        original = ModelTrainer.fit_and_evaluate
+
+        def record(trainer, X_train, *args):
+            seen[Path(trainer.config_path).stem] = set(map(str, X_train.dtypes))
+            return original(trainer, X_train, *args)
+
+        with patch.object(ModelTrainer, "fit_and_evaluate", record):
+            build_leaderboard(
+                str(self.root / "train.csv"),
+                collect_configs(config_dir=str(self.config_dir)),
+                output_dir=str(self.root / "models"),
+                workers=1,
+            )
+
+        self.assertEqual(seen["wide"], {"float64"})
+        self.assertEqual(seen["logistic"], {"float32"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,25 @@
 """Unit tests for train_model module"""
 
+import json
+import shutil
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 from pathlib import Path
 
+import joblib
 import pandas as pd
 import numpy as np
 
-from ml_pipeline.train_model import ModelTrainer, MissingFeatureError
+from ml_pipeline.train_model import (
+    MissingFeatureError,
+    confusion_metrics,
+    ModelTrainer,
+    TrainingError,
+    TrainingTimeoutError,
+    TrainingWorker,
+    train,
+)
 
 
 class TestModelTrainer(unittest.TestCase):
@@ -100,6 +112,147 @@ class TestModelTrainer(unittest.TestCase):
         for value in metrics.values():
             self.assertTrue(0 <= value <= 1)
 
+    def test_train_ensemble_stacking(self):
+        """Test training and exporting the stacking meta-model"""
+        import tempfile
+
+        from ml_pipeline.ensemble_predictor import EnsemblePredictor, load_stacking_model
+
+        labels = np.array(["home_win", "draw", "away_win"], dtype=object)
+        rng = np.random.default_rng(0)
+        actual = rng.integers(0, 3, 300)
+        votes = pd.DataFrame({
+            "actual_result": labels[actual],
+            "full_time_prediction": labels[np.where(rng.random(300) < 0.7, actual, rng.integers(0, 3, 300))],
+            "full_time_confidence": rng.uniform(0.4, 0.9, 300),
+            "half_time_prediction": labels[rng.integers(0, 3, 300)],
+            "half_time_confidence": rng.uniform(0.4, 0.9, 300),
+        })
+        votes.loc[::10, ["half_time_prediction", "half_time_confidence"]] = None
+
+        trainer = ModelTrainer()
+        trainer.config = {
+            "model_type": "EnsembleStacking",
+            "input_features": [c for c in votes.columns if c != "actual_result"],
+            "target_column": "actual_result",
+            "hyperparameters": {"max_iter": 500},
+        }
+        trainer.create_model()
+        metrics = trainer.train_and_evaluate(votes.drop(columns="actual_result"), votes["actual_result"])
+        self.assertGreater(metrics["accuracy"], 0.5)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            trainer.save_model(output_dir)
+            self.assertTrue(trainer.stacking_path.endswith(".stacking.json"))
+            stacker = load_stacking_model(trainer.stacking_path)
+
+        predictor = EnsemblePredictor()
+        predictor.set_stacker(stacker)
+        self.assertEqual(predictor.mode, "stacking")
+        result = predictor.predict(full_time_prediction="draw", full_time_confidence=0.9)
+        self.assertEqual(result["winner"], "draw")
+
+    def _fitted_trainer(self, model_type, hyperparameters):
+        """Train a model from scratch on the sample data"""
+        trainer = ModelTrainer()
+        trainer.config = {**self.sample_config, "model_type": model_type, "hyperparameters": hyperparameters}
+        trainer.create_model()
+        X = self.sample_data[["feature1", "feature2"]]
+        trainer.model.fit(X, self.sample_data["target"])
+        return trainer
+
+    def test_fine_tune_partial_fit_honors_epochs(self):
+        """Test partial_fit learners take epochs x mini-batches at the given learning rate"""
+        trainer = self._fitted_trainer("SGDClassifier", {"loss": "log_loss", "random_state": 0})
+        before = trainer.model.coef_.copy()
+        configured = (trainer.model.learning_rate, trainer.model.eta0)
+        new = self.sample_data.iloc[:50]
+        step_sizes = []
+        partial_fit = trainer.model.partial_fit
+
+        def spy(*args, **kwargs):
+            step_sizes.append((trainer.model.learning_rate, trainer.model.eta0))
+            return partial_fit(*args, **kwargs)
+
+        with patch.object(trainer.model, "partial_fit", side_effect=spy):
+            mode = trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=3, learning_rate=0.05, batch_size=16)
+
+        self.assertEqual(mode, "partial_fit")
+        self.assertEqual(step_sizes, [("constant", 0.05)] * (3 * 4))
+        self.assertEqual((trainer.model.learning_rate, trainer.model.eta0), configured)
+        self.assertFalse(np.allclose(before, trainer.model.coef_))
+
+    def test_fine_tune_warm_starts_logistic_regression(self):
+        """Test LogisticRegression continues from its coefficients for at most epochs iterations"""
+        trainer = self._fitted_trainer("LogisticRegression", {"max_iter": 100})
+        new = self.sample_data.iloc[:60]
+
+        mode = trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=2, learning_rate=0.01)
+
+        self.assertEqual(mode, "warm_start")
+        self.assertLessEqual(trainer.model.n_iter_.max(), 2)
+        # The update's solver settings do not leak into later fits or the saved model
+        self.assertFalse(trainer.model.warm_start)
+        self.assertEqual(trainer.model.max_iter, 100)
+
+    def test_fine_tune_twice_after_warm_start(self):
+        """Test a second fine-tune after a warm start sees the original solver settings"""
+        self.sample_data["target"] = np.arange(len(self.sample_data)) % 3
+        trainer = self._fitted_trainer("LogisticRegression", {"max_iter": 100})
+        features = ["feature1", "feature2"]
+
+        first = trainer.fine_tune(self.sample_data[features], self.sample_data["target"], epochs=2, learning_rate=0.01)
+        second = trainer.fine_tune(self.sample_data[features], self.sample_data["target"], epochs=3, learning_rate=0.01)
+        self.assertEqual((first, second), ("warm_start", "warm_start"))
+
+        missing = self.sample_data[self.sample_data["target"] != 0]
+        mode = trainer.fine_tune(missing[features], missing["target"], epochs=2, learning_rate=0.01, refit=True)
+        self.assertEqual(mode, "refit")
+        self.assertEqual(trainer.model.max_iter, 100)
+
+    def test_fine_tune_missing_class_needs_explicit_refit(self):
+        """Test a batch missing a class leaves the model alone unless a refit is requested"""
+        self.sample_data["target"] = np.arange(len(self.sample_data)) % 3
+        trainer = self._fitted_trainer("LogisticRegression", {"max_iter": 100})
+        before = trainer.model.coef_.copy()
+        new = self.sample_data[self.sample_data["target"] != 0]
+
+        with self.assertRaises(TrainingError):
+            trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=2, learning_rate=0.01)
+        np.testing.assert_array_equal(trainer.model.coef_, before)
+
+        mode = trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=2, learning_rate=0.01, refit=True)
+        self.assertEqual(mode, "refit")
+        self.assertEqual(list(trainer.model.classes_), [1, 2])
+
+    def test_fine_tune_non_incremental_models_need_explicit_refit(self):
+        """Test models without an incremental API are only refit when asked to"""
+        trainer = self._fitted_trainer("DecisionTree", {"max_depth": 2})
+        new = self.sample_data.iloc[:40]
+
+        with self.assertRaises(TrainingError):
+            trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=5, learning_rate=0.01)
+
+        mode = trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=5, learning_rate=0.01, refit=True)
+        self.assertEqual(mode, "refit")
+
+    def test_create_model_learning_rate_only_sets_sgd_step(self):
+        """Test the learning rate never becomes LogisticRegression's regularization"""
+        trainer = ModelTrainer()
+        trainer.config = {**self.sample_config, "model_type": "LogisticRegression", "hyperparameters": {}}
+        self.assertEqual(trainer.create_model(learning_rate=0.001).C, 1.0)
+
+        trainer.config = {**self.sample_config, "model_type": "SGDClassifier", "hyperparameters": {}}
+        self.assertEqual(trainer.create_model(learning_rate=0.001).eta0, 0.001)
+
+    def test_fine_tune_rejects_unknown_classes(self):
+        """Test new classes cannot be introduced by fine-tuning"""
+        trainer = self._fitted_trainer("SGDClassifier", {"loss": "log_loss"})
+        new = self.sample_data.iloc[:10].assign(target=2)
+
+        with self.assertRaises(TrainingError):
+            trainer.fine_tune(new[["feature1", "feature2"]], new["target"], epochs=1, learning_rate=0.01)
+
     def test_parse_arguments_dataset_required(self):
         """Test that dataset argument is required"""
         from ml_pipeline.train_model import parse_arguments
@@ -158,5 +311,264 @@ class TestModelTrainer(unittest.TestCase):
             sys.argv = old_argv
 
 
+class TestTrainingPipeline(unittest.TestCase):
+    """Tests for the in-process training API and the warm worker"""
+
+    def setUp(self):
+        """Write a small dataset and config to a temp directory"""
+        import tempfile
+        import yaml
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        rng = np.random.default_rng(1)
+        pd.DataFrame({
+            "feature1": rng.random(120),
+            "feature2": rng.random(120),
+            "target": rng.choice(["home_win", "draw", "away_win"], 120),
+        }).to_csv(root / "train.csv", index=False)
+        with open(root / "config.yaml", "w") as f:
+            yaml.safe_dump({
+                "model_type": "LogisticRegression",
+                "input_features": ["feature1", "feature2"],
+                "target_column": "target",
+                "hyperparameters": {"max_iter": 200},
+            }, f)
+
+        self.kwargs = {
+            "dataset": str(root / "train.csv"),
+            "config": str(root / "config.yaml"),
+            "output_dir": str(root / "models"),
+            "use_cache": False,
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_train_returns_structured_result(self):
+        """Test in-process training returns metrics, model path and timings"""
+        result = train(**self.kwargs)
+
+        self.assertTrue(Path(result.model_path).exists())
+        self.assertTrue(Path(result.artifact_path).exists())
+        self.assertEqual(result.dataset_size, 120)
+        self.assertIn("accuracy", result.metrics)
+        self.assertIn("train_and_evaluate", result.timings)
+        self.assertGreaterEqual(result.timings["total"], result.timings["train_and_evaluate"])
+        self.assertEqual(result.to_dict()["status"], "success")
+
+    def test_train_fine_tunes_existing_model(self):
+        """Test fine-tuning updates a saved model instead of refitting from scratch"""
+        import yaml
+
+        config = Path(self.kwargs["config"])
+        with open(config) as f:
+            sgd_config = {**yaml.safe_load(f), "model_type": "SGDClassifier", "hyperparameters": {"loss": "log_loss"}}
+        with open(config, "w") as f:
+            yaml.safe_dump(sgd_config, f)
+        base = train(**self.kwargs)
+
+        result = train(
+            fine_tune=True,
+            model_path=base.model_path,
+            epochs=2,
+            learning_rate=0.01,
+            batch_size=32,
+            **{**self.kwargs, "output_dir": self.kwargs["output_dir"] + "_retrained"},
+        )
+
+        self.assertEqual(result.fine_tune_mode, "partial_fit")
+        self.assertEqual(result.to_dict()["fine_tune_mode"], "partial_fit")
+        self.assertTrue(Path(result.model_path).exists())
+
+    def test_train_reports_cross_validation(self):
+        """Test CV folds run in parallel and report mean/std per metric"""
+        result = train(cv_folds=3, cv_workers=2, **self.kwargs)
+
+        cv = result.to_dict()["cross_validation"]
+        self.assertEqual(cv["strategy"], "stratified")
+        self.assertEqual(len(cv["folds"]), 3)
+        self.assertEqual(set(cv["mean"]), set(result.metrics))
+        self.assertAlmostEqual(
+            cv["mean"]["accuracy"], np.mean([fold["accuracy"] for fold in cv["folds"]]), places=5
+        )
+        self.assertIn("cross_validate", result.timings)
+
+    def test_train_reports_phase_profile(self):
+        """Test each phase reports wall time, CPU time and peak RSS"""
+        profile_path = str(Path(self.temp_dir.name) / "run.prof")
+        result = train(profile_path=profile_path, **self.kwargs)
+
+        profile = result.to_dict()["profile"]
+        self.assertEqual(list(profile), ["load", "validate", "cast", "split", "fit", "predict", "save"])
+        for phase in profile.values():
+            self.assertGreaterEqual(phase["wall_seconds"], 0)
+            self.assertGreaterEqual(phase["cpu_seconds"], 0)
+            self.assertGreater(phase["peak_rss_mb"], 0)
+
+        import pstats
+        stats = pstats.Stats(profile_path)
+        self.assertTrue(any(func[2] == "train_and_evaluate" for func in stats.stats))
+
+    def test_train_streaming_fits_scaled_incremental_model(self):
+        """Test streaming training partial_fits chunks behind a streamed scaler"""
+        import yaml
+
+        config = Path(self.kwargs["config"])
+        with open(config) as f:
+            sgd_config = {**yaml.safe_load(f), "model_type": "SGDClassifier", "hyperparameters": {"random_state": 0}}
+        with open(config, "w") as f:
+            yaml.safe_dump(sgd_config, f)
+
+        result = train(streaming=True, chunk_size=25, epochs=2, **self.kwargs)
+
+        self.assertEqual(result.dataset_size, 120)
+        self.assertEqual(set(result.metrics), {"accuracy", "precision", "recall", "f1_score"})
+        model = joblib.load(result.model_path)
+        self.assertEqual([name for name, _ in model.steps], ["scaler", "model"])
+        # The scaler only sees the training rows, not the streamed holdout
+        self.assertTrue(60 < model.named_steps["scaler"].n_samples_seen_ < 120)
+
+    def test_train_streaming_rejects_batch_models(self):
+        """Test streaming needs an estimator with partial_fit"""
+        with self.assertRaises(TrainingError):
+            train(streaming=True, **self.kwargs)
+
+    def test_confusion_metrics_match_sklearn(self):
+        """Test streamed metrics equal the in-memory weighted metrics"""
+        from sklearn.metrics import confusion_matrix
+
+        rng = np.random.default_rng(4)
+        y_true = rng.choice(["home_win", "draw", "away_win"], 300)
+        y_pred = np.where(rng.random(300) < 0.6, y_true, rng.choice(["home_win", "draw"], 300))
+        trainer = ModelTrainer()
+        trainer.model = MagicMock(predict=MagicMock(return_value=y_pred))
+
+        expected = trainer.evaluate(pd.DataFrame(index=range(300)), pd.Series(y_true))
+        actual = confusion_metrics(confusion_matrix(y_true, y_pred))
+
+        for name, value in expected.items():
+            self.assertAlmostEqual(actual[name], value, places=10)
+
+    def test_timeseries_folds_test_on_later_rows(self):
+        """Test time-series folds never train on rows after the test rows"""
+        trainer = ModelTrainer()
+        folds = trainer.make_folds(pd.Series(["a", "b"] * 30), 4, strategy="timeseries")
+
+        self.assertEqual(len(folds), 4)
+        for train_index, test_index in folds:
+            self.assertLess(train_index.max(), test_index.min())
+
+    def test_train_raises_instead_of_exiting(self):
+        """Test failures raise TrainingError rather than exiting the process"""
+        with self.assertRaises(TrainingError):
+            train(**{**self.kwargs, "dataset": self.kwargs["dataset"] + ".missing"})
+
+    def test_worker_is_reused_across_runs(self):
+        """Test the warm worker runs several trainings in one process"""
+        with TrainingWorker() as worker:
+            first = worker.run(timeout=60, **self.kwargs)
+            pool = worker._pool
+            second = worker.run(timeout=60, random_seed=7, **self.kwargs)
+
+            self.assertIs(worker._pool, pool)
+            self.assertEqual(first.dataset_size, second.dataset_size)
+
+            with self.assertRaises(TrainingError):
+                worker.run(timeout=60, **{**self.kwargs, "config": "missing.yaml"})
+
+    def test_worker_timeout_kills_worker(self):
+        """Test a run over the timeout raises and the worker recovers"""
+        with TrainingWorker() as worker:
+            with self.assertRaises(TrainingTimeoutError):
+                worker.run(timeout=0.001, **self.kwargs)
+            self.assertIsNone(worker._pool)
+
+            result = worker.run(timeout=60, **self.kwargs)
+            self.assertIn("accuracy", result.metrics)
+
+    def test_auto_reinforcement_run_training(self):
+        """Test run_training returns the structured result as a dict"""
+        from ml_pipeline.auto_reinforcement import run_training
+
+        with TrainingWorker() as worker:
+            output = run_training(
+                self.kwargs["dataset"],
+                self.kwargs["output_dir"],
+                fine_tune=False,
+                worker=worker,
+                config=self.kwargs["config"],
+            )
+
+        self.assertEqual(output["status"], "success")
+        self.assertIn("timings", output)
+
+    def test_auto_reinforcement_finds_base_model(self):
+        """Test the newest retrained model wins over the active registry model"""
+        from ml_pipeline.auto_reinforcement import find_base_model
+
+        root = Path(self.temp_dir.name)
+        retrained = root / "models" / "retrained"
+        registry = root / "models" / "model_registry.json"
+        retrained.mkdir(parents=True)
+
+        self.assertIsNone(find_base_model(retrained, registry))
+
+        active = root / "models" / "active.pkl"
+        active.touch()
+        registry.write_text(json.dumps({"models": [
+            {"id": "old", "status": "retired", "path": "models/old.pkl"},
+            {"id": "active", "status": "active", "path": "models/active.pkl"},
+        ]}))
+        self.assertEqual(find_base_model(retrained, registry), str(active))
+
+        for run_id in ("first", "second"):
+            (retrained / run_id).mkdir()
+            (retrained / run_id / "model.pkl").touch()
+            time.sleep(0.01)
+        self.assertEqual(find_base_model(retrained, registry), str(retrained / "second" / "model.pkl"))
+
+    @patch("ml_pipeline.auto_reinforcement.update_retraining_run")
+    @patch("ml_pipeline.auto_reinforcement.insert_retraining_run")
+    @patch("ml_pipeline.auto_reinforcement.insert_system_log")
+    def test_auto_reinforcement_fine_tunes_incrementally(self, mock_log, mock_insert_run, mock_update_run):
+        """Test the nightly run updates the latest model instead of training from scratch"""
+        from ml_pipeline import auto_reinforcement
+
+        base = train(**self.kwargs)
+        retrained = Path(self.temp_dir.name) / "retrained"
+        run_training = auto_reinforcement.run_training
+        find_base_model = auto_reinforcement.find_base_model
+
+        with TrainingWorker() as worker, \
+                patch.object(auto_reinforcement, "RETRAINED_MODELS_DIR", retrained), \
+                patch.object(auto_reinforcement, "stream_retraining_data", return_value=(self.kwargs["dataset"], 120)), \
+                patch.object(auto_reinforcement, "find_base_model",
+                             side_effect=lambda: find_base_model(retrained, Path(self.temp_dir.name) / "none.json")), \
+                patch.object(auto_reinforcement, "run_training",
+                             side_effect=lambda *args, **kwargs: run_training(
+                                 *args, worker=worker, config=self.kwargs["config"], **kwargs)) as mock_training:
+            (retrained / "previous").mkdir(parents=True)
+            shutil.copy(base.model_path, retrained / "previous" / "model.pkl")
+
+            self.assertTrue(auto_reinforcement.run_auto_reinforcement())
+
+        self.assertEqual(mock_training.call_args.kwargs["model_path"], str(retrained / "previous" / "model.pkl"))
+        completed = next(
+            call.kwargs["details"] for call in mock_log.call_args_list
+            if call.kwargs["message"] == "Training completed successfully"
+        )
+        self.assertEqual(completed["fine_tune_mode"], "warm_start")
+
+    @patch("ml_pipeline.auto_reinforcement.TrainingWorker.run")
+    def test_auto_reinforcement_run_training_timeout(self, mock_run):
+        """Test a worker timeout is reported as a failed run"""
+        from ml_pipeline.auto_reinforcement import run_training
+
+        mock_run.side_effect = TrainingTimeoutError("Training exceeded 1s timeout")
+
+        self.assertIsNone(run_training("data.csv", "out", worker=TrainingWorker()))
+
+
 if __name__ == "__main__":
     unittest.main()
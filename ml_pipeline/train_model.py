@@ -1,27 +1,58 @@
 #!/usr/bin/env python3
 """
-ML Pipeline train_model.py - CLI interface for model training with fine-tuning support
+ML Pipeline train_model.py - Model training with fine-tuning support
+
+``train`` runs the whole pipeline in-process and returns a ``TrainingResult``;
+``TrainingWorker`` runs it in a reusable warm subprocess with a timeout. The
+CLI is a thin wrapper that prints the result as JSON.
 """
 
 import argparse
+import cProfile
 import json
 import logging
+import multiprocessing
+import os
 import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import traceback
 import yaml
-from sklearn.linear_model import LogisticRegression
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, classification_report, f1_score, precision_score, recall_score
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, TimeSeriesSplit, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
 from sklearn.tree import DecisionTreeClassifier
 import joblib
 
-from .config import DEBUG, LOG_LEVEL, MODELS_DIR, RETRAINED_MODELS_DIR
+from .config import (
+    DATASET_CACHE_DIR,
+    DATASET_CACHE_ENABLED,
+    DEBUG,
+    DEFAULT_FINE_TUNE_BATCH_SIZE,
+    DEFAULT_TRAINING_CHUNK_SIZE,
+    LOG_LEVEL,
+    MODELS_DIR,
+    RETRAINED_MODELS_DIR,
+    TRAINING_TIMEOUT_SECONDS,
+)
+from .compiled_scorer import SCORER_CHECK_ROWS, ScorerError, load_scorer
+from .dataset_cache import DatasetCache
+from .feature_types import FLOAT32_REL_TOLERANCE, FeatureTypeError, cast_features, encode_target, memory_mb
+from .model_artifact import ARTIFACT_SUFFIX, ArtifactError, save_artifact
+from .profiling import PhaseProfiler
+from .ensemble_predictor import EnsemblePredictor, StackingModel, stacking_features
 from .supabase_client import insert_system_log
 
 # Configure logging
@@ -31,31 +62,158 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+CV_STRATEGIES = ("stratified", "timeseries")
+
+# Shared (X, y) for cross-validation fold workers, set by _init_fold_worker
+_CV_DATA: Optional[Tuple[pd.DataFrame, pd.Series]] = None
+
 
 class MissingFeatureError(Exception):
     """Raised when required features are missing from the dataset."""
     pass
 
 
+class TrainingError(Exception):
+    """Raised when a training run cannot complete."""
+    pass
+
+
+class TrainingTimeoutError(TrainingError):
+    """Raised when a worker training run exceeds its timeout."""
+    pass
+
+
+class TrainingResult(NamedTuple):
+    """Structured outcome of a training run."""
+
+    model_path: str
+    metrics: Dict[str, float]
+    dataset_size: int
+    timings: Dict[str, float]
+    timestamp: str
+    stacking_path: Optional[str] = None
+    fine_tune_mode: Optional[str] = None
+    cross_validation: Optional[Dict[str, Any]] = None
+    profile: Optional[Dict[str, Dict[str, float]]] = None
+    profile_path: Optional[str] = None
+    artifact_path: Optional[str] = None
+    dtypes: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, as printed by the CLI."""
+        output = {
+            "status": "success",
+            "model_path": self.model_path,
+            "metrics": self.metrics,
+            "dataset_size": self.dataset_size,
+            "timings": self.timings,
+            "timestamp": self.timestamp,
+        }
+        if self.stacking_path:
+            output["stacking_path"] = self.stacking_path
+        if self.fine_tune_mode:
+            output["fine_tune_mode"] = self.fine_tune_mode
+        if self.cross_validation:
+            output["cross_validation"] = self.cross_validation
+        if self.profile:
+            output["profile"] = self.profile
+        if self.profile_path:
+            output["profile_path"] = self.profile_path
+        if self.artifact_path:
+            output["artifact_path"] = self.artifact_path
+        if self.dtypes:
+            output["dtypes"] = self.dtypes
+        return output
+
+
+def ensemble_vote_features(X: pd.DataFrame, models=EnsemblePredictor.DEFAULT_MODELS) -> np.ndarray:
+    """
+    Turn logged sub-model vote columns into stacking meta-model features.
+
+    Args:
+        X: Frame with ``<name>_prediction`` / ``<name>_confidence`` columns
+        models: (key, name) sub-model registry
+
+    Returns:
+        Feature matrix from ``stacking_features``
+    """
+    models = [tuple(model) for model in models]
+    predictor = EnsemblePredictor(
+        weights={key: 1.0 / len(models) for key, _ in models}, models=models
+    )
+    outcomes, confidences, present = predictor.frame_to_votes(X)
+    return stacking_features(outcomes, confidences, present)
+
+
+def confusion_metrics(confusion: np.ndarray) -> Dict[str, float]:
+    """
+    Weighted classification metrics from a confusion matrix.
+
+    Matches ``evaluate`` (weighted averages, zero_division=0), so metrics can
+    be accumulated over streamed chunks instead of stored predictions.
+
+    Args:
+        confusion: (classes, classes) counts, rows are true labels
+
+    Returns:
+        Dictionary containing evaluation metrics
+    """
+    confusion = np.asarray(confusion, dtype=np.float64)
+    total = confusion.sum()
+    if total == 0:
+        raise TrainingError("No holdout rows to evaluate")
+
+    true_positive = np.diag(confusion)
+    support = confusion.sum(axis=1)
+    predicted = confusion.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positive / predicted, 0.0)
+        recall = np.where(support > 0, true_positive / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    return {
+        "accuracy": float(true_positive.sum() / total),
+        "precision": float(precision @ support / total),
+        "recall": float(recall @ support / total),
+        "f1_score": float(f1 @ support / total),
+    }
+
+
 class ModelTrainer:
     """Handles model training, evaluation, and fine-tuning."""
 
-    def __init__(self, config_path: str = "model_config.yaml", random_seed: int = 42):
+    def __init__(
+        self,
+        config_path: str = "model_config.yaml",
+        random_seed: int = 42,
+        use_cache: bool = DATASET_CACHE_ENABLED,
+    ):
         """
         Initialize the model trainer.
 
         Args:
             config_path: Path to the YAML configuration file
             random_seed: Random seed for reproducibility
+            use_cache: Reuse parsed datasets from the binary dataset cache
         """
         self.config_path = config_path
         self.random_seed = random_seed
+        self.cache = DatasetCache(str(DATASET_CACHE_DIR)) if use_cache else None
         self.config = None
         self.model = None
         self.metrics = {}
+        self.stacking_path = None
+        self.artifact_path = None
+        self.dtype_report = None
+        self.profiler = PhaseProfiler()
 
     def load_config(self) -> Dict[str, Any]:
-        """Load and parse the model configuration from YAML."""
+        """
+        Load and parse the model configuration from YAML.
+
+        Raises:
+            TrainingError: If the file is missing or not valid YAML
+        """
         try:
             config_path = Path(self.config_path)
             if not config_path.is_absolute():
@@ -67,10 +225,10 @@ class ModelTrainer:
             return self.config
         except FileNotFoundError:
             logger.error(f"Configuration file not found: {self.config_path}")
-            sys.exit(1)
+            raise TrainingError(f"Configuration file not found: {self.config_path}") from None
         except yaml.YAMLError as e:
             logger.error(f"Error parsing YAML configuration: {e}")
-            sys.exit(1)
+            raise TrainingError(f"Error parsing YAML configuration: {e}") from e
 
     def validate_data(self, df: pd.DataFrame) -> None:
         """
@@ -92,35 +250,122 @@ class ModelTrainer:
 
         logger.info(f"Data validation passed - {len(required_columns)} required columns present")
 
-    def load_data(self, data_path: str) -> tuple:
+    def load_data(self, data_path: str, cast: bool = True) -> tuple:
         """
         Load and validate the training dataset.
 
+        With the dataset cache enabled, a previously validated selection of
+        the same file contents is memory-mapped instead of re-parsed. The
+        result is cast with ``apply_dtypes``.
+
         Args:
             data_path: Path to the CSV file
+            cast: Apply the config's dtypes; False returns the parsed columns
 
         Returns:
             Tuple of (features DataFrame, target Series)
+
+        Raises:
+            TrainingError: If the dataset is missing, empty or invalid
         """
+        features = self.config["input_features"]
+        target = self.config["target_column"]
+
+        cache_key = None
+        cached = None
+        with self.profiler.phase("load"):
+            if self.cache is not None and Path(data_path).is_file():
+                cache_key = self.cache.key(data_path, features, target)
+                cached = self.cache.load(cache_key)
+        if cached is not None:
+            logger.info(f"Dataset loaded from cache for {data_path} ({len(cached[0])} rows)")
+            return self.apply_dtypes(*cached) if cast else tuple(cached)
+
         try:
-            df = pd.read_csv(data_path)
+            with self.profiler.phase("load"):
+                df = pd.read_csv(data_path)
             logger.info(f"Dataset loaded from {data_path} ({len(df)} rows)")
 
-            self.validate_data(df)
+            with self.profiler.phase("validate"):
+                self.validate_data(df)
 
-            X = df[self.config["input_features"]]
-            y = df[self.config["target_column"]]
+                # Evaluation logs contain matches that have not been played yet
+                unlabeled = df[target].isna()
+                if unlabeled.any():
+                    df = df[~unlabeled]
+                    logger.info(f"Dropped {int(unlabeled.sum())} rows without a target")
 
-            return X, y
+                X = df[features].reset_index(drop=True)
+                y = df[target].reset_index(drop=True)
         except FileNotFoundError:
             logger.error(f"Dataset file not found: {data_path}")
-            sys.exit(1)
+            raise TrainingError(f"Dataset file not found: {data_path}") from None
         except pd.errors.EmptyDataError:
             logger.error(f"Dataset file is empty: {data_path}")
-            sys.exit(1)
+            raise TrainingError(f"Dataset file is empty: {data_path}") from None
         except MissingFeatureError as e:
             logger.error(f"Data validation failed: {e}")
-            sys.exit(1)
+            raise TrainingError(f"Data validation failed: {e}") from e
+
+        if cache_key is not None:
+            try:
+                with self.profiler.phase("load"):
+                    self.cache.store(cache_key, X, y, data_path)
+            except OSError as e:
+                logger.warning(f"Could not write dataset cache: {e}")
+
+        return self.apply_dtypes(X, y) if cast else (X, y)
+
+    def apply_dtypes(self, X: pd.DataFrame, y: pd.Series) -> tuple:
+        """
+        Cast features and target to the config's declared dtypes.
+
+        Undeclared numeric features are narrowed automatically (float32 when
+        the rounding error is within ``float32_tolerance``, smallest integer
+        type otherwise) and the target becomes a categorical, so every later
+        copy (split, fit, predict) moves fewer bytes. The casts and their
+        precision loss are kept in ``dtype_report``.
+
+        Args:
+            X: Feature matrix
+            y: Target vector
+
+        Returns:
+            Tuple of (typed features, typed target)
+
+        Raises:
+            TrainingError: If a declared dtype is unknown or cannot be applied
+        """
+        before = memory_mb(X, y)
+        try:
+            with self.profiler.phase("cast"):
+                X, features = cast_features(
+                    X,
+                    declared=self.config.get("feature_dtypes"),
+                    default=self.config.get("default_feature_dtype", "auto"),
+                    tolerance=self.config.get("float32_tolerance", FLOAT32_REL_TOLERANCE),
+                )
+                y = encode_target(y, self.config.get("target_dtype", "category"))
+        except FeatureTypeError as e:
+            logger.error(f"Feature dtype validation failed: {e}")
+            raise TrainingError(f"Feature dtype validation failed: {e}") from e
+
+        lossy = {
+            name: entry["max_rel_error"] for name, entry in features.items()
+            if entry.get("lossless") is False and entry["to"] == "float32"
+        }
+        self.dtype_report = {
+            "features": features,
+            "target": str(y.dtype),
+            "memory_mb": {"before": before, "after": memory_mb(X, y)},
+        }
+        logger.info(
+            f"Dtypes applied: {self.dtype_report['memory_mb']['before']} MB -> "
+            f"{self.dtype_report['memory_mb']['after']} MB"
+            + (f"; float32 rounding in {len(lossy)} features (max relative error "
+               f"{max(lossy.values()):.3g})" if lossy else "")
+        )
+        return X, y
 
     def create_model(self, learning_rate: Optional[float] = None) -> Any:
         """
@@ -131,28 +376,62 @@ class ModelTrainer:
 
         Returns:
             Instantiated model object
+
+        Raises:
+            TrainingError: If the configured model type is not supported
         """
         model_type = self.config["model_type"]
         hyperparameters = self.config.get("hyperparameters", {}).copy()
 
-        # Apply learning rate if fine-tuning
-        if learning_rate is not None:
-            if model_type == "LogisticRegression":
-                # Adjust regularization based on learning rate
-                hyperparameters["C"] = learning_rate
+        # Only SGD has a step size; other models ignore the learning rate
+        if learning_rate is not None and model_type == "SGDClassifier":
+            hyperparameters.update(learning_rate="constant", eta0=learning_rate)
             logger.info(f"Fine-tuning with learning_rate={learning_rate}")
 
         if model_type == "LogisticRegression":
             self.model = LogisticRegression(**hyperparameters)
         elif model_type == "DecisionTree":
             self.model = DecisionTreeClassifier(**hyperparameters)
+        elif model_type == "SGDClassifier":
+            # Linear model that supports partial_fit for incremental fine-tuning
+            self.model = SGDClassifier(**hyperparameters)
+        elif model_type == "EnsembleStacking":
+            # Logistic meta-model over the ensemble's logged sub-model votes
+            models = self.config.get("ensemble_models", EnsemblePredictor.DEFAULT_MODELS)
+            self.model = Pipeline([
+                ("votes", FunctionTransformer(
+                    ensemble_vote_features, kw_args={"models": [list(m) for m in models]}
+                )),
+                ("meta", LogisticRegression(**hyperparameters)),
+            ])
         else:
             logger.error(f"Unsupported model type: {model_type}")
-            sys.exit(1)
+            raise TrainingError(f"Unsupported model type: {model_type}")
 
         logger.info(f"Model created: {model_type}")
         return self.model
 
+    def split_data(self, X: pd.DataFrame, y: pd.Series) -> tuple:
+        """
+        Split data into stratified train and test sets.
+
+        Args:
+            X: Feature matrix
+            y: Target vector
+
+        Returns:
+            Tuple of (X_train, X_test, y_train, y_test)
+        """
+        # Split data with reproducible random seed
+        with self.profiler.phase("split"):
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=self.random_seed, stratify=y
+            )
+
+        logger.info(f"Data split: {len(X_train)} training, {len(X_test)} test samples")
+
+        return X_train, X_test, y_train, y_test
+
     def train_and_evaluate(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, float]:
         """
         Train the model and evaluate its performance.
@@ -164,20 +443,428 @@ class ModelTrainer:
         Returns:
             Dictionary containing evaluation metrics
         """
-        # Split data with reproducible random seed
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y, test_size=0.2, random_state=self.random_seed, stratify=y
+        return self.fit_and_evaluate(*self.split_data(X, y))
+
+    def make_folds(
+        self,
+        y: pd.Series,
+        n_splits: int,
+        strategy: str = "stratified",
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Compute cross-validation fold indices.
+
+        ``stratified`` shuffles with the trainer's seed and keeps the class
+        balance in every fold. ``timeseries`` assumes the rows are in
+        chronological order and always tests on rows after the training rows.
+
+        Args:
+            y: Target vector
+            n_splits: Number of folds
+            strategy: 'stratified' or 'timeseries'
+
+        Returns:
+            List of (train indices, test indices)
+
+        Raises:
+            TrainingError: If the strategy is unknown or the data cannot be
+                split into ``n_splits`` folds
+        """
+        if strategy not in CV_STRATEGIES:
+            raise TrainingError(f"Unknown CV strategy: {strategy}. Use one of {CV_STRATEGIES}")
+
+        if strategy == "stratified":
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=self.random_seed)
+        else:
+            splitter = TimeSeriesSplit(n_splits=n_splits)
+
+        try:
+            return list(splitter.split(np.zeros(len(y)), y))
+        except ValueError as e:
+            raise TrainingError(f"Cannot split {len(y)} rows into {n_splits} folds: {e}") from e
+
+    def load_folds(
+        self,
+        data_path: str,
+        y: pd.Series,
+        n_splits: int,
+        strategy: str = "stratified",
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Fold indices for a dataset, computed once per dataset hash.
+
+        Folds depend only on the file contents, target and split settings,
+        so separate runs of different configs are scored on identical folds.
+
+        Args:
+            data_path: Dataset file the target was loaded from
+            y: Target vector
+            n_splits: Number of folds
+            strategy: 'stratified' or 'timeseries'
+
+        Returns:
+            List of (train indices, test indices)
+        """
+        if self.cache is None or not Path(data_path).is_file():
+            return self.make_folds(y, n_splits, strategy)
+
+        key = self.cache.fold_key(
+            data_path, self.config["target_column"], strategy, n_splits, self.random_seed
         )
+        folds = self.cache.load_folds(key)
+        if folds is not None:
+            logger.info(f"Loaded {len(folds)} {strategy} folds from cache")
+            return folds
 
-        logger.info(f"Data split: {len(X_train)} training, {len(X_test)} test samples")
+        folds = self.make_folds(y, n_splits, strategy)
+        try:
+            self.cache.store_folds(key, folds)
+        except OSError as e:
+            logger.warning(f"Could not write fold cache: {e}")
+        return folds
+
+    def cross_validate(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        folds: List[Tuple[np.ndarray, np.ndarray]],
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Train and evaluate a fresh model on every fold in parallel.
 
+        ``X`` and ``y`` are handed to each worker process once, through the
+        pool initializer; each fold then only ships its index arrays.
+
+        Args:
+            X: Feature matrix
+            y: Target vector
+            folds: List of (train indices, test indices)
+            workers: Worker processes (default: one per fold, capped at CPU
+                count); 1 runs the folds sequentially in-process
+
+        Returns:
+            Dict with per-fold metrics and the mean/std of each metric
+        """
+        workers = workers or min(len(folds), os.cpu_count() or 1)
+        if multiprocessing.current_process().daemon:
+            # Inside a TrainingWorker, which may not start child processes
+            workers = 1
+        logger.info(f"Cross-validating {len(folds)} folds with {workers} workers")
+
+        jobs = [(self.config, train_index, test_index, self.random_seed) for train_index, test_index in folds]
+        if workers == 1:
+            _init_fold_worker(X, y)
+            fold_metrics = [_fit_fold(*job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_fold_worker, initargs=(X, y)
+            ) as pool:
+                fold_metrics = list(pool.map(_fit_fold, *zip(*jobs)))
+
+        names = list(fold_metrics[0])
+        values = np.array([[metrics[name] for name in names] for metrics in fold_metrics])
+        summary = {
+            "n_splits": len(folds),
+            "folds": fold_metrics,
+            "mean": dict(zip(names, values.mean(axis=0).round(6).tolist())),
+            "std": dict(zip(names, values.std(axis=0).round(6).tolist())),
+        }
+
+        logger.info(
+            "CV: " + ", ".join(f"{name}={summary['mean'][name]:.4f}±{summary['std'][name]:.4f}" for name in names)
+        )
+        return summary
+
+    def fit_and_evaluate(
+        self,
+        X_train: pd.DataFrame,
+        X_test: pd.DataFrame,
+        y_train: pd.Series,
+        y_test: pd.Series,
+    ) -> Dict[str, float]:
+        """
+        Train the model on a prepared split and evaluate it on the test set.
+
+        Args:
+            X_train: Training features
+            X_test: Test features
+            y_train: Training target
+            y_test: Test target
+
+        Returns:
+            Dictionary containing evaluation metrics
+        """
         # Train the model
         logger.info("Training model...")
-        self.model.fit(X_train, y_train)
+        with self.profiler.phase("fit"):
+            self.model.fit(X_train, y_train)
         logger.info("Training complete")
 
+        return self.evaluate(X_test, y_test)
+
+    def fine_tune(
+        self,
+        X_train: pd.DataFrame,
+        y_train: pd.Series,
+        epochs: int,
+        learning_rate: float,
+        batch_size: int = DEFAULT_FINE_TUNE_BATCH_SIZE,
+        refit: bool = False,
+    ) -> str:
+        """
+        Update the loaded model in place on new samples.
+
+        Estimators with ``partial_fit`` (e.g. SGDClassifier) take ``epochs``
+        shuffled passes of mini-batches at a constant ``learning_rate``.
+        LogisticRegression (also inside the stacking pipeline) is warm-started
+        from its current coefficients for at most ``epochs`` solver
+        iterations; lbfgs has no step size, so ``learning_rate`` does not
+        apply there. The update's solver settings are restored afterwards, so
+        later fits of the model (and the saved model) behave as configured.
+
+        A warm start needs samples of every class, and other estimators cannot
+        be updated at all. Refitting would replace the model with one trained
+        on the new samples only, so it happens only when ``refit`` is set.
+
+        Args:
+            X_train: New training features
+            y_train: New training target
+            epochs: Passes over the new samples
+            learning_rate: Constant step size for partial_fit learners
+            batch_size: Mini-batch size for partial_fit learners
+            refit: Refit on the new samples when no incremental update is possible
+
+        Returns:
+            Update mode used: 'partial_fit', 'warm_start' or 'refit'
+
+        Raises:
+            TrainingError: If the new samples contain unknown classes, or the
+                model cannot be updated incrementally and ``refit`` is not set
+        """
+        estimator = self.model.steps[-1][1] if hasattr(self.model, "steps") else self.model
+        classes = getattr(estimator, "classes_", None)
+        labels = np.unique(y_train)
+
+        if classes is not None and not np.isin(labels, classes).all():
+            raise TrainingError(
+                f"Fine-tuning data has classes unknown to the model: {sorted(set(labels) - set(classes))}"
+            )
+
+        if hasattr(estimator, "partial_fit") and estimator is self.model:
+            classes = classes if classes is not None else labels
+            rng = np.random.default_rng(self.random_seed)
+            update = {"learning_rate": "constant", "eta0": learning_rate} if "eta0" in estimator.get_params() else {}
+
+            logger.info(
+                f"Incremental update: {epochs} epochs over {len(X_train)} samples "
+                f"(batch_size={batch_size}, learning_rate={learning_rate})"
+            )
+            with _updated_params(estimator, update):
+                for _ in range(epochs):
+                    order = rng.permutation(len(X_train))
+                    for start in range(0, len(order), batch_size):
+                        batch = order[start:start + batch_size]
+                        estimator.partial_fit(X_train.iloc[batch], y_train.iloc[batch], classes=classes)
+            return "partial_fit"
+
+        if isinstance(estimator, LogisticRegression):
+            missing = sorted(set(classes) - set(labels)) if classes is not None else []
+            if not missing:
+                logger.info(f"Warm-started update: up to {epochs} iterations over {len(X_train)} samples")
+                with _updated_params(estimator, {"warm_start": True, "max_iter": epochs}), \
+                        warnings.catch_warnings():
+                    # Stopping after a few iterations is the point of a warm start
+                    warnings.simplefilter("ignore", ConvergenceWarning)
+                    self.model.fit(X_train, y_train)
+                return "warm_start"
+            reason = f"fine-tuning samples lack classes {missing}, so a warm start is impossible"
+        else:
+            reason = f"{type(estimator).__name__} cannot be updated incrementally"
+
+        if not refit:
+            raise TrainingError(
+                f"Cannot fine-tune: {reason}. Refitting would discard the model; pass refit=True to allow it"
+            )
+        logger.warning(f"{reason[0].upper()}{reason[1:]}; refitting on the new samples as requested")
+        self.model.fit(X_train, y_train)
+        return "refit"
+
+    def fine_tune_and_evaluate(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        epochs: int,
+        learning_rate: float,
+        batch_size: int = DEFAULT_FINE_TUNE_BATCH_SIZE,
+        refit: bool = False,
+    ) -> tuple:
+        """
+        Incrementally update the loaded model and evaluate it.
+
+        Args:
+            X: Feature matrix of the new samples
+            y: Target vector of the new samples
+            epochs: Passes over the new samples
+            learning_rate: Step size for partial_fit learners
+            batch_size: Mini-batch size for partial_fit learners
+            refit: Refit when no incremental update is possible (see ``fine_tune``)
+
+        Returns:
+            Tuple of (metrics, update mode)
+        """
+        X_train, X_test, y_train, y_test = self.split_data(X, y)
+        with self.profiler.phase("fit"):
+            mode = self.fine_tune(X_train, y_train, epochs, learning_rate, batch_size, refit)
+        return self.evaluate(X_test, y_test), mode
+
+    def iter_chunks(self, data_path: str, chunk_size: int = DEFAULT_TRAINING_CHUNK_SIZE) -> Iterator[tuple]:
+        """
+        Stream the dataset in validated chunks.
+
+        Only the configured columns are parsed and rows without a target are
+        dropped, as in ``load_data``.
+
+        Args:
+            data_path: Path to the CSV file
+            chunk_size: Rows per chunk
+
+        Yields:
+            Tuples of (features DataFrame, target Series)
+
+        Raises:
+            TrainingError: If the dataset is missing or invalid
+        """
+        features = self.config["input_features"]
+        target = self.config["target_column"]
+
+        try:
+            header = pd.read_csv(data_path, nrows=0)
+            self.validate_data(header)
+            reader = pd.read_csv(data_path, usecols=features + [target], chunksize=chunk_size)
+        except FileNotFoundError:
+            logger.error(f"Dataset file not found: {data_path}")
+            raise TrainingError(f"Dataset file not found: {data_path}") from None
+        except pd.errors.EmptyDataError:
+            logger.error(f"Dataset file is empty: {data_path}")
+            raise TrainingError(f"Dataset file is empty: {data_path}") from None
+        except MissingFeatureError as e:
+            logger.error(f"Data validation failed: {e}")
+            raise TrainingError(f"Data validation failed: {e}") from e
+
+        with reader:
+            for chunk in reader:
+                chunk = chunk[chunk[target].notna()]
+                yield chunk[features], chunk[target]
+
+    def train_streaming(
+        self,
+        data_path: str,
+        chunk_size: int = DEFAULT_TRAINING_CHUNK_SIZE,
+        epochs: int = 1,
+        test_size: float = 0.2,
+    ) -> tuple:
+        """
+        Train and evaluate out of core, one chunk at a time.
+
+        Memory is bounded by ``chunk_size`` regardless of the dataset size:
+
+        1. First pass: fit a StandardScaler on the training rows and collect
+           the class labels.
+        2. ``epochs`` passes: ``partial_fit`` the estimator on each scaled,
+           shuffled training chunk.
+        3. Final pass: predict the holdout rows and accumulate a confusion
+           matrix for the metrics.
+
+        Rows are assigned to the holdout by a seeded random stream over the
+        row order, so every pass (and every chunk size) sees the same split.
+        The saved model is a Pipeline of the scaler and the estimator.
+
+        Args:
+            data_path: Path to the CSV file
+            chunk_size: Rows per chunk
+            epochs: Training passes over the data
+            test_size: Fraction of rows held out for evaluation
+
+        Returns:
+            Tuple of (metrics, number of labeled rows)
+
+        Raises:
+            TrainingError: If the estimator cannot learn incrementally or the
+                dataset is invalid
+        """
+        estimator = self.model
+        if not hasattr(estimator, "partial_fit"):
+            raise TrainingError(
+                f"{type(estimator).__name__} cannot learn incrementally; "
+                "use an SGDClassifier config for streaming training"
+            )
+
+        def passes():
+            # Same seed every pass -> same holdout rows every pass
+            rng = np.random.default_rng(self.random_seed)
+            for X, y in self.iter_chunks(data_path, chunk_size):
+                yield X, y, rng.random(len(X)) < test_size
+
+        scaler = StandardScaler()
+        classes = set()
+        rows = 0
+        with self.profiler.phase("scale"):
+            for X, y, holdout in passes():
+                rows += len(X)
+                classes.update(y.unique())
+                if (~holdout).any():
+                    scaler.partial_fit(X[~holdout].to_numpy(dtype=np.float64))
+        if not hasattr(scaler, "mean_"):
+            raise TrainingError(f"No training rows in {data_path}")
+        classes = np.array(sorted(classes))
+        logger.info(f"Streaming pass 1: scaler fitted on {rows} rows, classes {list(classes)}")
+
+        shuffle = np.random.default_rng(self.random_seed)
+        with self.profiler.phase("fit"):
+            for epoch in range(epochs):
+                for X, y, holdout in passes():
+                    order = shuffle.permutation(np.flatnonzero(~holdout))
+                    if len(order):
+                        estimator.partial_fit(
+                            scaler.transform(X.iloc[order].to_numpy(dtype=np.float64)),
+                            y.iloc[order].to_numpy(),
+                            classes=classes,
+                        )
+                logger.info(f"Streaming epoch {epoch + 1}/{epochs} complete")
+
+        self.model = Pipeline([("scaler", scaler), ("model", estimator)])
+
+        index = {label: i for i, label in enumerate(classes)}
+        confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+        with self.profiler.phase("predict"):
+            for X, y, holdout in passes():
+                if holdout.any():
+                    y_true = y[holdout].map(index).to_numpy()
+                    y_pred = pd.Series(self.model.predict(X[holdout].to_numpy(dtype=np.float64))).map(index).to_numpy()
+                    np.add.at(confusion, (y_true, y_pred), 1)
+
+        self.metrics = confusion_metrics(confusion)
+        logger.info(
+            f"Streaming holdout ({int(confusion.sum())} rows): "
+            + ", ".join(f"{name}={value:.4f}" for name, value in self.metrics.items())
+        )
+        return self.metrics, rows
+
+    def evaluate(self, X_test: pd.DataFrame, y_test: pd.Series) -> Dict[str, float]:
+        """
+        Evaluate the model on a test set.
+
+        Args:
+            X_test: Test features
+            y_test: Test target
+
+        Returns:
+            Dictionary containing evaluation metrics
+        """
         # Make predictions
-        y_pred = self.model.predict(X_test)
+        with self.profiler.phase("predict"):
+            y_pred = self.model.predict(X_test)
 
         # Calculate metrics
         accuracy = accuracy_score(y_test, y_pred)
@@ -196,12 +883,14 @@ class ModelTrainer:
 
         return self.metrics
 
-    def save_model(self, output_dir: Optional[str] = None) -> str:
+    def save_model(self, output_dir: Optional[str] = None, tag: Optional[str] = None) -> str:
         """
         Save the trained model.
 
         Args:
             output_dir: Directory to save the model (default: models dir)
+            tag: Optional name inserted into the filename, so several models
+                of the same type saved in the same second do not collide
 
         Returns:
             Path to the saved model file
@@ -215,31 +904,380 @@ class ModelTrainer:
         # Generate timestamped filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         model_type = self.config["model_type"]
-        filename = f"{model_type}_{timestamp}.pkl"
-        filepath = output_path / filename
+        stem = f"{model_type}_{tag}_{timestamp}" if tag else f"{model_type}_{timestamp}"
+        filepath = output_path / f"{stem}.pkl"
 
         logger.info(f"Saving model to {filepath}...")
-        joblib.dump(self.model, filepath)
+        with self.profiler.phase("save"):
+            joblib.dump(self.model, filepath)
+
+            # Memory-mappable copy for serving; not every model type has one
+            try:
+                self.artifact_path = save_artifact(
+                    self.model,
+                    str(output_path / f"{stem}{ARTIFACT_SUFFIX}"),
+                    config=self.config,
+                    metrics=self.metrics,
+                    source=str(filepath),
+                )
+            except ArtifactError as e:
+                logger.info(f"No model artifact written: {e}")
         logger.info("Model saved successfully")
 
+        if model_type == "EnsembleStacking":
+            models = self.config.get("ensemble_models", EnsemblePredictor.DEFAULT_MODELS)
+            stacker = StackingModel.from_estimator(self.model, [tuple(m) for m in models])
+            stacking_path = output_path / f"{stem}.stacking.json"
+            with open(stacking_path, "w") as f:
+                json.dump(stacker.to_dict(), f, indent=2)
+            self.stacking_path = str(stacking_path)
+            logger.info(f"Stacking meta-model exported to {stacking_path}")
+
         return str(filepath)
 
+    def verify_artifact(self, X: pd.DataFrame) -> None:
+        """
+        Check the exported artifact's NumPy scorer against the model.
+
+        An artifact whose scorer disagrees with the estimator is removed, so
+        serving never silently falls back to different predictions.
+
+        Args:
+            X: Sample rows (the first SCORER_CHECK_ROWS are used)
+        """
+        if not self.artifact_path:
+            return
+        try:
+            load_scorer(self.artifact_path).verify(self.model, X.iloc[:SCORER_CHECK_ROWS])
+            logger.info(f"Compiled scorer verified on {min(len(X), SCORER_CHECK_ROWS)} rows")
+        except ScorerError as e:
+            logger.warning(f"Removing model artifact {self.artifact_path}: {e}")
+            Path(self.artifact_path).unlink(missing_ok=True)
+            self.artifact_path = None
+
     def load_existing_model(self, model_path: str) -> None:
         """
         Load an existing model for fine-tuning.
 
         Args:
             model_path: Path to the existing model file
+
+        Raises:
+            TrainingError: If the model file is missing or unreadable
         """
         try:
             self.model = joblib.load(model_path)
             logger.info(f"Loaded existing model from {model_path}")
         except FileNotFoundError:
             logger.error(f"Model file not found: {model_path}")
-            sys.exit(1)
+            raise TrainingError(f"Model file not found: {model_path}") from None
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
-            sys.exit(1)
+            raise TrainingError(f"Failed to load model: {e}") from e
+
+
+@contextmanager
+def _updated_params(estimator: Any, params: Dict[str, Any]) -> Iterator[None]:
+    """Set estimator parameters for the duration of an update, then restore them."""
+    original = {name: value for name, value in estimator.get_params(deep=False).items() if name in params}
+    estimator.set_params(**params)
+    try:
+        yield
+    finally:
+        estimator.set_params(**original)
+
+
+def _init_fold_worker(X: pd.DataFrame, y: pd.Series) -> None:
+    """Receive the shared cross-validation data once per worker process."""
+    global _CV_DATA
+    _CV_DATA = (X, y)
+
+
+def _fit_fold(
+    config: Dict[str, Any],
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    random_seed: int,
+) -> Dict[str, float]:
+    """Train a fresh model on one fold of the shared data and score it."""
+    X, y = _CV_DATA
+    trainer = ModelTrainer(random_seed=random_seed, use_cache=False)
+    trainer.config = config
+    trainer.create_model()
+    return trainer.fit_and_evaluate(
+        X.iloc[train_index], X.iloc[test_index], y.iloc[train_index], y.iloc[test_index]
+    )
+
+
+def train(
+    dataset: str,
+    config: str = "model_config.yaml",
+    output_dir: Optional[str] = None,
+    fine_tune: bool = False,
+    model_path: Optional[str] = None,
+    learning_rate: float = 0.001,
+    epochs: int = 5,
+    random_seed: int = 42,
+    batch_size: int = DEFAULT_FINE_TUNE_BATCH_SIZE,
+    use_cache: bool = DATASET_CACHE_ENABLED,
+    cv_folds: int = 0,
+    cv_strategy: str = "stratified",
+    cv_workers: Optional[int] = None,
+    streaming: bool = False,
+    chunk_size: int = DEFAULT_TRAINING_CHUNK_SIZE,
+    profile_path: Optional[str] = None,
+    refit: bool = False,
+) -> TrainingResult:
+    """
+    Run the full training pipeline in the current process.
+
+    Args:
+        dataset: Path to the training CSV
+        config: Path to the model configuration YAML
+        output_dir: Directory for the saved model (default: models dir, or
+            the retrained models dir when fine-tuning)
+        fine_tune: Fine-tune instead of training from scratch
+        model_path: Existing model to fine-tune
+        learning_rate: Learning rate for fine-tuning
+        epochs: Number of passes over the data when fine-tuning a model
+        random_seed: Random seed for reproducibility
+        batch_size: Mini-batch size for incremental fine-tuning
+        use_cache: Reuse parsed datasets from the binary dataset cache
+        cv_folds: Also cross-validate on this many folds (0 disables)
+        cv_strategy: Fold strategy, 'stratified' or 'timeseries'
+        cv_workers: Worker processes for the folds (default: one per fold)
+        streaming: Train out of core on chunks with ``train_streaming``;
+            ``epochs`` is the number of passes
+        chunk_size: Rows per chunk when streaming
+        profile_path: Write a cProfile dump of the run to this file
+        refit: When fine-tuning, refit on the new samples if the model cannot
+            be updated incrementally (otherwise that raises TrainingError)
+
+    Returns:
+        TrainingResult with metrics, model path, per-phase timings and the
+        wall time, CPU time and peak RSS of each training phase
+
+    Raises:
+        TrainingError: If configuration, data or model loading fails
+    """
+    logger.info("="*60)
+    logger.info("ML Pipeline Model Training")
+    logger.info("="*60)
+    logger.info(f"Dataset: {dataset}")
+    logger.info(f"Config: {config}")
+    logger.info(f"Fine-tune: {fine_tune}")
+    if fine_tune and model_path:
+        logger.info(f"Model path: {model_path}")
+    logger.info(f"Learning rate: {learning_rate}")
+    logger.info(f"Epochs: {epochs}")
+    logger.info("="*60)
+
+    # Log training start
+    insert_system_log(
+        component="train_model",
+        status="info",
+        message=f"Training started: {'fine-tune' if fine_tune else 'from scratch'}",
+        details={
+            "dataset": dataset,
+            "fine_tune": fine_tune,
+            "learning_rate": learning_rate,
+            "epochs": epochs,
+        }
+    )
+
+    profiler = cProfile.Profile() if profile_path else None
+    if profiler:
+        profiler.enable()
+
+    try:
+        if cv_folds and (fine_tune or streaming):
+            raise TrainingError("Cross-validation is not supported when fine-tuning or streaming")
+        if streaming and fine_tune:
+            raise TrainingError("Streaming training does not support fine-tuning")
+
+        timings = {}
+        started = time.perf_counter()
+
+        trainer = ModelTrainer(config_path=config, random_seed=random_seed, use_cache=use_cache)
+        trainer.load_config()
+        fine_tune_mode = None
+        cross_validation = None
+
+        if streaming:
+            # Out of core: the dataset is never held in memory as a whole
+            trainer.create_model()
+            timings["prepare_model"] = time.perf_counter() - started
+
+            phase_start = time.perf_counter()
+            metrics, dataset_size = trainer.train_streaming(dataset, chunk_size=chunk_size, epochs=epochs)
+            timings["train_and_evaluate"] = time.perf_counter() - phase_start
+
+            insert_system_log(
+                component="train_model",
+                status="info",
+                message=f"Dataset streamed: {dataset_size} samples",
+                details={"dataset_size": dataset_size, "chunk_size": chunk_size, "epochs": epochs}
+            )
+        else:
+            X, y = trainer.load_data(dataset)
+            dataset_size = len(X)
+            timings["load_data"] = time.perf_counter() - started
+
+            # Log dataset prepared
+            insert_system_log(
+                component="train_model",
+                status="info",
+                message=f"Dataset prepared: {len(X)} samples",
+                details={
+                    "dataset_size": len(X),
+                    "features": len(X.columns),
+                    "memory_mb": trainer.dtype_report["memory_mb"],
+                }
+            )
+
+            # Create or load model
+            phase_start = time.perf_counter()
+            if fine_tune and model_path:
+                trainer.load_existing_model(model_path)
+            else:
+                trainer.create_model(learning_rate=learning_rate if fine_tune else None)
+            timings["prepare_model"] = time.perf_counter() - phase_start
+
+            # An existing model is updated incrementally; otherwise train from scratch
+            phase_start = time.perf_counter()
+            if fine_tune and model_path:
+                metrics, fine_tune_mode = trainer.fine_tune_and_evaluate(
+                    X, y, epochs=epochs, learning_rate=learning_rate, batch_size=batch_size, refit=refit
+                )
+            else:
+                metrics = trainer.train_and_evaluate(X, y)
+            timings["train_and_evaluate"] = time.perf_counter() - phase_start
+
+            if cv_folds:
+                phase_start = time.perf_counter()
+                folds = trainer.load_folds(dataset, y, cv_folds, cv_strategy)
+                cross_validation = {"strategy": cv_strategy, **trainer.cross_validate(X, y, folds, cv_workers)}
+                timings["cross_validate"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        output_dir = output_dir or (str(RETRAINED_MODELS_DIR) if fine_tune else str(MODELS_DIR))
+        saved_path = trainer.save_model(output_dir)
+        if not streaming:
+            trainer.verify_artifact(X)
+        timings["save_model"] = time.perf_counter() - phase_start
+        timings["total"] = time.perf_counter() - started
+
+        result = TrainingResult(
+            model_path=saved_path,
+            metrics=metrics,
+            dataset_size=dataset_size,
+            timings={phase: round(seconds, 4) for phase, seconds in timings.items()},
+            timestamp=datetime.now().isoformat(),
+            stacking_path=trainer.stacking_path,
+            artifact_path=trainer.artifact_path,
+            dtypes=trainer.dtype_report,
+            fine_tune_mode=fine_tune_mode,
+            cross_validation=cross_validation,
+            profile=trainer.profiler.report(),
+            profile_path=profile_path,
+        )
+
+        # Log training success
+        insert_system_log(
+            component="train_model",
+            status="info",
+            message=f"Training completed successfully",
+            details={
+                "metrics": metrics,
+                "model_path": saved_path,
+                "dataset_size": dataset_size,
+                "profile": result.profile,
+            }
+        )
+        logger.info("Training completed successfully")
+
+        return result
+
+    except Exception as e:
+        # Log error with stack trace
+        insert_system_log(
+            component="train_model",
+            status="error",
+            message=f"Training failed: {str(e)}",
+            details={
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "traceback": traceback.format_exc(),
+            }
+        )
+        logger.error(f"Training failed: {e}", exc_info=True)
+        raise
+
+    finally:
+        if profiler:
+            profiler.disable()
+            Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(profile_path)
+            logger.info(f"cProfile stats written to {profile_path} (inspect with: python -m pstats {profile_path})")
+
+
+class TrainingWorker:
+    """
+    Reusable warm subprocess for isolated training runs.
+
+    The worker process is started on first use and kept alive between runs,
+    so pandas, scikit-learn and the Supabase client are imported once. A run
+    that exceeds its timeout terminates the worker; the next run starts a
+    fresh one.
+    """
+
+    def __init__(self):
+        """Initialize the worker; the process starts lazily."""
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(self, timeout: float = TRAINING_TIMEOUT_SECONDS, **train_kwargs) -> TrainingResult:
+        """
+        Run ``train`` in the worker process.
+
+        Args:
+            timeout: Seconds to wait before killing the worker
+            **train_kwargs: Arguments for ``train``
+
+        Returns:
+            TrainingResult from the worker
+
+        Raises:
+            TrainingTimeoutError: If the run exceeds the timeout
+            TrainingError: If training fails in the worker
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(processes=1)
+            pending = self._pool.apply_async(train, kwds=train_kwargs)
+            try:
+                return pending.get(timeout)
+            except multiprocessing.TimeoutError:
+                self._terminate()
+                raise TrainingTimeoutError(f"Training exceeded {timeout}s timeout") from None
+
+    def _terminate(self) -> None:
+        """Kill the worker process."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        with self._lock:
+            self._terminate()
+
+    def __enter__(self) -> "TrainingWorker":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -298,119 +1336,188 @@ def parse_arguments() -> argparse.Namespace:
     )
 
     parser.add_argument(
-        "--random_seed",
+        "--batch_size",
         type=int,
-        default=42,
-        help="Random seed for reproducibility (default: 42)",
+        default=DEFAULT_FINE_TUNE_BATCH_SIZE,
+        help=f"Mini-batch size for incremental fine-tuning (default: {DEFAULT_FINE_TUNE_BATCH_SIZE})",
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        "--refit",
+        action="store_true",
+        help="When fine-tuning, refit on the new samples if the model cannot be updated incrementally",
+    )
 
+    parser.add_argument(
+        "--cv_folds",
+        type=int,
+        default=0,
+        help="Also report mean/std metrics over this many CV folds (default: 0, disabled)",
+    )
 
-def main():
-    """Main execution function."""
-    args = parse_arguments()
+    parser.add_argument(
+        "--cv_strategy",
+        type=str,
+        default="stratified",
+        choices=CV_STRATEGIES,
+        help="Fold strategy for --cv_folds (default: stratified)",
+    )
 
-    logger.info("="*60)
-    logger.info("ML Pipeline Model Training")
-    logger.info("="*60)
-    logger.info(f"Dataset: {args.dataset}")
-    logger.info(f"Config: {args.config}")
-    logger.info(f"Fine-tune: {args.fine_tune}")
-    if args.fine_tune and args.model_path:
-        logger.info(f"Model path: {args.model_path}")
-    logger.info(f"Learning rate: {args.learning_rate}")
-    logger.info(f"Epochs: {args.epochs}")
-    logger.info("="*60)
+    parser.add_argument(
+        "--cv_workers",
+        type=int,
+        default=None,
+        help="Worker processes for the CV folds (default: one per fold)",
+    )
 
-    # Log training start
-    insert_system_log(
-        component="train_model",
-        status="info",
-        message=f"Training started: {'fine-tune' if args.fine_tune else 'from scratch'}",
-        details={
-            "dataset": args.dataset,
-            "fine_tune": args.fine_tune,
-            "learning_rate": args.learning_rate,
-            "epochs": args.epochs,
-        }
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Train out of core on dataset chunks (needs an incremental model, e.g. SGDClassifier)",
     )
 
-    try:
-        # Initialize trainer
-        trainer = ModelTrainer(config_path=args.config, random_seed=args.random_seed)
+    parser.add_argument(
+        "--chunk_size",
+        type=int,
+        default=DEFAULT_TRAINING_CHUNK_SIZE,
+        help=f"Rows per chunk for --streaming (default: {DEFAULT_TRAINING_CHUNK_SIZE})",
+    )
 
-        # Load configuration
-        trainer.load_config()
+    parser.add_argument(
+        "--profile",
+        type=str,
+        nargs="?",
+        const="train_model.prof",
+        default=None,
+        help="Write cProfile stats of the run to this file (default: train_model.prof)",
+    )
 
-        # Load and validate data
-        X, y = trainer.load_data(args.dataset)
-        
-        # Log dataset prepared
-        insert_system_log(
-            component="train_model",
-            status="info",
-            message=f"Dataset prepared: {len(X)} samples",
-            details={"dataset_size": len(X), "features": len(X.columns)}
-        )
+    parser.add_argument(
+        "--search",
+        action="store_true",
+        help="Search the config's search_space with successive halving instead of training",
+    )
 
-        # Create or load model
-        if args.fine_tune and args.model_path:
-            trainer.load_existing_model(args.model_path)
-        else:
-            trainer.create_model(learning_rate=args.learning_rate if args.fine_tune else None)
+    parser.add_argument(
+        "--search_output",
+        type=str,
+        default=None,
+        help="Tuned config written by --search (default: <config>_tuned.yaml)",
+    )
 
-        # Train and evaluate
-        metrics = trainer.train_and_evaluate(X, y)
+    parser.add_argument(
+        "--search_candidates",
+        type=int,
+        default=27,
+        help="Candidates sampled for the first search rung (default: 27)",
+    )
 
-        # Save model
-        output_dir = args.output_dir or (str(RETRAINED_MODELS_DIR) if args.fine_tune else str(MODELS_DIR))
-        model_path = trainer.save_model(output_dir)
+    parser.add_argument(
+        "--search_eta",
+        type=int,
+        default=3,
+        help="Keep 1/eta of the candidates per rung (default: 3)",
+    )
 
-        # Log training success
-        insert_system_log(
-            component="train_model",
-            status="info",
-            message=f"Training completed successfully",
-            details={
-                "metrics": metrics,
-                "model_path": model_path,
-                "dataset_size": len(X),
-            }
-        )
+    parser.add_argument(
+        "--search_metric",
+        type=str,
+        default="accuracy",
+        help="Validation metric to maximize (default: accuracy)",
+    )
 
-        # Output metrics as JSON for integration with auto_reinforcement.py
-        metrics_output = {
-            "status": "success",
-            "model_path": model_path,
-            "metrics": metrics,
-            "dataset_size": len(X),
-            "timestamp": datetime.now().isoformat(),
-        }
+    parser.add_argument(
+        "--max_fits",
+        type=int,
+        default=None,
+        help="Search budget in model fits",
+    )
 
-        print(json.dumps(metrics_output, indent=2))
-        logger.info("Training completed successfully")
+    parser.add_argument(
+        "--max_seconds",
+        type=float,
+        default=None,
+        help="Search budget in wall-clock seconds",
+    )
+
+    parser.add_argument(
+        "--search_workers",
+        type=int,
+        default=None,
+        help="Worker processes for the search (default: CPU count)",
+    )
+
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Parse the dataset instead of using the binary dataset cache",
+    )
+
+    parser.add_argument(
+        "--random_seed",
+        type=int,
+        default=42,
+        help="Random seed for reproducibility (default: 42)",
+    )
 
+    return parser.parse_args()
+
+
+def main():
+    """Main execution function."""
+    args = parse_arguments()
+
+    if args.search:
+        from .hyperparameter_search import successive_halving
+
+        try:
+            report = successive_halving(
+                dataset=args.dataset,
+                config=args.config,
+                output_config=args.search_output,
+                n_candidates=args.search_candidates,
+                eta=args.search_eta,
+                metric=args.search_metric,
+                max_fits=args.max_fits,
+                max_seconds=args.max_seconds,
+                workers=args.search_workers,
+                random_seed=args.random_seed,
+                use_cache=not args.no_cache,
+            )
+        except Exception as e:
+            logger.error(f"Hyperparameter search failed: {e}")
+            return 1
+
+        print(json.dumps(report, indent=2))
         return 0
-    
-    except Exception as e:
-        # Log error with stack trace
-        error_details = {
-            "error": str(e),
-            "error_type": type(e).__name__,
-            "traceback": traceback.format_exc(),
-        }
-        
-        insert_system_log(
-            component="train_model",
-            status="error",
-            message=f"Training failed: {str(e)}",
-            details=error_details
+
+    try:
+        result = train(
+            dataset=args.dataset,
+            config=args.config,
+            output_dir=args.output_dir,
+            fine_tune=args.fine_tune,
+            model_path=args.model_path,
+            learning_rate=args.learning_rate,
+            epochs=args.epochs,
+            random_seed=args.random_seed,
+            batch_size=args.batch_size,
+            use_cache=not args.no_cache,
+            cv_folds=args.cv_folds,
+            cv_strategy=args.cv_strategy,
+            cv_workers=args.cv_workers,
+            streaming=args.streaming,
+            chunk_size=args.chunk_size,
+            profile_path=args.profile,
+            refit=args.refit,
         )
-        
-        logger.error(f"Training failed: {e}", exc_info=True)
+    except Exception:
         return 1
 
+    # Output metrics as JSON for integration with auto_reinforcement.py
+    print(json.dumps(result.to_dict(), indent=2))
+    return 0
+
 
 if __name__ == "__main__":
     sys.exit(main())
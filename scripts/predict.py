@@ -8,10 +8,14 @@ import sys
 import yaml
 import pandas as pd
 from pathlib import Path
-from sklearn.linear_model import LogisticRegression
 import joblib
 import numpy as np
 
+# Make ml_pipeline importable when run as `python scripts/predict.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ml_pipeline.compiled_scorer import load_scorer
+
 
 def load_config(config_path: str = "model_config.yaml") -> dict:
     """Load the ML configuration from YAML file."""
@@ -22,14 +26,20 @@ def load_config(config_path: str = "model_config.yaml") -> dict:
 def load_model(model_id: str, model_path: str = "models/") -> object:
     """
     Load a trained model from disk.
-    Note: In a real implementation, this would load the actual trained model.
-    For demo purposes, we'll create a mock model.
+    A compiled `.artifact` is preferred: it is memory-mapped and scored with
+    NumPy only, so scikit-learn is never imported. Otherwise the `.pkl` is
+    unpickled. For demo purposes, a mock model is created if neither exists.
     """
+    artifact_file = Path(model_path) / f"{model_id}.artifact"
     model_file = Path(model_path) / f"{model_id}.pkl"
     
-    if model_file.exists():
+    if artifact_file.exists():
+        return load_scorer(str(artifact_file))
+    elif model_file.exists():
         return joblib.load(model_file)
     else:
+        from sklearn.linear_model import LogisticRegression
+
         # Create a mock model for demonstration
         print(f"⚠️  Mock model created for {model_id} (real model not found)")
         model = LogisticRegression()
@@ -0,0 +1,131 @@
+"""Unit tests for ensemble conflict and calibration analytics."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_pipeline.ensemble_analytics import analyze_conflicts, main, suggest_conflict_threshold
+from ml_pipeline.ensemble_predictor import EnsemblePredictor
+
+LABELS = np.array(["home_win", "draw", "away_win"], dtype=object)
+
+
+def make_log(n_rows=2000, seed=11):
+    """Synthetic log where agreeing sub-models are usually right."""
+    rng = np.random.default_rng(seed)
+    actual = rng.integers(0, 3, n_rows)
+    agree = rng.random(n_rows) < 0.6
+    ft = np.where(agree, actual, rng.integers(0, 3, n_rows))
+    ht = np.where(agree, actual, rng.integers(0, 3, n_rows))
+    pt = np.where(agree, actual, rng.integers(0, 3, n_rows))
+    return pd.DataFrame({
+        "actual_result": LABELS[actual],
+        "full_time_prediction": LABELS[ft],
+        "full_time_confidence": rng.uniform(0.4, 0.9, n_rows),
+        "half_time_prediction": LABELS[ht],
+        "half_time_confidence": rng.uniform(0.4, 0.9, n_rows),
+        "pattern_prediction": LABELS[pt],
+        "pattern_confidence": rng.uniform(0.4, 0.9, n_rows),
+    })
+
+
+class TestEnsembleAnalytics:
+    """Test suite for conflict-region analytics."""
+    
+    def test_histograms_match_batch_scoring(self):
+        """Test per-bin counts and accuracy agree with predict_batch."""
+        frame = make_log()
+        report = analyze_conflicts(frame, bins=10)
+        
+        predictor = EnsemblePredictor()
+        outcomes, confidences, mask = predictor.frame_to_votes(frame)
+        batch = predictor.predict_batch(outcomes, confidences, mask)
+        correct = batch["winner"] == predictor.encode_outcomes(frame["actual_result"].to_numpy())
+        
+        assert report["rows"] == len(frame)
+        assert report["accuracy"] == round(correct.mean(), 4)
+        assert sum(row["count"] for row in report["margin_histogram"]) == len(frame)
+        assert sum(row["count"] for row in report["reliability"]) == len(frame)
+        
+        first = report["margin_histogram"][0]
+        in_bin = batch["conflict_margin"] < first["bin_end"]
+        assert first["count"] == in_bin.sum()
+        assert first["accuracy"] == round(correct[in_bin].mean(), 4)
+        
+        threshold = report["conflict_threshold"]
+        assert threshold["current"] == EnsemblePredictor.CONFLICT_THRESHOLD
+        assert threshold["current_flag_rate"] == round(batch["conflict_detected"].mean(), 4)
+    
+    def test_ece_matches_reference(self):
+        """Test ECE equals the count-weighted confidence/accuracy gap."""
+        frame = make_log()
+        report = analyze_conflicts(frame, bins=20)
+        
+        expected = sum(
+            row["count"] / report["rows"] * abs(row["accuracy"] - row["mean_confidence"])
+            for row in report["reliability"]
+        )
+        assert report["ece"] == pytest.approx(expected, abs=1e-3)
+    
+    def test_streamed_log_matches_in_memory(self, tmp_path):
+        """Test chunked CSV streaming gives the same report as a DataFrame."""
+        frame = make_log(n_rows=700)
+        frame.loc[4, "actual_result"] = None
+        frame.to_csv(tmp_path / "log.csv", index=False)
+        
+        streamed = analyze_conflicts(tmp_path / "log.csv", chunk_size=128)
+        in_memory = analyze_conflicts(frame)
+        
+        assert streamed["rows"] == len(frame) - 1
+        assert streamed["margin_histogram"] == in_memory["margin_histogram"]
+        assert streamed["reliability"] == in_memory["reliability"]
+        assert streamed["conflict_threshold"] == in_memory["conflict_threshold"]
+    
+    def test_suggest_conflict_threshold(self):
+        """Test the suggestion is the widest low-margin region below target accuracy."""
+        edges = np.linspace(0.0, 1.0, 11)
+        counts = np.array([40, 40, 40, 40, 0, 0, 0, 0, 0, 0])
+        correct = np.array([10, 18, 24, 36, 0, 0, 0, 0, 0, 0])
+        
+        # Cumulative accuracy: 0.25, 0.35, 0.43, 0.5
+        assert suggest_conflict_threshold(edges, counts, correct, 0.5, 30) == pytest.approx(0.3)
+        assert suggest_conflict_threshold(edges, counts, correct, 0.3, 30) == pytest.approx(0.1)
+        assert suggest_conflict_threshold(edges, counts, correct, 0.3, 50) is None
+    
+    def test_invalid_rows_are_skipped(self):
+        """Test unknown labels and out-of-range confidences are dropped and counted."""
+        frame = make_log(n_rows=300)
+        frame.loc[3, "full_time_prediction"] = "abandoned"
+        frame.loc[7, "half_time_confidence"] = 1.5
+        frame.loc[9, "actual_result"] = "void"
+        
+        report = analyze_conflicts(frame)
+        expected = analyze_conflicts(frame.drop(index=[3, 7, 9]))
+        
+        assert report["invalid_rows"] == 3
+        assert report["rows"] == len(frame) - 3
+        assert report["margin_histogram"] == expected["margin_histogram"]
+        assert expected["invalid_rows"] == 0
+    
+    def test_missing_actual_column(self):
+        """Test logs without the actual outcome column are rejected."""
+        frame = make_log(n_rows=50).drop(columns=["actual_result"])
+        
+        with pytest.raises(ValueError, match="actual_result"):
+            analyze_conflicts(frame)
+    
+    def test_cli_writes_report(self, tmp_path, monkeypatch):
+        """Test the CLI writes a JSON report."""
+        make_log(n_rows=300).to_csv(tmp_path / "log.csv", index=False)
+        output = tmp_path / "report.json"
+        monkeypatch.setattr(
+            "sys.argv",
+            ["ensemble_analytics", str(tmp_path / "log.csv"), "--bins", "10", "--output", str(output)],
+        )
+        
+        assert main() == 0
+        report = json.loads(output.read_text())
+        assert report["bins"] == 10
+        assert "suggested" in report["conflict_threshold"]
@@ -0,0 +1,64 @@
+"""Unit tests for the ensemble benchmark module."""
+
+import numpy as np
+
+from ml_pipeline.ensemble_benchmark import (
+    BATCH_PATHS,
+    SCALAR_PATHS,
+    _synthetic_chunk,
+    compare_results,
+    run_microbenchmark,
+    run_suite,
+)
+
+
+class TestEnsembleBenchmark:
+    """Test suite for ensemble benchmarks."""
+    
+    def test_microbenchmark_reports_all_paths(self):
+        """Test the microbenchmark measures every scalar path."""
+        result = run_microbenchmark(iterations=200, seed=1)
+        
+        assert set(result["calls_per_second"]) == {"predict", "predict_fast_labels", "predict_fast_codes"}
+        assert all(value > 0 for value in result["calls_per_second"].values())
+        assert result["speedup_vs_predict"]["predict"] == 1.0
+    
+    def test_suite_reports_every_scenario(self):
+        """Test the suite covers each path and size with latency and memory."""
+        result = run_suite(sizes=(1, 250), seed=3, scalar_limit=100, batch_size=64)
+        
+        assert set(result["results"]) == {
+            f"{path}@{size}" for size in (1, 250) for path in SCALAR_PATHS + BATCH_PATHS
+        }
+        batch = result["results"]["predict_batch@250"]
+        assert batch["calls"] == 4
+        assert batch["sampled"] is False
+        assert batch["p50_ms"] <= batch["p99_ms"]
+        assert batch["peak_memory_mb"] > 0
+        assert result["results"]["predict@250"]["sampled"] is True
+        assert result["meta"]["seed"] == 3
+    
+    def test_synthetic_chunks_are_reproducible(self):
+        """Test seeded chunks are identical across runs and always scorable."""
+        first = _synthetic_chunk(7, 2, 500, 3)
+        second = _synthetic_chunk(7, 2, 500, 3)
+        
+        assert all(np.array_equal(first[key], second[key]) for key in first)
+        assert first["mask"].any(axis=1).all()
+    
+    def test_compare_flags_throughput_regressions(self):
+        """Test scenarios slower than the threshold are reported."""
+        baseline = {"meta": {"commit": "a"}, "results": {
+            "predict@1000": {"items_per_second": 1000.0},
+            "predict_batch@1000": {"items_per_second": 1000.0},
+        }}
+        current = {"meta": {"commit": "b"}, "results": {
+            "predict@1000": {"items_per_second": 950.0},
+            "predict_batch@1000": {"items_per_second": 800.0},
+            "config_swap@1000": {"items_per_second": 10.0},
+        }}
+        
+        comparison = compare_results(baseline, current, threshold=0.1)
+        
+        assert comparison["regressions"] == ["predict_batch@1000"]
+        assert comparison["throughput_ratio"] == {"predict@1000": 0.95, "predict_batch@1000": 0.8}
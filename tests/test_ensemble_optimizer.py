@@ -0,0 +1,142 @@
+"""Unit tests for the ensemble weight optimizer."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_pipeline.ensemble_optimizer import (
+    evaluate_weights,
+    optimize_weights,
+    prepare_vote_arrays,
+    refine_grid,
+    simplex_grid,
+    write_weights_config,
+)
+from ml_pipeline.ensemble_predictor import EnsemblePredictor, load_weights_file
+
+LABELS = np.array(["home_win", "draw", "away_win"], dtype=object)
+
+
+def make_log(n_rows=600, seed=3):
+    """Synthetic log where FT is usually right and HT/PT are noise."""
+    rng = np.random.default_rng(seed)
+    actual = rng.integers(0, 3, n_rows)
+    ft = np.where(rng.random(n_rows) < 0.8, actual, rng.integers(0, 3, n_rows))
+    frame = pd.DataFrame({
+        "actual_result": LABELS[actual],
+        "full_time_prediction": LABELS[ft],
+        "full_time_confidence": rng.uniform(0.5, 0.9, n_rows),
+        "half_time_prediction": LABELS[rng.integers(0, 3, n_rows)],
+        "half_time_confidence": rng.uniform(0.5, 0.9, n_rows),
+        "pattern_prediction": LABELS[rng.integers(0, 3, n_rows)],
+        "pattern_confidence": rng.uniform(0.5, 0.9, n_rows),
+    })
+    # Some rows miss the half-time model entirely
+    frame.loc[frame.index % 7 == 0, ["half_time_prediction", "half_time_confidence"]] = None
+    return frame
+
+
+class TestEnsembleOptimizer:
+    """Test suite for ensemble weight optimization."""
+    
+    def test_simplex_grid(self):
+        """Test grid points cover the simplex at the given resolution."""
+        grid = simplex_grid(3, 0.1)
+        assert len(grid) == 66
+        np.testing.assert_allclose(grid.sum(axis=1), 1.0)
+        assert (grid >= 0).all()
+    
+    def test_refine_grid_stays_on_simplex(self):
+        """Test refined points are non-negative and sum to one."""
+        grid = refine_grid(np.array([[1.0, 0.0, 0.0], [0.5, 0.3, 0.2]]), 0.02, 5)
+        np.testing.assert_allclose(grid.sum(axis=1), 1.0)
+        assert (grid >= 0).all()
+        assert len(grid) == len(np.unique(grid, axis=0))
+    
+    def test_accuracy_matches_predict_batch(self):
+        """Test vectorized accuracy agrees with the predictor's own winners."""
+        frame = make_log()
+        predictor = EnsemblePredictor()
+        arrays = prepare_vote_arrays(frame, predictor)
+        candidates = simplex_grid(3, 0.25)
+        
+        scores = evaluate_weights(arrays, candidates, "accuracy", chunk_size=97)
+        
+        outcomes, confidences, mask = predictor.frame_to_votes(frame)
+        for candidate, score in zip(candidates, scores):
+            if (mask @ candidate == 0).any():
+                continue
+            weights = dict(zip(predictor.model_keys, candidate))
+            batch = EnsemblePredictor(weights=weights).predict_batch(outcomes, confidences, mask)
+            expected = (batch["winner"] == arrays["actual"]).mean()
+            assert score == pytest.approx(expected)
+    
+    def test_probabilistic_metrics(self):
+        """Test log-loss and Brier against a direct computation."""
+        frame = make_log(n_rows=50)
+        arrays = prepare_vote_arrays(frame, EnsemblePredictor())
+        weights = np.array([0.5, 0.3, 0.2])
+        
+        presence = arrays["presence"]
+        normalized = presence * weights / (presence @ weights)[:, None]
+        probabilities = np.einsum("nm,onm->no", normalized, arrays["distributions"])
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+        target = np.eye(3)[arrays["actual"]]
+        
+        log_loss = evaluate_weights(arrays, weights[None, :], "log_loss")[0]
+        brier = evaluate_weights(arrays, weights[None, :], "brier")[0]
+        
+        rows = np.arange(len(target))
+        assert log_loss == pytest.approx(-np.log(probabilities[rows, arrays["actual"]]).mean())
+        assert brier == pytest.approx(((probabilities - target) ** 2).sum(axis=1).mean())
+    
+    def test_optimize_weights_favours_informative_model(self):
+        """Test the search moves weight onto the accurate sub-model."""
+        frame = make_log()
+        result = optimize_weights(frame, metric="log_loss", step=0.1, levels=2)
+        
+        assert set(result["weights"]) == {"ft", "ht", "pt"}
+        assert sum(result["weights"].values()) == pytest.approx(1.0)
+        assert result["weights"]["ft"] > 0.8
+        assert result["score"] <= result["baseline_score"]
+        assert result["rows"] == len(frame)
+    
+    def test_invalid_rows_are_skipped(self):
+        """Test unknown labels and out-of-range confidences are dropped and counted."""
+        frame = make_log(n_rows=200)
+        frame.loc[1, "full_time_prediction"] = "abandoned"
+        frame.loc[2, "pattern_confidence"] = -0.2
+        frame.loc[3, "actual_result"] = "void"
+        
+        result = optimize_weights(frame, step=0.25, levels=1)
+        expected = optimize_weights(frame.drop(index=[1, 2, 3]), step=0.25, levels=1)
+        
+        assert result["invalid_rows"] == 3
+        assert result["rows"] == len(frame) - 3
+        assert result["score"] == pytest.approx(expected["score"])
+        assert expected["invalid_rows"] == 0
+    
+    def test_optimize_weights_process_pool_matches_serial(self):
+        """Test the process pool path returns the serial result."""
+        frame = make_log(n_rows=200)
+        serial = optimize_weights(frame, metric="brier", step=0.25, levels=2)
+        pooled = optimize_weights(frame, metric="brier", step=0.25, levels=2, workers=2)
+        
+        assert pooled["weights"] == serial["weights"]
+        assert pooled["score"] == pytest.approx(serial["score"])
+    
+    def test_written_config_loads_into_predictor(self, tmp_path):
+        """Test the output file feeds EnsemblePredictor directly."""
+        result = optimize_weights(make_log(n_rows=100), step=0.25, levels=1)
+        path = write_weights_config(result, str(tmp_path / "weights.json"))
+        
+        predictor = EnsemblePredictor(weights=load_weights_file(path))
+        assert predictor.get_config() == result["weights"]
+        assert json.loads(open(path).read())["metric"] == "accuracy"
+    
+    def test_unknown_metric_raises_error(self):
+        """Test that unsupported metrics are rejected."""
+        with pytest.raises(ValueError, match="Unknown metric"):
+            optimize_weights(make_log(n_rows=10), metric="auc")
@@ -1,7 +1,21 @@
 """Unit tests for EnsemblePredictor."""
 
+import json
+import threading
+
+import numpy as np
 import pytest
-from ml_pipeline.ensemble_predictor import EnsemblePredictor
+from ml_pipeline.ensemble_predictor import (
+    OUTCOME_LOOKUP,
+    OUTPUT_LABELS,
+    EnsemblePredictor,
+    EnsembleResult,
+    StackingModel,
+    WeightRefresher,
+    load_stacking_model,
+    load_weights_file,
+    stacking_features,
+)
 
 
 class TestEnsemblePredictor:
@@ -235,3 +249,670 @@ class TestEnsemblePredictor:
         assert result1["final_confidence"] == result2["final_confidence"]
         assert result1["scores"] == result2["scores"]
         assert result1["conflict_detected"] == result2["conflict_detected"]
+
+
+class TestEnsemblePredictorBatch:
+    """Test suite for the vectorized predict_batch API."""
+    
+    def _scalar_reference(self, predictor, outcomes, confidences, mask):
+        """Run the scalar predict path row by row."""
+        labels = ["home_win", "draw", "away_win"]
+        results = []
+        for row in range(len(outcomes)):
+            kwargs = {}
+            for column, (pred_key, conf_key) in enumerate([
+                ("full_time_prediction", "full_time_confidence"),
+                ("half_time_prediction", "half_time_confidence"),
+                ("pattern_prediction", "pattern_confidence"),
+            ]):
+                if mask[row, column]:
+                    kwargs[pred_key] = labels[outcomes[row, column]]
+                    kwargs[conf_key] = float(confidences[row, column])
+            results.append(predictor.predict(**kwargs))
+        return results
+    
+    def test_predict_batch_matches_scalar_path(self):
+        """Test batch results are identical to row-by-row predict calls."""
+        rng = np.random.default_rng(7)
+        predictor = EnsemblePredictor()
+        outcomes = rng.integers(0, 3, size=(500, 3))
+        confidences = rng.random((500, 3))
+        mask = rng.random((500, 3)) > 0.25
+        mask[~mask.any(axis=1), 0] = True
+        
+        batch = predictor.predict_batch(outcomes, confidences, mask)
+        reference = self._scalar_reference(predictor, outcomes, confidences, mask)
+        
+        winners = predictor.decode_outcomes(batch["winner"])
+        for row, expected in enumerate(reference):
+            assert winners[row] == expected["winner"]
+            assert batch["final_confidence"][row] == pytest.approx(expected["final_confidence"], abs=1e-12)
+            assert bool(batch["conflict_detected"][row]) == expected["conflict_detected"]
+            assert batch["conflict_margin"][row] == pytest.approx(expected["conflict_margin"], abs=1e-12)
+    
+    def test_predict_batch_reweights_missing_models(self):
+        """Test dynamic reweighting when a model is masked out."""
+        predictor = EnsemblePredictor()
+        outcomes = predictor.encode_outcomes([["home_win", "draw", "away_win"]])
+        confidences = np.array([[0.6, 0.9, 0.5]])
+        
+        batch = predictor.predict_batch(outcomes, confidences, mask=[[True, False, True]])
+        
+        # FT 0.5/0.7 * 0.6 = 0.4286 beats PT 0.2/0.7 * 0.5 = 0.1429
+        assert batch["winner"][0] == EnsemblePredictor.OUTCOME_CODES["HOME"]
+        assert batch["final_confidence"][0] == pytest.approx(0.4286, abs=1e-4)
+    
+    def test_predict_batch_nan_confidence_is_missing(self):
+        """Test that NaN confidences are treated as absent models."""
+        predictor = EnsemblePredictor()
+        batch = predictor.predict_batch(
+            np.array([[2, 0, 0]]),
+            np.array([[0.8, np.nan, np.nan]]),
+        )
+        
+        assert predictor.decode_outcomes(batch["winner"])[0] == "away_win"
+        assert batch["final_confidence"][0] == 0.8
+    
+    def test_predict_batch_row_without_models_raises_error(self):
+        """Test that a row with every model missing raises an error."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="At least one sub-model"):
+            predictor.predict_batch(
+                np.zeros((2, 3), dtype=int),
+                np.full((2, 3), 0.5),
+                mask=[[True, True, True], [False, False, False]],
+            )
+    
+    def test_predict_batch_invalid_confidence_raises_error(self):
+        """Test that out-of-range confidences raise an error."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="confidence must be in range"):
+            predictor.predict_batch(np.zeros((1, 3), dtype=int), np.array([[1.5, 0.5, 0.5]]))
+    
+    def test_predict_batch_invalid_shape_raises_error(self):
+        """Test that arrays with the wrong number of models raise an error."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="outcomes must have shape"):
+            predictor.predict_batch(np.zeros((4, 2), dtype=int), np.zeros((4, 2)))
+    
+    def test_encode_outcomes_accepts_all_spellings(self):
+        """Test encoding of the accepted outcome spellings."""
+        predictor = EnsemblePredictor()
+        codes = predictor.encode_outcomes(["HOME", "home_win", "Draw", "AWAY", "away_win"])
+        assert codes.tolist() == [0, 0, 1, 2, 2]
+        
+        with pytest.raises(ValueError, match="Invalid outcome"):
+            predictor.encode_outcomes(["home_win", "lose"])
+
+
+class TestEnsemblePredictorProbabilities:
+    """Test suite for probability-distribution voting."""
+    
+    def test_predict_proba_batch_is_weighted_mixture(self):
+        """Test scores are the weight-averaged sub-model distributions."""
+        predictor = EnsemblePredictor()
+        probabilities = np.array([[
+            [0.6, 0.3, 0.1],
+            [0.2, 0.5, 0.3],
+            [0.4, 0.4, 0.2],
+        ]])
+        
+        batch = predictor.predict_proba_batch(probabilities)
+        
+        expected = 0.5 * probabilities[0, 0] + 0.3 * probabilities[0, 1] + 0.2 * probabilities[0, 2]
+        np.testing.assert_allclose(batch["scores"][0], expected)
+        assert batch["scores"][0].sum() == pytest.approx(1.0)
+        assert batch["winner"][0] == EnsemblePredictor.OUTCOME_CODES["HOME"]
+        assert batch["conflict_detected"][0]  # 0.46 vs 0.38
+    
+    def test_predict_proba_batch_reweights_missing_models(self):
+        """Test that masked and NaN models are dropped and weights renormalized."""
+        predictor = EnsemblePredictor()
+        probabilities = np.array([
+            [[0.1, 0.1, 0.8], [np.nan, np.nan, np.nan], [0.1, 0.7, 0.2]],
+            [[0.1, 0.1, 0.8], [0.9, 0.05, 0.05], [0.1, 0.7, 0.2]],
+        ])
+        
+        batch = predictor.predict_proba_batch(probabilities, mask=[[True, True, True], [True, False, True]])
+        
+        expected = (0.5 * probabilities[0, 0] + 0.2 * probabilities[0, 2]) / 0.7
+        np.testing.assert_allclose(batch["scores"][0], expected)
+        np.testing.assert_allclose(batch["scores"][1], expected)
+        assert predictor.decode_outcomes(batch["winner"]).tolist() == ["away_win", "away_win"]
+    
+    def test_predict_proba_batch_one_hot_matches_vote_winner(self):
+        """Test one-hot distributions reproduce the top-1 voting winner."""
+        rng = np.random.default_rng(11)
+        predictor = EnsemblePredictor()
+        outcomes = rng.integers(0, 3, size=(200, 3))
+        probabilities = np.eye(3)[outcomes]
+        
+        proba_batch = predictor.predict_proba_batch(probabilities)
+        vote_batch = predictor.predict_batch(outcomes, np.ones((200, 3)))
+        
+        np.testing.assert_array_equal(proba_batch["winner"], vote_batch["winner"])
+        np.testing.assert_array_equal(proba_batch["conflict_detected"], vote_batch["conflict_detected"])
+    
+    def test_predict_proba_batch_invalid_distribution_raises_error(self):
+        """Test that vectors not summing to 1 raise an error."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="must sum to 1"):
+            predictor.predict_proba_batch(np.full((1, 3, 3), 0.5))
+    
+    def test_predict_proba_single_match(self):
+        """Test the single-match wrapper returns a predict-style breakdown."""
+        predictor = EnsemblePredictor()
+        result = predictor.predict_proba(
+            full_time_probabilities=[0.2, 0.3, 0.5],
+            pattern_probabilities=[0.3, 0.3, 0.4],
+        )
+        
+        assert result["winner"] == "away_win"
+        assert result["weights_used"]["ht"] == 0.0
+        assert set(result["votes"]) == {"full_time", "pattern"}
+        assert sum(result["scores"].values()) == pytest.approx(1.0)
+    
+    def test_predict_proba_no_models_raises_error(self):
+        """Test that providing no distributions raises an error."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="At least one sub-model"):
+            predictor.predict_proba()
+
+
+class TestEnsemblePredictorRegistry:
+    """Test suite for N-model sub-model registry."""
+    
+    FOUR_MODELS = [("ft", "full_time"), ("ht", "half_time"), ("pt", "pattern"), ("xg", "xg")]
+    FOUR_WEIGHTS = {"ft": 0.4, "ht": 0.2, "pt": 0.1, "xg": 0.3}
+    
+    def test_default_registry_is_backwards_compatible(self):
+        """Test the default registry keeps the three-model output shape."""
+        predictor = EnsemblePredictor()
+        assert predictor.model_keys == ("ft", "ht", "pt")
+        assert predictor.model_names == ("full_time", "half_time", "pattern")
+        
+        result = predictor.predict(full_time_prediction="draw", full_time_confidence=0.6)
+        assert set(result["weights_used"]) == {"ft", "ht", "pt"}
+    
+    def test_predict_with_fourth_model(self):
+        """Test a fourth sub-model participates via <name>_prediction kwargs."""
+        predictor = EnsemblePredictor(weights=self.FOUR_WEIGHTS, models=self.FOUR_MODELS)
+        result = predictor.predict(
+            full_time_prediction="home_win",
+            full_time_confidence=0.6,
+            xg_prediction="away_win",
+            xg_confidence=0.9,
+        )
+        
+        # HOME = 0.6 * 0.4/0.7 = 0.343, AWAY = 0.9 * 0.3/0.7 = 0.386
+        assert result["winner"] == "away_win"
+        assert set(result["votes"]) == {"full_time", "xg"}
+        assert result["weights_used"]["xg"] == pytest.approx(0.3 / 0.7)
+        assert result["weights_used"]["ht"] == 0.0
+    
+    def test_predict_votes_keyed_by_model_key(self):
+        """Test predict_votes matches the keyword predict path."""
+        predictor = EnsemblePredictor()
+        by_kwargs = predictor.predict(
+            full_time_prediction="home_win",
+            full_time_confidence=0.7,
+            pattern_prediction="draw",
+            pattern_confidence=0.8,
+        )
+        by_key = predictor.predict_votes({"ft": ("home_win", 0.7), "pt": ("draw", 0.8)})
+        assert by_key == by_kwargs
+    
+    def test_register_model(self):
+        """Test registering a model extends batch columns and config."""
+        predictor = EnsemblePredictor()
+        predictor.register_model("odds", "market_odds", 0.25)
+        
+        assert predictor.model_keys[-1] == "odds"
+        assert predictor.get_config()["odds"] == 0.25
+        
+        batch = predictor.predict_batch(
+            np.array([[0, 0, 0, 2]]),
+            np.array([[0.5, 0.5, 0.5, 0.5]]),
+            mask=[[True, False, False, True]],
+        )
+        # FT 0.5/0.75 beats odds 0.25/0.75
+        assert batch["winner"][0] == 0
+    
+    def test_register_duplicate_model_raises_error(self):
+        """Test that re-registering a key raises an error."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="unique"):
+            predictor.register_model("ft", "another_full_time", 0.1)
+        assert predictor.model_keys == ("ft", "ht", "pt")
+    
+    def test_unregistered_inputs_raise_error(self):
+        """Test that votes and weights for unknown models are rejected."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="unregistered"):
+            predictor.predict(xg_prediction="home_win", xg_confidence=0.5)
+        with pytest.raises(ValueError, match="unregistered"):
+            predictor.predict_votes({"xg": ("home_win", 0.5)})
+        with pytest.raises(ValueError, match="Invalid weights"):
+            predictor.update_config(self.FOUR_WEIGHTS)
+    
+    def test_missing_weight_for_registered_model_raises_error(self):
+        """Test every registered model needs a weight."""
+        with pytest.raises(ValueError, match="Weights must contain keys"):
+            EnsemblePredictor(models=self.FOUR_MODELS)
+
+
+class TestEnsemblePredictorSnapshots:
+    """Test suite for atomic weight snapshots and refresh."""
+    
+    def test_update_config_swaps_snapshot(self):
+        """Test updates install a new snapshot and leave the old one intact."""
+        predictor = EnsemblePredictor()
+        old_snapshot = predictor.snapshot
+        
+        predictor.update_config({"ft": 0.4, "ht": 0.4, "pt": 0.2})
+        
+        assert predictor.snapshot is not old_snapshot
+        assert predictor.snapshot.version == old_snapshot.version + 1
+        assert old_snapshot.as_dict() == {"ft": 0.5, "ht": 0.3, "pt": 0.2}
+        assert not predictor.snapshot.weights.flags.writeable
+    
+    def test_invalid_update_keeps_snapshot(self):
+        """Test a rejected update never replaces the snapshot."""
+        predictor = EnsemblePredictor()
+        old_snapshot = predictor.snapshot
+        
+        with pytest.raises(ValueError):
+            predictor.update_config({"ft": 0.5, "ht": -0.3, "pt": 0.2})
+        
+        assert predictor.snapshot is old_snapshot
+    
+    def test_concurrent_readers_never_see_torn_weights(self):
+        """Test predictions during rapid swaps always use one complete config."""
+        predictor = EnsemblePredictor()
+        configs = [{"ft": 1.0, "ht": 0.0, "pt": 0.0}, {"ft": 0.0, "ht": 0.0, "pt": 1.0}]
+        stop = threading.Event()
+        
+        def writer():
+            index = 0
+            while not stop.is_set():
+                predictor.update_config(configs[index % 2])
+                index += 1
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(2000):
+                result = predictor.predict(
+                    full_time_prediction="home_win",
+                    full_time_confidence=0.6,
+                    pattern_prediction="away_win",
+                    pattern_confidence=0.6,
+                )
+                assert result["weights_used"] in (configs[0], configs[1])
+        finally:
+            stop.set()
+            thread.join()
+    
+    def test_load_weights_file_accepts_nested_and_flat(self, tmp_path):
+        """Test JSON and YAML weight files load with or without a weights key."""
+        nested = tmp_path / "weights.json"
+        nested.write_text(json.dumps({"weights": {"ft": 0.6, "ht": 0.3, "pt": 0.1}, "metric": "accuracy"}))
+        flat = tmp_path / "weights.yaml"
+        flat.write_text("ft: 0.2\nht: 0.3\npt: 0.5\n")
+        
+        assert load_weights_file(nested) == {"ft": 0.6, "ht": 0.3, "pt": 0.1}
+        assert load_weights_file(flat) == {"ft": 0.2, "ht": 0.3, "pt": 0.5}
+    
+    def test_refresher_reloads_file(self, tmp_path):
+        """Test the refresher swaps weights only when the file changes."""
+        path = tmp_path / "weights.json"
+        path.write_text(json.dumps({"ft": 0.6, "ht": 0.3, "pt": 0.1}))
+        predictor = EnsemblePredictor()
+        refresher = WeightRefresher(predictor, path, interval=60)
+        
+        assert refresher.refresh() is True
+        assert predictor.get_config() == {"ft": 0.6, "ht": 0.3, "pt": 0.1}
+        assert refresher.refresh() is False
+    
+    def test_refresher_reads_db_row(self):
+        """Test the refresher accepts a callable returning a DB row."""
+        predictor = EnsemblePredictor()
+        row = {"id": 7, "ft": 0.45, "ht": 0.35, "pt": 0.2, "updated_at": "2025-01-01"}
+        refresher = WeightRefresher(predictor, lambda: row)
+        
+        assert refresher.refresh() is True
+        assert predictor.get_config() == {"ft": 0.45, "ht": 0.35, "pt": 0.2}
+    
+    def test_refresher_keeps_weights_on_invalid_source(self):
+        """Test a bad refresh is logged and the current snapshot kept."""
+        predictor = EnsemblePredictor()
+        snapshot = predictor.snapshot
+        refresher = WeightRefresher(predictor, lambda: {"ft": -1.0, "ht": 0.5, "pt": 0.5})
+        
+        assert refresher.refresh() is False
+        assert predictor.snapshot is snapshot
+    
+    def test_refresher_background_thread(self, tmp_path):
+        """Test start/stop applies the source on the background thread."""
+        path = tmp_path / "weights.json"
+        path.write_text(json.dumps({"ft": 0.7, "ht": 0.2, "pt": 0.1}))
+        predictor = EnsemblePredictor()
+        refresher = WeightRefresher(predictor, path, interval=0.01).start()
+        try:
+            for _ in range(200):
+                if predictor.get_config()["ft"] == 0.7:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            refresher.stop(timeout=1)
+        
+        assert predictor.get_config() == {"ft": 0.7, "ht": 0.2, "pt": 0.1}
+
+
+class TestEnsemblePredictorFastPath:
+    """Test suite for interned outcome codes and the quiet fast path."""
+    
+    def test_lookup_covers_valid_outcomes(self):
+        """Test every documented spelling is in the precomputed table."""
+        for outcome in EnsemblePredictor.VALID_OUTCOMES:
+            assert outcome in OUTCOME_LOOKUP
+    
+    def test_predict_fast_matches_predict(self):
+        """Test the fast path reproduces predict for random inputs."""
+        rng = np.random.default_rng(5)
+        predictor = EnsemblePredictor()
+        labels = ["home_win", "draw", "away_win"]
+        for _ in range(300):
+            codes = rng.integers(0, 3, 3).tolist()
+            confidences = rng.random(3).round(2).tolist()
+            present = rng.random(3) > 0.3
+            if not present.any():
+                present[0] = True
+            outcomes = [labels[c] if p else None for c, p in zip(codes, present)]
+            confs = [c if p else None for c, p in zip(confidences, present)]
+            
+            expected = predictor.predict(
+                full_time_prediction=outcomes[0], full_time_confidence=confs[0],
+                half_time_prediction=outcomes[1], half_time_confidence=confs[1],
+                pattern_prediction=outcomes[2], pattern_confidence=confs[2],
+            )
+            by_label = predictor.predict_fast(outcomes, confs)
+            by_code = predictor.predict_fast([c if p else None for c, p in zip(codes, present)], confs)
+            
+            assert by_label == by_code
+            assert by_label.winner_label == expected["winner"]
+            assert by_label.final_confidence == expected["final_confidence"]
+            assert by_label.conflict_detected == expected["conflict_detected"]
+            assert by_label.conflict_margin == expected["conflict_margin"]
+    
+    def test_predict_fast_returns_compact_tuple(self):
+        """Test the fast path result is a plain named tuple."""
+        result = EnsemblePredictor().predict_fast(["HOME", None, "Draw"], [0.9, None, 0.4])
+        assert isinstance(result, EnsembleResult)
+        assert isinstance(result, tuple)
+        assert result.winner == 0
+    
+    def test_predict_fast_invalid_inputs_raise_error(self):
+        """Test the fast path keeps predict's validation."""
+        predictor = EnsemblePredictor()
+        with pytest.raises(ValueError, match="At least one sub-model"):
+            predictor.predict_fast([None, None, None], [None, None, None])
+        with pytest.raises(ValueError, match="confidence must be in range"):
+            predictor.predict_fast([0, 1, 2], [1.2, 0.5, 0.5])
+        with pytest.raises(ValueError, match="Invalid outcome"):
+            predictor.predict_fast([7, 1, 2], [0.5, 0.5, 0.5])
+        with pytest.raises(ValueError, match="Expected 3"):
+            predictor.predict_fast([0, 1], [0.5, 0.5])
+    
+    def test_encode_outcomes_accepts_integer_codes(self):
+        """Test integer arrays pass through encode_outcomes unchanged."""
+        predictor = EnsemblePredictor()
+        assert predictor.encode_outcomes(np.array([2, 0, 1])).tolist() == [2, 0, 1]
+        with pytest.raises(ValueError, match="Invalid outcome code"):
+            predictor.encode_outcomes(np.array([3]))
+
+
+class TestEnsembleRescoring:
+    """Test suite for streaming evaluation-log rescoring."""
+    
+    def _write_log(self, path, n_rows=250):
+        """Write a synthetic evaluation log with logged sub-model votes."""
+        import pandas as pd
+        
+        rng = np.random.default_rng(9)
+        labels = np.array(["home_win", "draw", "away_win"], dtype=object)
+        frame = pd.DataFrame({
+            "prediction_id": [f"p{i}" for i in range(n_rows)],
+            "actual_result": labels[rng.integers(0, 3, n_rows)],
+            "full_time_prediction": labels[rng.integers(0, 3, n_rows)],
+            "full_time_confidence": rng.uniform(0.4, 0.9, n_rows),
+            "half_time_prediction": labels[rng.integers(0, 3, n_rows)],
+            "half_time_confidence": rng.uniform(0.4, 0.9, n_rows),
+        })
+        frame.loc[3, ["full_time_prediction", "full_time_confidence"]] = None
+        frame.loc[3, ["half_time_prediction", "half_time_confidence"]] = None
+        frame.loc[5, "actual_result"] = None
+        if path.suffix == ".parquet":
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        return frame
+    
+    def test_rescore_matches_in_memory_batch(self, tmp_path):
+        """Test chunked rescoring equals scoring the whole log at once."""
+        import pandas as pd
+        from ml_pipeline.ensemble_predictor import rescore_evaluation_log
+        
+        frame = self._write_log(tmp_path / "log.csv")
+        output = tmp_path / "rescored.csv"
+        
+        summary = rescore_evaluation_log(tmp_path / "log.csv", output, chunk_size=64)
+        
+        predictor = EnsemblePredictor()
+        outcomes, confidences, mask = predictor.frame_to_votes(frame)
+        scorable = mask.any(axis=1)
+        batch = predictor.predict_batch(outcomes[scorable], confidences[scorable], mask[scorable])
+        
+        rescored = pd.read_csv(output)
+        assert len(rescored) == len(frame)
+        assert rescored["ensemble_winner"].isna().sum() == 1
+        assert rescored.loc[scorable, "ensemble_winner"].tolist() == predictor.decode_outcomes(batch["winner"]).tolist()
+        
+        assert summary["rows"] == len(frame)
+        assert summary["skipped_rows"] == 1
+        assert summary["evaluated_rows"] == len(frame) - 2
+        assert summary["conflict_rate"] == round(batch["conflict_detected"].mean(), 4)
+        assert sum(summary["winner_distribution"].values()) == pytest.approx(1.0, abs=1e-3)
+        
+        known = frame["actual_result"].notna().to_numpy()[scorable]
+        actual = predictor.encode_outcomes(frame["actual_result"].to_numpy()[scorable][known])
+        assert summary["accuracy"] == round((batch["winner"][known] == actual).mean(), 4)
+    
+    def test_rescore_parquet_round_trip(self, tmp_path):
+        """Test Parquet logs stream in and out when pyarrow is available."""
+        pytest.importorskip("pyarrow")
+        import pandas as pd
+        from ml_pipeline.ensemble_predictor import rescore_evaluation_log
+        
+        self._write_log(tmp_path / "log.parquet")
+        csv_summary = rescore_evaluation_log(tmp_path / "log.parquet", tmp_path / "out.parquet", chunk_size=100)
+        
+        rescored = pd.read_parquet(tmp_path / "out.parquet")
+        assert len(rescored) == csv_summary["rows"]
+        assert "ensemble_conflict" in rescored.columns
+    
+    def test_rescore_parquet_schema_from_registry(self, tmp_path):
+        """Test a vote column that is empty in the first chunk does not break later chunks."""
+        pytest.importorskip("pyarrow")
+        import pandas as pd
+        from ml_pipeline.ensemble_predictor import rescore_evaluation_log
+        
+        frame = self._write_log(tmp_path / "log.csv")
+        frame["pattern_prediction"] = None
+        frame["pattern_confidence"] = None
+        frame.loc[150:, "pattern_prediction"] = "draw"
+        frame.loc[150:, "pattern_confidence"] = 0.6
+        frame.to_csv(tmp_path / "log.csv", index=False)
+        
+        summary = rescore_evaluation_log(tmp_path / "log.csv", tmp_path / "out.parquet", chunk_size=100)
+        
+        rescored = pd.read_parquet(tmp_path / "out.parquet")
+        assert summary["scored_rows"] == len(frame) - 1
+        assert rescored["pattern_prediction"].isna().sum() == 150
+        assert rescored["pattern_prediction"].iloc[-1] == "draw"
+    
+    def test_rescore_skips_invalid_rows(self, tmp_path):
+        """Test invalid labels and confidences are counted instead of aborting the run."""
+        import pandas as pd
+        from ml_pipeline.ensemble_predictor import rescore_evaluation_log
+        
+        frame = self._write_log(tmp_path / "log.csv")
+        frame.loc[10, "full_time_prediction"] = "abandoned"
+        frame.loc[20, "half_time_confidence"] = 1.7
+        frame.loc[30, "actual_result"] = "postponed"
+        frame.loc[3, "full_time_prediction"] = "not scored"
+        frame.to_csv(tmp_path / "log.csv", index=False)
+        
+        summary = rescore_evaluation_log(tmp_path / "log.csv", tmp_path / "out.csv", chunk_size=64)
+        
+        rescored = pd.read_csv(tmp_path / "out.csv")
+        assert summary["invalid_rows"] == 3
+        assert summary["skipped_rows"] == 1
+        assert summary["scored_rows"] == len(frame) - 4
+        assert rescored.loc[[10, 20, 30], "ensemble_winner"].isna().all()
+        assert rescored.loc[10, "full_time_prediction"] == "abandoned"
+    
+    def test_rescore_uses_given_weights(self, tmp_path):
+        """Test rescoring honours the predictor's weights."""
+        from ml_pipeline.ensemble_predictor import rescore_evaluation_log
+        
+        self._write_log(tmp_path / "log.csv")
+        summary = rescore_evaluation_log(
+            tmp_path / "log.csv",
+            predictor=EnsemblePredictor(weights={"ft": 1.0, "ht": 0.0, "pt": 0.0}),
+        )
+        assert summary["weights"] == {"ft": 1.0, "ht": 0.0, "pt": 0.0}
+        assert summary["scored_rows"] == summary["rows"] - 1
+
+
+class TestEnsemblePredictorStacking:
+    """Test suite for the stacking meta-model mode."""
+    
+    def _fit_stacker(self, n_rows=3000, seed=5):
+        """Fit a meta-model on votes where HT is right whenever FT is unsure."""
+        from sklearn.linear_model import LogisticRegression
+        
+        rng = np.random.default_rng(seed)
+        actual = rng.integers(0, 3, n_rows)
+        ft_confidence = rng.uniform(0.3, 0.95, n_rows)
+        ft_sure = ft_confidence > 0.6
+        outcomes = np.stack([
+            np.where(ft_sure, actual, rng.integers(0, 3, n_rows)),
+            np.where(ft_sure, rng.integers(0, 3, n_rows), actual),
+            rng.integers(0, 3, n_rows),
+        ], axis=1)
+        confidences = np.stack([
+            ft_confidence, rng.uniform(0.4, 0.7, n_rows), rng.uniform(0.4, 0.9, n_rows)
+        ], axis=1)
+        present = np.ones_like(outcomes, dtype=bool)
+        
+        classifier = LogisticRegression(max_iter=2000)
+        classifier.fit(stacking_features(outcomes, confidences, present), np.array(OUTPUT_LABELS)[actual])
+        stacker = StackingModel.from_estimator(classifier, EnsemblePredictor.DEFAULT_MODELS)
+        return stacker, outcomes, confidences, actual
+    
+    def test_stacking_features_shape(self):
+        """Test one-hot, presence and pairwise doubt features."""
+        features = stacking_features(
+            np.array([[0, 2, 1]]), np.array([[0.8, 0.6, np.nan]]), np.array([[True, True, False]])
+        )
+        
+        assert features.shape == (1, 4 * 3 + 3 * 3 * 2)
+        assert features[0, :9].tolist() == [0.8, 0, 0, 0, 0, 0.6, 0, 0, 0]
+        assert features[0, 9:12].tolist() == [1.0, 1.0, 0.0]
+        # Pair (ft, ht): HT's away vote scaled by FT's doubt (1 - 0.8)
+        assert features[0, 12:15] == pytest.approx([0.0, 0.0, 0.6 * 0.2])
+    
+    def test_stacking_learns_interaction(self):
+        """Test the meta-model beats weighted voting on interaction-driven data."""
+        stacker, outcomes, confidences, actual = self._fit_stacker()
+        predictor = EnsemblePredictor()
+        weighted = predictor.predict_batch(outcomes, confidences)
+        
+        predictor.set_stacker(stacker)
+        stacked = predictor.predict_batch(outcomes, confidences)
+        
+        assert predictor.mode == "stacking"
+        assert (stacked["winner"] == actual).mean() > (weighted["winner"] == actual).mean() + 0.1
+    
+    def test_stacking_scalar_paths_match_batch(self):
+        """Test predict, predict_fast and predict_batch agree in stacking mode."""
+        stacker, outcomes, confidences, _ = self._fit_stacker(n_rows=600)
+        predictor = EnsemblePredictor()
+        predictor.set_stacker(stacker)
+        batch = predictor.predict_batch(outcomes[:50], confidences[:50])
+        
+        for row in range(50):
+            codes, values = outcomes[row].tolist(), confidences[row].tolist()
+            result = predictor.predict(
+                full_time_prediction=OUTPUT_LABELS[codes[0]], full_time_confidence=values[0],
+                half_time_prediction=OUTPUT_LABELS[codes[1]], half_time_confidence=values[1],
+                pattern_prediction=OUTPUT_LABELS[codes[2]], pattern_confidence=values[2],
+            )
+            fast = predictor.predict_fast(codes, values)
+            
+            assert result["winner"] == OUTPUT_LABELS[batch["winner"][row]]
+            assert fast.winner == batch["winner"][row]
+            assert fast.final_confidence == pytest.approx(batch["final_confidence"][row])
+            assert sum(result["scores"].values()) == pytest.approx(1.0)
+    
+    def test_stacking_ignores_weights(self):
+        """Test stacking mode neither checks nor reports the configured weights."""
+        stacker, outcomes, confidences, _ = self._fit_stacker(n_rows=600)
+        predictor = EnsemblePredictor(weights={"ft": 1.0, "ht": 0.0, "pt": 0.0})
+        predictor.set_stacker(stacker)
+        
+        result = predictor.predict(half_time_prediction="draw", half_time_confidence=0.7)
+        
+        assert result["mode"] == "stacking"
+        assert "weights_used" not in result
+        assert sum(result["scores"].values()) == pytest.approx(1.0)
+        
+        predictor.set_stacker(None)
+        with pytest.raises(ValueError, match="Total weight of active models is zero"):
+            predictor.predict(half_time_prediction="draw", half_time_confidence=0.7)
+    
+    def test_stacking_round_trip_and_reset(self, tmp_path):
+        """Test stacking models persist to JSON and can be switched off."""
+        stacker, outcomes, confidences, _ = self._fit_stacker(n_rows=600)
+        path = tmp_path / "stacker.json"
+        path.write_text(json.dumps(stacker.to_dict()))
+        
+        loaded = load_stacking_model(path)
+        predictor = EnsemblePredictor()
+        predictor.set_stacker(loaded)
+        pinned = EnsemblePredictor.from_snapshot(predictor.snapshot)
+        
+        assert pinned.mode == "stacking"
+        assert np.array_equal(loaded.coef, stacker.coef)
+        assert np.allclose(
+            pinned.predict_batch(outcomes, confidences)["final_confidence"],
+            stacker.predict_proba(outcomes, confidences, np.ones_like(outcomes, dtype=bool)).max(axis=1),
+            atol=1e-4,
+        )
+        
+        predictor.set_stacker(None)
+        assert predictor.mode == "weighted"
+    
+    def test_stacking_registry_mismatch(self):
+        """Test a meta-model trained for another registry is rejected."""
+        stacker, _, _, _ = self._fit_stacker(n_rows=600)
+        predictor = EnsemblePredictor(weights={"ft": 0.6, "ht": 0.4}, models=[("ft", "full_time"), ("ht", "half_time")])
+        
+        with pytest.raises(ValueError, match="does not match"):
+            predictor.set_stacker(stacker)
+        
+        full = EnsemblePredictor()
+        full.set_stacker(stacker)
+        with pytest.raises(ValueError, match="stacking model is active"):
+            full.register_model("xg", "xg", 0.1)